@@ -5,22 +5,87 @@ FF14 Login Manager
 
 VERSION = "1.0.5"
 VERSION_CHECK_URL = "https://raw.githubusercontent.com/yen58767/FF14_TW_LoginManager/main/version.json"
+UPDATE_CHECK_TTL = 6 * 60 * 60  # 更新檢查結果的快取秒數
 
 import sys
 import os
 import time
+
+# 啟動計時的起點（在其他模組載入前取得）
+STARTUP_T0 = time.perf_counter()
+
+import copy
 import json
+import re
+import atexit
+import hmac
+import math
+import struct
+import hashlib
 import subprocess
 import threading
-import urllib.request
 from pathlib import Path
+from urllib.parse import urlsplit, unquote
+from dataclasses import dataclass
 import base64
 import traceback
+import uuid
+from collections import OrderedDict
 
 # ============ Log 路徑（只在錯誤時寫入） ============
 LOG_DIR = Path(os.environ.get("LOCALAPPDATA", "")) / "FF14LoginManager"
 LOG_FILE = LOG_DIR / "error.log"
 
+
+# ============ 啟動計時 ============
+
+class StartupTrace:
+    """
+    啟動各階段的耗時（從模組開始載入起算的毫秒數）
+    以環境變數 FF14LM_STARTUP_TRACE=1 或參數 --trace-startup 啟用，
+    所有階段都記錄後輸出到 console，並附加一行 JSON 到 startup_trace.jsonl
+    """
+
+    STAGES = ("import", "config", "window_created", "page_loaded", "bridge_ready")
+
+    def __init__(self, start: float, enabled: bool, path: Path):
+        self.start = start
+        self.enabled = enabled
+        self.path = path
+        self.marks = {}
+        self._lock = threading.Lock()
+        self._reported = False
+
+    def mark(self, stage: str):
+        """記錄階段完成的時間，同一階段只記錄第一次"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._reported or stage in self.marks:
+                return
+            self.marks[stage] = round((time.perf_counter() - self.start) * 1000, 1)
+            if not all(name in self.marks for name in self.STAGES):
+                return
+            self._reported = True
+            marks = dict(self.marks)
+        self.report(marks)
+
+    def report(self, marks: dict):
+        print("啟動計時: " + " → ".join(f"{name} {ms:.0f}ms" for name, ms in marks.items()))
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"time": time.time(), "marks": marks}, separators=(",", ":")) + "\n")
+        except OSError as e:
+            print(f"寫入啟動計時失敗: {e}")
+
+
+startup_trace = StartupTrace(
+    STARTUP_T0,
+    os.environ.get("FF14LM_STARTUP_TRACE", "") not in ("", "0") or "--trace-startup" in sys.argv,
+    LOG_DIR / "startup_trace.jsonl"
+)
+
 # 設定 Windows AppUserModelID，讓程式可以正確釘選到工作列
 import ctypes
 from ctypes import wintypes
@@ -29,155 +94,1590 @@ try:
 except Exception:
     pass
 
-import webview
 import pyotp
 
-# Windows UI Automation
-import comtypes.client
-from comtypes import COMError
 
-# 初始化 UI Automation
-UIAutomationClient = comtypes.client.GetModule("UIAutomationCore.dll")
-uia = comtypes.client.CreateObject(
-    "{ff48dba4-60ef-4201-aa87-54103eef594e}",
-    interface=UIAutomationClient.IUIAutomation
-)
+# ============ UI 元素資訊與 Launcher 快照 ============
 
+# UIA ControlType ID（與 UIAutomationClient 常數相同，讓非 Windows 的後端也能使用）
+CONTROL_TYPE_BUTTON = 50000
+CONTROL_TYPE_EDIT = 50004
+CONTROL_TYPE_WINDOW = 50032
 
-# ============ DPAPI 加密/解密功能 ============
 
-class DPAPIEncryption:
-    """使用 Windows DPAPI 加密/解密敏感資料"""
+@dataclass
+class ElementInfo:
+    """快取後的 UI 元素資訊（element 為後端自己的元素物件）"""
+    element: any
+    name: str
+    control_type: int
+    automation_id: str
+    enabled: bool
+    rect: tuple  # (left, top, right, bottom)
+    value: str = None  # ValuePattern 的值，元素不支援時為 None
+    handle: int = 0    # 原生視窗 handle（視窗綁定用，未知時為 0）
+    pid: int = 0       # 所屬行程 ID（未知時為 0）
 
-    @staticmethod
-    def encrypt(plaintext: str) -> str:
+
+# 判定元素角色用的名稱關鍵字
+OTP_NAME_KEYWORDS = ("一次性", "驗證碼", "OTP")
+PLAY_NAME_KEYWORDS = ("PLAY", "開始", "START")
+
+
+@dataclass
+class LauncherSnapshot:
+    """
+    Launcher 元素快照：一次搜尋取得所有 Edit 與 Button，並判定各自的角色
+    所有「第一個 Edit 是信箱、最後一個 Edit 是 OTP」之類的推測都集中在 classify()
+    """
+    edits: list[ElementInfo]
+    buttons: list[ElementInfo]
+    email: ElementInfo = None
+    password: ElementInfo = None
+    otp: ElementInfo = None
+    play: ElementInfo = None
+
+    @classmethod
+    def classify(cls, elements: list[ElementInfo]) -> "LauncherSnapshot":
+        edits = [e for e in elements if e.control_type == CONTROL_TYPE_EDIT]
+        buttons = [e for e in elements if e.control_type == CONTROL_TYPE_BUTTON]
+        snapshot = cls(edits=edits, buttons=buttons)
+
+        # OTP：名稱符合關鍵字的 Edit，找不到則使用最後一個 Edit
+        named_otp = None
+        for edit in edits:
+            name = edit.name.upper()
+            if any(kw in name for kw in OTP_NAME_KEYWORDS):
+                named_otp = edit
+                break
+        snapshot.otp = named_otp or (edits[-1] if edits else None)
+
+        # 信箱、密碼：第一個是信箱，第二個是密碼（名稱明確為 OTP 的欄位不列入）
+        credential_edits = [e for e in edits if e is not named_otp]
+        if len(credential_edits) >= 2:
+            snapshot.email = credential_edits[0]
+            snapshot.password = credential_edits[1]
+
+        # PLAY：名稱符合關鍵字且已啟用（仍在更新時按鈕為停用狀態）
+        for button in buttons:
+            name = button.name.upper()
+            if button.enabled and any(kw in name for kw in PLAY_NAME_KEYWORDS):
+                snapshot.play = button
+                break
+
+        return snapshot
+
+
+# ============ 視窗開啟事件來源 ============
+
+class WindowEventSource:
+    """
+    視窗開啟事件來源（基底類別）
+    事件發生時呼叫 notify() 喚醒等待中的 wait()，可直接附上符合條件的視窗元素
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._window = None
+
+    def start(self):
+        """開始接收事件"""
+        pass
+
+    def stop(self):
+        """停止接收事件"""
+        pass
+
+    def notify(self, window=None):
+        """通知有新視窗開啟（window 為符合條件的視窗，可為 None 表示僅喚醒）"""
+        with self._lock:
+            if window is not None:
+                self._window = window
+        self._event.set()
+
+    def wait(self, timeout: float) -> tuple[bool, any]:
         """
-        使用 DPAPI 加密字串
-        返回 base64 編碼的加密資料，格式：dpapi:base64data
+        等待事件，最多 timeout 秒
+        返回 (是否被喚醒, 事件附帶的視窗元素)
         """
-        if not plaintext:
-            return ""
+        fired = self._event.wait(timeout)
+        with self._lock:
+            self._event.clear()
+            window, self._window = self._window, None
+        return fired, window
+
+
+class FakeWindowEventSource(WindowEventSource):
+    """手動觸發的事件來源，用於在非 Windows 環境測試 wait_for_window"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = False
+        self.stopped = False
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.stopped = True
+
+    def fire(self, window=None):
+        """模擬一個 WindowOpened 事件"""
+        self.notify(window)
+
+
+# ============ TOTP ============
+
+TOTP_INTERVAL = 30
+# 解密後的帳號資料（含解碼後的 Secret Key）在記憶體中最多保留的筆數
+SECRET_CACHE_SIZE = 16
+
+
+def normalize_secret(secret_key: str) -> str:
+    """去除空白與結尾的 = 並轉為大寫（與 web/totp.js 的 normalizeSecret 相同）"""
+    return "".join(secret_key.split()).rstrip("=").upper()
+
+
+def decode_secret(secret_key: str) -> bytes:
+    """正規化並以 base32 解碼 Secret Key，格式錯誤時拋出 ValueError"""
+    try:
+        key = pyotp.TOTP(normalize_secret(secret_key)).byte_secret()
+    except Exception as e:
+        raise ValueError("Secret Key 格式錯誤") from e
+    if not key:
+        raise ValueError("Secret Key 格式錯誤")
+    return key
+
+
+def hotp(key: bytes, counter: int, digits: int = 6) -> str:
+    """RFC 4226 HOTP（HMAC-SHA1 + dynamic truncation）"""
+    digest = hmac.new(key, struct.pack(">Q", counter), hashlib.sha1).digest()
+    offset = digest[-1] & 0x0F
+    code = struct.unpack(">I", digest[offset:offset + 4])[0] & 0x7FFFFFFF
+    return str(code % 10 ** digits).zfill(digits)
+
+
+def validate_secret(secret_key: str) -> str:
+    """檢查 Secret Key 格式，正確時返回 None，否則返回錯誤訊息"""
+    if not secret_key or not secret_key.strip():
+        return "請輸入 Secret Key"
+    try:
+        decode_secret(secret_key)
+    except ValueError as e:
+        return str(e)
+    return None
 
+
+def generate_otp(secret_key: str, for_time: float = None, digits: int = 6) -> str:
+    """產生 for_time（預設為現在）的 OTP"""
+    for_time = time.time() if for_time is None else for_time
+    return hotp(decode_secret(secret_key), int(for_time // TOTP_INTERVAL), digits)
+
+
+class OtpCache:
+    """
+    OTP 快取（自動化流程、背景服務與命令列共用）
+    以正規化後 Secret Key 的 SHA-256 作為 key，保存解碼後的金鑰與目前 / 下一個時間區間的 OTP，
+    筆數與 ConfigManager 的解密快取相同，超過時捨棄最久未使用的帳號；明文 Secret Key 本身不會作為 key
+    """
+
+    def __init__(self, interval: int = TOTP_INTERVAL, max_secrets: int = SECRET_CACHE_SIZE):
+        self.interval = interval
+        self.max_secrets = max_secrets
+        self._lock = threading.Lock()
+        self._keys = OrderedDict()  # Secret Key 的 SHA-256 -> 解碼後的金鑰
+        self._codes = {}  # (Secret Key 的 SHA-256, 時間區間) -> OTP
+        self._step = None
+
+    def _key(self, cache_id: bytes, secret_key: str) -> bytes:
+        key = self._keys.get(cache_id)
+        if key is None:
+            key = decode_secret(secret_key)
+            self._keys[cache_id] = key
+            while len(self._keys) > self.max_secrets:
+                dropped, _ = self._keys.popitem(last=False)
+                self._codes = {k: v for k, v in self._codes.items() if k[0] != dropped}
+        else:
+            self._keys.move_to_end(cache_id)
+        return key
+
+    def _code(self, cache_id: bytes, secret_key: str, step: int) -> str:
+        code = self._codes.get((cache_id, step))
+        if code is None:
+            code = hotp(self._key(cache_id, secret_key), step)
+            self._codes[(cache_id, step)] = code
+        return code
+
+    def get(self, secret_key: str, for_time: float = None) -> dict:
+        """
+        返回 {"otp": 目前的 OTP, "next": 下一個 OTP, "remaining": 剩餘秒數}，格式錯誤時拋出 ValueError
+        同一個 Secret Key 只在第一次使用時解碼，同一時間區間內的 OTP 只計算一次
+        """
+        now = time.time() if for_time is None else for_time
+        step = int(now // self.interval)
+        cache_id = hashlib.sha256(normalize_secret(secret_key).encode("utf-8")).digest()
+
+        with self._lock:
+            if step != self._step:
+                self._step = step
+                self._codes = {k: v for k, v in self._codes.items() if k[1] >= step}
+            return {
+                "otp": self._code(cache_id, secret_key, step),
+                "next": self._code(cache_id, secret_key, step + 1),
+                "remaining": self.interval - int(now) % self.interval,
+            }
+
+
+otp_cache = OtpCache()
+
+
+# ============ Google Authenticator 匯出資料 ============
+
+# OtpParameters 的列舉值（Google Authenticator 的 migration payload）
+MIGRATION_ALGORITHMS = {0: "SHA1", 1: "SHA1", 2: "SHA256", 3: "SHA512", 4: "MD5"}
+MIGRATION_DIGITS = {0: 6, 1: 6, 2: 8}
+MIGRATION_TYPES = {0: "totp", 1: "hotp", 2: "totp"}
+
+
+def read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """讀取 protobuf varint，返回 (值, 下一個位置)"""
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("資料不完整")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise ValueError("資料格式錯誤")
+
+
+def iter_protobuf_fields(data: bytes):
+    """逐一產生 protobuf 欄位 (欄位編號, 值)：varint 為 int，length-delimited 為 bytes，固定長度欄位略過"""
+    pos = 0
+    while pos < len(data):
+        tag, pos = read_varint(data, pos)
+        field_number, wire_type = tag >> 3, tag & 0x07
+        if wire_type == 0:
+            value, pos = read_varint(data, pos)
+        elif wire_type == 2:
+            length, pos = read_varint(data, pos)
+            if pos + length > len(data):
+                raise ValueError("資料不完整")
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type in (1, 5):
+            pos += 8 if wire_type == 1 else 4
+            if pos > len(data):
+                raise ValueError("資料不完整")
+            continue
+        else:
+            raise ValueError("資料格式錯誤")
+        yield field_number, value
+
+
+@dataclass
+class OtpAccount:
+    """QR Code 中的一組 OTP 帳號"""
+    secret: str
+    name: str = ""
+    issuer: str = ""
+    otp_type: str = "totp"
+    algorithm: str = "SHA1"
+    digits: int = 6
+
+    @property
+    def supported(self) -> bool:
+        """是否為本程式能產生的 OTP（TOTP、SHA1、6 位數）"""
+        return self.otp_type == "totp" and self.algorithm == "SHA1" and self.digits == 6
+
+    @property
+    def label(self) -> str:
+        if self.issuer and self.name and self.issuer not in self.name:
+            return f"{self.issuer} ({self.name})"
+        return self.name or self.issuer
+
+
+@dataclass
+class MigrationPayload:
+    """一張 QR Code 的內容；帳號太多時 Google Authenticator 會分成 batch_size 張"""
+    accounts: list[OtpAccount]
+    batch_size: int = 1
+    batch_index: int = 0
+    batch_id: int = 0
+
+
+def parse_otp_parameters(data: bytes) -> OtpAccount:
+    account = OtpAccount(secret="")
+    for field, value in iter_protobuf_fields(data):
+        if isinstance(value, bytes):
+            if field == 1:
+                account.secret = base64.b32encode(value).decode("ascii").rstrip("=")
+            elif field == 2:
+                account.name = value.decode("utf-8", errors="replace")
+            elif field == 3:
+                account.issuer = value.decode("utf-8", errors="replace")
+        elif field == 4:
+            account.algorithm = MIGRATION_ALGORITHMS.get(value, "unknown")
+        elif field == 5:
+            account.digits = MIGRATION_DIGITS.get(value, 0)
+        elif field == 6:
+            account.otp_type = MIGRATION_TYPES.get(value, "unknown")
+    return account
+
+
+def parse_migration_payload(data: bytes) -> MigrationPayload:
+    payload = MigrationPayload(accounts=[])
+    for field, value in iter_protobuf_fields(data):
+        if field == 1 and isinstance(value, bytes):
+            account = parse_otp_parameters(value)
+            if account.secret:
+                payload.accounts.append(account)
+        elif isinstance(value, int):
+            if field == 3:
+                payload.batch_size = value
+            elif field == 4:
+                payload.batch_index = value
+            elif field == 5:
+                payload.batch_id = value
+    return payload
+
+
+def _query_param(query: str, key: str) -> str:
+    # 不使用 parse_qs：未編碼的 base64 '+' 會被當成空白
+    for part in query.split("&"):
+        name, _, value = part.partition("=")
+        if name == key:
+            return unquote(value)
+    return ""
+
+
+def parse_otp_url(url: str) -> MigrationPayload:
+    """解析 otpauth-migration://（Google Authenticator 匯出）或 otpauth:// 格式，格式錯誤時拋出 ValueError"""
+    parts = urlsplit(url.strip())
+
+    if parts.scheme == "otpauth-migration":
+        encoded = _query_param(parts.query, "data").replace(" ", "+").replace("-", "+").replace("_", "/")
+        if not encoded:
+            raise ValueError("未找到資料")
         try:
-            # 將字串轉為 bytes
-            plaintext_bytes = plaintext.encode('utf-8')
+            data = base64.b64decode(encoded + "=" * (-len(encoded) % 4))
+        except ValueError:
+            raise ValueError("無法解析 Google Authenticator 資料")
+        return parse_migration_payload(data)
+
+    if parts.scheme == "otpauth":
+        secret = _query_param(parts.query, "secret")
+        if not secret:
+            raise ValueError("未找到 Secret Key")
+        name = unquote(parts.path.lstrip("/"))
+        issuer = _query_param(parts.query, "issuer")
+        if ":" in name:
+            label_issuer, name = name.split(":", 1)
+            issuer = issuer or label_issuer
+        digits = _query_param(parts.query, "digits")
+        account = OtpAccount(
+            secret=normalize_secret(secret),
+            name=name.strip(),
+            issuer=issuer,
+            otp_type=parts.netloc.lower(),
+            algorithm=(_query_param(parts.query, "algorithm") or "SHA1").upper(),
+            digits=int(digits) if digits.isdigit() else 6
+        )
+        return MigrationPayload(accounts=[account])
 
-            # 定義 DATA_BLOB 結構
-            class DATA_BLOB(ctypes.Structure):
-                _fields_ = [
-                    ('cbData', wintypes.DWORD),
-                    ('pbData', ctypes.POINTER(ctypes.c_char))
-                ]
+    raise ValueError("不是有效的 OTP QR Code")
 
-            # 準備輸入資料
-            buffer = ctypes.create_string_buffer(plaintext_bytes)
-            blob_in = DATA_BLOB(len(plaintext_bytes), ctypes.cast(buffer, ctypes.POINTER(ctypes.c_char)))
-            blob_out = DATA_BLOB()
-
-            # 調用 CryptProtectData
-            if ctypes.windll.crypt32.CryptProtectData(
-                ctypes.byref(blob_in),
-                None,  # 描述
-                None,  # 可選的額外熵
-                None,  # 保留
-                None,  # 提示結構
-                0,     # 標誌
-                ctypes.byref(blob_out)
-            ):
-                # 讀取加密後的資料
-                encrypted_bytes = ctypes.string_at(blob_out.pbData, blob_out.cbData)
 
-                # 釋放記憶體
-                ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+def decode_otp_urls(urls: list[str]) -> tuple[list[OtpAccount], list[str]]:
+    """
+    解析多張 QR Code 的內容並合併帳號（以 Secret 去除重複）
+    返回 (可使用的帳號, 警告訊息)；警告包含無法解析的內容、不支援的 OTP 與缺少的匯出批次
+    """
+    accounts = []
+    warnings = []
+    seen = set()
+    batches = {}  # batch_id -> (batch_size, 已取得的 batch_index)
 
-                # 轉為 base64 並加上前綴
-                encrypted_b64 = base64.b64encode(encrypted_bytes).decode('ascii')
-                return f"dpapi:{encrypted_b64}"
-            else:
-                # 加密失敗，返回原始值（向下相容）
-                return plaintext
+    for number, url in enumerate(urls, 1):
+        try:
+            payload = parse_otp_url(url)
+        except ValueError as e:
+            warnings.append(f"第 {number} 張 QR Code：{e}")
+            continue
+
+        if payload.batch_size > 1:
+            _, indexes = batches.setdefault(payload.batch_id, (payload.batch_size, set()))
+            indexes.add(payload.batch_index)
+
+        for account in payload.accounts:
+            if not account.supported:
+                warnings.append(f"{account.label or '未命名帳號'}：不支援的 OTP 類型"
+                                f"（{account.otp_type.upper()} / {account.algorithm} / {account.digits} 位數）")
+                continue
+            if account.secret in seen:
+                continue
+            seen.add(account.secret)
+            accounts.append(account)
+
+    for size, indexes in batches.values():
+        missing = [str(i + 1) for i in range(size) if i not in indexes]
+        if missing:
+            warnings.append(f"匯出資料共 {size} 張 QR Code，缺少第 {'、'.join(missing)} 張")
+
+    return accounts, warnings
+
+
+# ============ 行程列舉 ============
+
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", ctypes.c_long),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", ctypes.c_wchar * 260),
+    ]
+
+
+def list_processes() -> list[tuple[int, int, str]]:
+    """以單次 Toolhelp 快照列出所有行程，返回 (pid, 父行程 pid, 執行檔名稱小寫) 列表"""
+    TH32CS_SNAPPROCESS = 0x00000002
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+
+    snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if not snapshot or snapshot == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError()
+
+    processes = []
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        more = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while more:
+            processes.append((entry.th32ProcessID, entry.th32ParentProcessID, entry.szExeFile.lower()))
+            more = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        kernel32.CloseHandle(snapshot)
+    return processes
 
-        except Exception as e:
-            print(f"加密失敗: {e}")
-            return plaintext
+
+def descendant_pids(processes: list[tuple[int, int, str]], roots: set[int]) -> set[int]:
+    """返回 roots 加上其所有子孫行程的 PID（已結束的 root 仍保留，其子行程的父 PID 仍指向它）"""
+    children = {}
+    for pid, parent, _ in processes:
+        if pid != parent:
+            children.setdefault(parent, []).append(pid)
+
+    result = set(roots)
+    pending = list(roots)
+    while pending:
+        for child in children.get(pending.pop(), ()):
+            if child not in result:
+                result.add(child)
+                pending.append(child)
+    return result
+
+
+# 遊戲與 Launcher 的執行檔名稱（小寫）
+GAME_EXECUTABLES = ("ffxiv_dx11.exe", "ffxiv.exe")
+LAUNCHER_EXECUTABLES = ("ffxivboot.exe", "ffxivboot64.exe", "ffxivlauncher.exe", "ffxivlauncher64.exe")
+
+
+class ProcessSource:
+    """行程來源介面：snapshot() 返回 {pid: 執行檔名稱小寫}"""
+
+    def snapshot(self) -> dict[int, str]:
+        raise NotImplementedError
+
+
+class ToolhelpProcessSource(ProcessSource):
+    """Windows：以單次 Toolhelp 快照取得所有行程名稱，不需逐一 OpenProcess"""
+
+    def snapshot(self) -> dict[int, str]:
+        return {pid: name for pid, _, name in list_processes() if pid}
+
+
+class ProcFSProcessSource(ProcessSource):
+    """
+    Linux（例如 Wine / CI）：讀取 /proc/<pid>/cmdline 第一個參數的檔名
+    comm 最多只有 15 個字元（ffxivlauncher64.exe 會被截斷），只在 cmdline 為空（核心執行緒）時使用；
+    Wine 下 exe 指向 wine-preloader，cmdline 才是 Windows 路徑
+    """
+
+    def __init__(self, root: str = "/proc"):
+        self.root = Path(root)
 
     @staticmethod
-    def decrypt(encrypted: str) -> str:
+    def process_name(entry: Path) -> str:
+        argv0 = (entry / "cmdline").read_bytes().split(b"\0", 1)[0].decode("utf-8", errors="replace")
+        if argv0:
+            return re.split(r"[\\/]", argv0)[-1].lower()
+        return (entry / "comm").read_text(encoding="utf-8").strip().lower()
+
+    def snapshot(self) -> dict[int, str]:
+        processes = {}
+        for entry in self.root.iterdir():
+            if not entry.name.isdigit():
+                continue
+            try:
+                processes[int(entry.name)] = self.process_name(entry)
+            except OSError:
+                # 行程在列舉期間結束
+                continue
+        return processes
+
+
+class FakeProcessSource(ProcessSource):
+    """手動設定的行程來源，用於在非 Windows 環境測試 ProcessWatcher"""
+
+    def __init__(self, processes: dict[int, str] = None):
+        self.processes = dict(processes or {})
+        self.snapshots = 0
+
+    def start(self, pid: int, name: str):
+        self.processes[pid] = name.lower()
+
+    def exit(self, pid: int):
+        self.processes.pop(pid, None)
+
+    def snapshot(self) -> dict[int, str]:
+        self.snapshots += 1
+        return dict(self.processes)
+
+
+def default_process_source() -> ProcessSource:
+    if sys.platform == "win32":
+        return ToolhelpProcessSource()
+    if os.path.isdir("/proc"):
+        return ProcFSProcessSource()
+    return None
+
+
+class ProcessWatcher:
+    """
+    背景行程監看
+    每隔 interval 秒取一次行程快照，只比對新增與結束的 (PID, 名稱) 來更新各群組（例如 game / launcher）的執行中行程
+    （PID 被其他行程重複使用時視為舊行程結束、新行程開始），
+    查詢時直接讀取記憶體中的結果
+    """
+
+    def __init__(self, source: ProcessSource, interval: float = 2.0):
+        self.source = source
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._groups = {}    # 群組名稱 -> 執行檔名稱集合
+        self._matches = {}   # 群組名稱 -> 執行中的 PID 集合
+        self._processes = {}
+        self._listeners = []
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def watch(self, group: str, names):
+        """設定群組要監看的執行檔名稱，名稱改變時依目前的快照重新比對"""
+        names = {name.lower() for name in names if name}
+        with self._lock:
+            if self._groups.get(group) == names:
+                return
+            self._groups[group] = names
+            self._matches[group] = {pid for pid, name in self._processes.items() if name in names}
+
+    def is_running(self, group: str) -> bool:
+        with self._lock:
+            return bool(self._matches.get(group))
+
+    def pids(self, group: str) -> set[int]:
+        with self._lock:
+            return set(self._matches.get(group, ()))
+
+    def add_listener(self, callback):
+        """註冊狀態改變回呼，callback(group, running) 在群組由無到有或由有到無時呼叫"""
+        self._listeners.append(callback)
+
+    def refresh(self):
+        """取一次快照並套用差異"""
+        current = self.source.snapshot()
+        changed = []
+
+        with self._lock:
+            before = {group: bool(pids) for group, pids in self._matches.items()}
+            previous = self._processes
+            started = [pid for pid, name in current.items() if previous.get(pid) != name]
+            exited = [pid for pid, name in previous.items() if current.get(pid) != name]
+
+            for pid in exited:
+                for pids in self._matches.values():
+                    pids.discard(pid)
+            for pid in started:
+                name = current[pid]
+                for group, names in self._groups.items():
+                    if name in names:
+                        self._matches[group].add(pid)
+
+            self._processes = current
+            for group, pids in self._matches.items():
+                if bool(pids) != before.get(group, False):
+                    changed.append((group, bool(pids)))
+
+        for group, running in changed:
+            for callback in list(self._listeners):
+                try:
+                    callback(group, running)
+                except Exception as e:
+                    print(f"行程狀態回呼失敗: {e}")
+
+    def start(self):
+        """先同步取一次快照，再啟動背景執行緒（重複呼叫無作用）"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"列舉行程失敗: {e}")
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"列舉行程失敗: {e}")
+
+
+# ============ 自動化後端 ============
+
+class AutomationError(Exception):
+    """後端操作 UI 元素失敗"""
+    pass
+
+
+class AutomationBackend:
+    """
+    自動化後端介面：封裝 LauncherAutomation 需要的所有平台操作
+    （視窗列舉、元素搜尋、輸入、點擊、啟動行程）
+    每次呼叫都會依目前階段記錄次數，供效能分析使用
+    """
+
+    # 鍵盤與滑鼠輸入會送到前景視窗，多個流程同時執行時必須依序進行
+    input_lock = threading.Lock()
+
+    def __init__(self):
+        self.phase = ""
+        self.calls_by_phase = {}
+
+    def begin_phase(self, phase: str):
+        """切換目前的階段名稱，之後的呼叫會記錄在此階段下"""
+        self.phase = phase
+
+    def reset_counters(self):
+        self.phase = ""
+        self.calls_by_phase = {}
+
+    def count_call(self, name: str):
+        counters = self.calls_by_phase.setdefault(self.phase, {})
+        counters[name] = counters.get(name, 0) + 1
+
+    def warm(self):
+        """預先載入第一次使用時才需要的平台模組（於背景執行緒呼叫，不得建立綁定執行緒的物件）"""
+        pass
+
+    def prepare(self):
+        """在之後執行自動化的執行緒上預先建立需要的物件（背景服務的自動化執行緒使用）"""
+        pass
+
+    def find_top_windows(self, pids: set[int] = None) -> list[ElementInfo]:
+        """列出桌面上的頂層視窗，指定 pids 時只列出這些行程的視窗"""
+        raise NotImplementedError
+
+    def process_tree(self, pids: set[int]) -> tuple[set[int], set[int]]:
         """
-        使用 DPAPI 解密字串
-        如果不是 dpapi: 前綴，視為明文直接返回（向下相容）
+        以單次行程快照返回 (pids 加上其子孫行程, 其中仍在執行的行程)
+        Launcher 可能由啟動程式再啟動另一個行程；無法判斷時全部視為執行中
         """
-        if not encrypted:
-            return ""
+        return set(pids), set(pids)
+
+    def snapshot(self, window) -> list[ElementInfo]:
+        """單次搜尋視窗子樹中的所有 Edit 與 Button"""
+        raise NotImplementedError
 
-        # 檢查是否為加密格式
-        if not encrypted.startswith("dpapi:"):
-            # 明文格式，直接返回
-            return encrypted
+    def create_window_event_source(self, keywords: list[str]) -> WindowEventSource:
+        """建立視窗開啟事件來源，不支援時返回 None"""
+        return None
+
+    def set_value(self, info: ElementInfo, value: str):
+        raise NotImplementedError
+
+    def read_value(self, info: ElementInfo) -> str:
+        """重新讀取元素目前的值（不使用快照中的快取值），不支援時返回 None"""
+        return None
+
+    def set_focus(self, info: ElementInfo):
+        raise NotImplementedError
+
+    def invoke(self, info: ElementInfo):
+        raise NotImplementedError
+
+    def send_enter(self):
+        raise NotImplementedError
+
+    def click(self, info: ElementInfo):
+        """以滑鼠點擊元素中心"""
+        raise NotImplementedError
+
+    def launch(self, path: str, arguments: str = "", working_dir: str = "") -> int:
+        """
+        啟動 Launcher 行程，返回 PID（無法取得時返回 None）
+        arguments 為命令列參數字串，working_dir 為開始位置（空白時使用執行檔所在資料夾）
+        """
+        raise NotImplementedError
+
+
+class UIAWindowEventSource(WindowEventSource):
+    """訂閱 UIA WindowOpened 事件，只在標題符合關鍵字的視窗開啟時喚醒"""
+
+    def __init__(self, backend: "UIABackend", keywords: list[str]):
+        super().__init__()
+        self.backend = backend
+        self.keywords = [kw.upper() for kw in keywords]
+        self._handler = None
+        self._root = None
+
+    def start(self):
+        import comtypes
+        from comtypes import COMError
+
+        uia, client = self.backend.uia, self.backend.client
+        source = self
+
+        class _WindowOpenedHandler(comtypes.COMObject):
+            _com_interfaces_ = [client.IUIAutomationEventHandler]
+
+            def IUIAutomationEventHandler_HandleAutomationEvent(self, sender, event_id):
+                try:
+                    name = (sender.CurrentName or "").upper()
+                    if all(kw in name for kw in source.keywords):
+                        source.notify(ElementInfo(
+                            sender, name, CONTROL_TYPE_WINDOW, "", True, (0, 0, 0, 0),
+                            handle=sender.CurrentNativeWindowHandle or 0,
+                            pid=sender.CurrentProcessId or 0
+                        ))
+                except COMError:
+                    # 視窗可能已關閉，交給輪詢備援處理
+                    pass
+                return 0
+
+        self._root = uia.GetRootElement()
+        self._handler = _WindowOpenedHandler()
+        uia.AddAutomationEventHandler(
+            client.UIA_Window_WindowOpenedEventId,
+            self._root,
+            client.TreeScope_Subtree,
+            None,
+            self._handler
+        )
 
+    def stop(self):
+        if self._handler is None:
+            return
         try:
-            # 移除前綴並解碼 base64
-            encrypted_b64 = encrypted[6:]  # 移除 "dpapi:"
-            encrypted_bytes = base64.b64decode(encrypted_b64)
+            self.backend.uia.RemoveAutomationEventHandler(
+                self.backend.client.UIA_Window_WindowOpenedEventId,
+                self._root,
+                self._handler
+            )
+        except Exception:
+            pass
+        finally:
+            self._handler = None
+            self._root = None
 
-            # 定義 DATA_BLOB 結構
-            class DATA_BLOB(ctypes.Structure):
-                _fields_ = [
-                    ('cbData', wintypes.DWORD),
-                    ('pbData', ctypes.POINTER(ctypes.c_char))
-                ]
 
-            # 準備輸入資料
-            buffer = ctypes.create_string_buffer(encrypted_bytes)
-            blob_in = DATA_BLOB(len(encrypted_bytes), ctypes.cast(buffer, ctypes.POINTER(ctypes.c_char)))
-            blob_out = DATA_BLOB()
-
-            # 調用 CryptUnprotectData
-            if ctypes.windll.crypt32.CryptUnprotectData(
-                ctypes.byref(blob_in),
-                None,
-                None,
-                None,
-                None,
-                0,
-                ctypes.byref(blob_out)
-            ):
-                # 讀取解密後的資料
-                decrypted_bytes = ctypes.string_at(blob_out.pbData, blob_out.cbData)
+class UIABackend(AutomationBackend):
+    """Windows UI Automation 後端（comtypes 與 UIA 物件在第一次使用時才建立）"""
 
-                # 釋放記憶體
-                ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+    def __init__(self):
+        super().__init__()
+        self._uia = None
+        self._client = None
+        self._cache_request = None
+        self._conditions = {}
+
+    def _ensure_uia(self):
+        if self._uia is None:
+            import comtypes.client
+            client = comtypes.client.GetModule("UIAutomationCore.dll")
+            self._uia = comtypes.client.CreateObject(
+                "{ff48dba4-60ef-4201-aa87-54103eef594e}",
+                interface=client.IUIAutomation
+            )
+            self._client = client
 
-                # 轉回字串
-                return decrypted_bytes.decode('utf-8')
-            else:
-                # 解密失敗，返回空字串
-                print("DPAPI 解密失敗")
-                return ""
+    def warm(self):
+        # 第一次執行時 GetModule 會產生 comtypes 包裝模組，之後只是載入；
+        # UIA COM 物件仍在第一次使用的執行緒上建立
+        try:
+            import comtypes.client
+            comtypes.client.GetModule("UIAutomationCore.dll")
+        except Exception as e:
+            print(f"預先載入 UI Automation 失敗: {e}")
 
+    def prepare(self):
+        try:
+            self._ensure_uia()
         except Exception as e:
-            print(f"解密失敗: {e}")
-            return ""
+            print(f"建立 UI Automation 失敗: {e}")
+
+    @property
+    def uia(self):
+        self._ensure_uia()
+        return self._uia
+
+    @property
+    def client(self):
+        self._ensure_uia()
+        return self._client
+
+    def _get_cache_request(self):
+        """取得共用的 CacheRequest，FindAllBuildCache 時一次取回比對需要的屬性"""
+        if self._cache_request is None:
+            client = self.client
+            request = self.uia.CreateCacheRequest()
+            for property_id in (
+                client.UIA_NamePropertyId,
+                client.UIA_ControlTypePropertyId,
+                client.UIA_AutomationIdPropertyId,
+                client.UIA_IsEnabledPropertyId,
+                client.UIA_BoundingRectanglePropertyId,
+                client.UIA_ValueValuePropertyId,
+                client.UIA_NativeWindowHandlePropertyId,
+                client.UIA_ProcessIdPropertyId,
+            ):
+                request.AddProperty(property_id)
+            self._cache_request = request
+        return self._cache_request
+
+    def _control_type_condition(self, control_type_id: int):
+        """取得 ControlType 條件（重複使用，不每次重建）"""
+        condition = self._conditions.get(control_type_id)
+        if condition is None:
+            condition = self.uia.CreatePropertyCondition(
+                self.client.UIA_ControlTypePropertyId,
+                control_type_id
+            )
+            self._conditions[control_type_id] = condition
+        return condition
+
+    def _snapshot_condition(self):
+        condition = self._conditions.get("snapshot")
+        if condition is None:
+            condition = self.uia.CreateOrCondition(
+                self._control_type_condition(CONTROL_TYPE_EDIT),
+                self._control_type_condition(CONTROL_TYPE_BUTTON)
+            )
+            self._conditions["snapshot"] = condition
+        return condition
+
+    def _find_all_cached(self, root, scope, condition) -> list[ElementInfo]:
+        """以單次 FindAllBuildCache 搜尋元素，之後只讀取快取值，不再逐一跨行程查詢"""
+        found = root.FindAllBuildCache(scope, condition, self._get_cache_request())
+        if not found:
+            return []
+
+        elements = []
+        for i in range(found.Length):
+            element = found.GetElement(i)
+            rect = element.CachedBoundingRectangle
+            value = element.GetCachedPropertyValue(self.client.UIA_ValueValuePropertyId)
+            elements.append(ElementInfo(
+                element=element,
+                name=element.CachedName or "",
+                control_type=element.CachedControlType,
+                automation_id=element.CachedAutomationId or "",
+                enabled=bool(element.CachedIsEnabled),
+                rect=(rect.left, rect.top, rect.right, rect.bottom),
+                # 不支援 ValuePattern 時 UIA 會回傳 NotSupported 物件
+                value=value if isinstance(value, str) else None,
+                handle=element.CachedNativeWindowHandle or 0,
+                pid=element.CachedProcessId or 0,
+            ))
+        return elements
+
+    def _process_windows_condition(self, pids: set[int]):
+        """ControlType 為 Window 且 ProcessId 為 pids 之一（pids 會變動，不快取）"""
+        uia, client = self.uia, self.client
+        process_condition = None
+        for pid in sorted(pids):
+            condition = uia.CreatePropertyCondition(client.UIA_ProcessIdPropertyId, pid)
+            process_condition = condition if process_condition is None else uia.CreateOrCondition(
+                process_condition, condition
+            )
+        return uia.CreateAndCondition(self._control_type_condition(CONTROL_TYPE_WINDOW), process_condition)
+
+    def find_top_windows(self, pids: set[int] = None) -> list[ElementInfo]:
+        self.count_call("find_top_windows")
+        if pids:
+            condition = self._process_windows_condition(pids)
+        else:
+            condition = self._control_type_condition(CONTROL_TYPE_WINDOW)
+        return self._find_all_cached(
+            self.uia.GetRootElement(),
+            self.client.TreeScope_Children,
+            condition
+        )
+
+    def process_tree(self, pids: set[int]) -> tuple[set[int], set[int]]:
+        self.count_call("process_tree")
+        try:
+            processes = list_processes()
+        except OSError:
+            return set(pids), set(pids)
+        tree = descendant_pids(processes, pids)
+        return tree, {pid for pid, _, _ in processes if pid in tree}
+
+    def snapshot(self, window) -> list[ElementInfo]:
+        self.count_call("snapshot")
+        return self._find_all_cached(
+            window.element,
+            self.client.TreeScope_Descendants,
+            self._snapshot_condition()
+        )
+
+    def create_window_event_source(self, keywords: list[str]) -> WindowEventSource:
+        return UIAWindowEventSource(self, keywords)
+
+    def set_value(self, info: ElementInfo, value: str):
+        from comtypes import COMError
+
+        self.count_call("set_value")
+        try:
+            pattern = info.element.GetCurrentPattern(
+                self.client.UIA_ValuePatternId
+            ).QueryInterface(self.client.IUIAutomationValuePattern)
+            pattern.SetValue(value)
+        except COMError as e:
+            raise AutomationError(str(e)) from e
+
+    def read_value(self, info: ElementInfo) -> str:
+        from comtypes import COMError
+
+        self.count_call("read_value")
+        try:
+            pattern = info.element.GetCurrentPattern(
+                self.client.UIA_ValuePatternId
+            ).QueryInterface(self.client.IUIAutomationValuePattern)
+            return pattern.CurrentValue
+        except COMError:
+            return None
+
+    def set_focus(self, info: ElementInfo):
+        from comtypes import COMError
+
+        self.count_call("set_focus")
+        try:
+            info.element.SetFocus()
+        except COMError as e:
+            raise AutomationError(str(e)) from e
+
+    def invoke(self, info: ElementInfo):
+        from comtypes import COMError
+
+        self.count_call("invoke")
+        try:
+            pattern = info.element.GetCurrentPattern(
+                self.client.UIA_InvokePatternId
+            ).QueryInterface(self.client.IUIAutomationInvokePattern)
+            pattern.Invoke()
+        except COMError as e:
+            raise AutomationError(str(e)) from e
+
+    def send_enter(self):
+        self.count_call("send_enter")
+        user32 = ctypes.windll.user32
+        VK_RETURN = 0x0D
+        KEYEVENTF_KEYUP = 0x0002
+
+        user32.keybd_event(VK_RETURN, 0, 0, 0)
+        user32.keybd_event(VK_RETURN, 0, KEYEVENTF_KEYUP, 0)
+
+    def click(self, info: ElementInfo):
+        self.count_call("click")
+        left, top, right, bottom = info.rect
+        x = int((left + right) / 2)
+        y = int((top + bottom) / 2)
+
+        # 移動滑鼠並點擊
+        ctypes.windll.user32.SetCursorPos(x, y)
+        time.sleep(0.1)
+
+        MOUSEEVENTF_LEFTDOWN = 0x0002
+        MOUSEEVENTF_LEFTUP = 0x0004
+
+        ctypes.windll.user32.mouse_event(MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
+        ctypes.windll.user32.mouse_event(MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
+
+    def launch(self, path: str, arguments: str = "", working_dir: str = "") -> int:
+        self.count_call("launch")
+        if path.lower().endswith(".lnk"):
+            # 無法解析的捷徑交給 Shell 開啟（與在檔案總管雙擊相同），取不到 PID
+            os.startfile(path)
+            return None
+        # 不經過 cmd.exe，直接建立行程才能取得 Launcher 本身的 PID
+        command = subprocess.list2cmdline([path]) + (f" {arguments}" if arguments else "")
+        cwd = working_dir if working_dir and os.path.isdir(working_dir) else os.path.dirname(path) or None
+        process = subprocess.Popen(command, cwd=cwd)
+        return process.pid
+
+
+# ============ 敏感資料加密 ============
+
+class ProtectionError(Exception):
+    """加密或解密失敗（不會退回明文）"""
+    pass
+
+
+class ProtectionBackend:
+    """
+    敏感欄位的加密方式
+    加密結果為「prefix + base64」字串；protect_many / unprotect_many 一次處理多個欄位，
+    後端可在同一批次中重複使用緩衝區與已載入的函式
+    """
+
+    prefix = ""
+
+    def owns(self, value: str) -> bool:
+        """value 是否為此後端加密的資料"""
+        return value.startswith(self.prefix)
+
+    def protect_blobs(self, blobs: list[bytes]) -> list[bytes]:
+        raise NotImplementedError
+
+    def unprotect_blobs(self, blobs: list[bytes]) -> list[bytes]:
+        raise NotImplementedError
+
+    def protect(self, plaintext: str) -> str:
+        return self.protect_many([plaintext])[0]
+
+    def unprotect(self, token: str) -> str:
+        return self.unprotect_many([token])[0]
+
+    def protect_many(self, plaintexts: list[str]) -> list[str]:
+        """加密多個字串，任何一個失敗時拋出 ProtectionError"""
+        blobs = self.protect_blobs([plaintext.encode("utf-8") for plaintext in plaintexts])
+        return [self.prefix + base64.b64encode(blob).decode("ascii") for blob in blobs]
+
+    def unprotect_many(self, tokens: list[str]) -> list[str]:
+        """解密多個字串，任何一個失敗時拋出 ProtectionError"""
+        blobs = []
+        for token in tokens:
+            if not self.owns(token):
+                raise ProtectionError("資料不是以目前的加密方式儲存")
+            try:
+                blobs.append(base64.b64decode(token[len(self.prefix):], validate=True))
+            except ValueError as e:
+                raise ProtectionError("加密資料格式錯誤") from e
+        try:
+            return [blob.decode("utf-8") for blob in self.unprotect_blobs(blobs)]
+        except UnicodeDecodeError as e:
+            raise ProtectionError("解密後的資料格式錯誤") from e
+
+
+class DATA_BLOB(ctypes.Structure):
+    """DPAPI 的輸入 / 輸出資料"""
+    _fields_ = [
+        ("cbData", wintypes.DWORD),
+        ("pbData", ctypes.POINTER(ctypes.c_char))
+    ]
+
+
+class DPAPIProtection(ProtectionBackend):
+    """Windows DPAPI：只有同一個 Windows 使用者能解密"""
+
+    prefix = "dpapi:"
+    # 不允許 DPAPI 顯示任何 UI
+    CRYPTPROTECT_UI_FORBIDDEN = 0x01
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffer = None
+        self._functions = None
+
+    def _load(self):
+        """載入並設定 CryptProtectData / CryptUnprotectData / LocalFree（只做一次）"""
+        if self._functions is None:
+            try:
+                crypt32 = ctypes.WinDLL("crypt32", use_last_error=True)
+                kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+            except (AttributeError, OSError) as e:
+                raise ProtectionError(f"無法載入 DPAPI: {e}") from e
+            signature = [ctypes.POINTER(DATA_BLOB), ctypes.c_void_p, ctypes.POINTER(DATA_BLOB),
+                         ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD, ctypes.POINTER(DATA_BLOB)]
+            for function in (crypt32.CryptProtectData, crypt32.CryptUnprotectData):
+                function.argtypes = signature
+                function.restype = wintypes.BOOL
+            kernel32.LocalFree.argtypes = [ctypes.c_void_p]
+            kernel32.LocalFree.restype = ctypes.c_void_p
+            self._functions = (crypt32.CryptProtectData, crypt32.CryptUnprotectData, kernel32.LocalFree)
+        return self._functions
+
+    def _transform(self, function, local_free, data: bytes, action: str) -> bytes:
+        # 輸入緩衝區重複使用，只在資料比緩衝區大時才重新配置；用完後清為 0
+        if self._buffer is None or len(self._buffer) < len(data):
+            self._buffer = ctypes.create_string_buffer(max(len(data), 256))
+        ctypes.memmove(self._buffer, data, len(data))
+        blob_in = DATA_BLOB(len(data), ctypes.cast(self._buffer, ctypes.POINTER(ctypes.c_char)))
+        blob_out = DATA_BLOB()
+        try:
+            if not function(ctypes.byref(blob_in), None, None, None, None,
+                            self.CRYPTPROTECT_UI_FORBIDDEN, ctypes.byref(blob_out)):
+                raise ProtectionError(f"DPAPI {action}失敗（錯誤碼 {ctypes.get_last_error()}）")
+            try:
+                return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+            finally:
+                local_free(blob_out.pbData)
+        finally:
+            ctypes.memset(self._buffer, 0, len(data))
+
+    def protect_blobs(self, blobs: list[bytes]) -> list[bytes]:
+        protect, _, local_free = self._load()
+        with self._lock:
+            return [self._transform(protect, local_free, blob, "加密") for blob in blobs]
+
+    def unprotect_blobs(self, blobs: list[bytes]) -> list[bytes]:
+        _, unprotect, local_free = self._load()
+        with self._lock:
+            return [self._transform(unprotect, local_free, blob, "解密") for blob in blobs]
+
+
+class KeyFileProtection(ProtectionBackend):
+    """
+    以本機金鑰檔加密（HMAC-SHA256 產生金鑰流並附加驗證碼，只使用標準函式庫）
+    供沒有 DPAPI 的環境（Linux、測試）使用，安全性取決於金鑰檔的存取權限
+    """
+
+    prefix = "keyfile:"
+    KEY_SIZE = 32
+    NONCE_SIZE = 16
+    TAG_SIZE = 16
+
+    def __init__(self, key_path: Path):
+        self.key_path = Path(key_path)
+        self._lock = threading.Lock()
+        self._keys = None
+
+    def _load_keys(self) -> tuple[bytes, bytes]:
+        """讀取金鑰檔（不存在時建立，權限 0600），返回 (加密金鑰, 驗證金鑰)"""
+        with self._lock:
+            if self._keys is None:
+                try:
+                    if self.key_path.exists():
+                        key = self.key_path.read_bytes()
+                    else:
+                        key = os.urandom(self.KEY_SIZE)
+                        self.key_path.parent.mkdir(parents=True, exist_ok=True)
+                        fd = os.open(self.key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                        with os.fdopen(fd, "wb") as f:
+                            f.write(key)
+                except OSError as e:
+                    raise ProtectionError(f"無法讀取金鑰檔: {e}") from e
+                if len(key) < self.KEY_SIZE:
+                    raise ProtectionError("金鑰檔格式錯誤")
+                self._keys = (hmac.digest(key, b"encrypt", "sha256"), hmac.digest(key, b"authenticate", "sha256"))
+            return self._keys
+
+    @staticmethod
+    def _xor_keystream(key: bytes, nonce: bytes, data: bytes) -> bytes:
+        stream = b"".join(
+            hmac.digest(key, nonce + counter.to_bytes(8, "big"), "sha256")
+            for counter in range((len(data) + 31) // 32)
+        )[:len(data)]
+        return (int.from_bytes(data, "big") ^ int.from_bytes(stream, "big")).to_bytes(len(data), "big")
+
+    def protect_blobs(self, blobs: list[bytes]) -> list[bytes]:
+        encrypt_key, mac_key = self._load_keys()
+        results = []
+        for blob in blobs:
+            nonce = os.urandom(self.NONCE_SIZE)
+            ciphertext = self._xor_keystream(encrypt_key, nonce, blob)
+            tag = hmac.digest(mac_key, nonce + ciphertext, "sha256")[:self.TAG_SIZE]
+            results.append(nonce + ciphertext + tag)
+        return results
+
+    def unprotect_blobs(self, blobs: list[bytes]) -> list[bytes]:
+        encrypt_key, mac_key = self._load_keys()
+        results = []
+        for blob in blobs:
+            if len(blob) < self.NONCE_SIZE + self.TAG_SIZE:
+                raise ProtectionError("加密資料格式錯誤")
+            nonce, ciphertext, tag = blob[:self.NONCE_SIZE], blob[self.NONCE_SIZE:-self.TAG_SIZE], blob[-self.TAG_SIZE:]
+            expected = hmac.digest(mac_key, nonce + ciphertext, "sha256")[:self.TAG_SIZE]
+            if not hmac.compare_digest(tag, expected):
+                raise ProtectionError("金鑰不符或資料已損毀")
+            results.append(self._xor_keystream(encrypt_key, nonce, ciphertext))
+        return results
+
+
+# 所有加密方式的前綴，不符合任何前綴的值視為明文（停用加密或舊版資料）
+PROTECTED_PREFIXES = (DPAPIProtection.prefix, KeyFileProtection.prefix)
+
+
+def is_protected(value: str) -> bool:
+    return bool(value) and value.startswith(PROTECTED_PREFIXES)
+
+
+def default_protection(config_dir: Path) -> ProtectionBackend:
+    """Windows 使用 DPAPI，其他平台使用設定資料夾中的金鑰檔"""
+    if sys.platform == "win32":
+        return DPAPIProtection()
+    return KeyFileProtection(Path(config_dir) / "secret.key")
+
+
+# ============ 帳號儲存 ============
+
+def file_state(path: Path) -> tuple:
+    """檔案的 (修改時間, 大小)，用來判斷其他行程是否改寫了檔案；檔案不存在時返回 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def remove_securely(path: Path) -> bool:
+    """
+    以零覆寫檔案內容並寫入磁碟後刪除，用於含明文帳號資料的暫存或備份檔；檔案不存在時返回 False
+    SSD 或檔案系統的日誌仍可能留有舊資料，只能減少明文留在原位置的時間
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return False
+    try:
+        with open(path, "r+b") as f:
+            f.write(b"\0" * size)
+            f.flush()
+            os.fsync(f.fileno())
+    except OSError as e:
+        print(f"覆寫 {path.name} 失敗: {e}")
+    try:
+        os.remove(path)
+    except OSError as e:
+        print(f"刪除 {path.name} 失敗: {e}")
+        return False
+    return True
+
+
+class AccountStore:
+    """
+    帳號紀錄檔（每行一筆 JSON 操作：put 寫入整個帳號、delete 刪除帳號）
+    新增 / 修改 / 刪除單一帳號只附加一行並 fsync，不重寫整個檔案；
+    舊紀錄超過有效帳號數一定倍數時才整理成每個帳號一行。
+    記憶體中依檔案順序保存帳號，並以 id 與名稱建立索引。敏感欄位由 ConfigManager 加密後才寫入。
+    """
+
+    COMPACT_RATIO = 3  # 紀錄行數超過帳號數的倍數時整理
+    COMPACT_MIN_LINES = 64
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._records = None  # id → 帳號（依加入順序）
+        self._by_name = {}  # 名稱 → [id, ...]（名稱可能重複）
+        self._order = None  # 索引 → id，新增或刪除後重建
+        self._lines = 0
+        self._needs_newline = False  # 上次寫到一半中斷，最後一行沒有換行
+        self._state = None  # 最後一次讀寫後的 file_state
+
+    # ---- 讀取 ----
+
+    def _ensure_loaded(self) -> dict:
+        if self._records is None:
+            with self._lock:
+                if self._records is None:
+                    self._load()
+        return self._records
+
+    def _load(self):
+        records = {}
+        lines = 0
+        data = ""
+        self._state = file_state(self.path)
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = f.read()
+        for line in data.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # 寫到一半中斷的最後一行
+            lines += 1
+            if entry.get("op") == "delete":
+                records.pop(entry.get("id"), None)
+            elif entry.get("op") == "put" and entry.get("account", {}).get("id"):
+                account = entry["account"]
+                records[account["id"]] = account
+        self._records = records
+        self._lines = lines
+        self._needs_newline = bool(data) and not data.endswith("\n")
+        self._by_name = {}
+        for account in records.values():
+            self._index(account)
+        self._order = None
+
+    def refresh(self):
+        """檔案被其他行程改寫過時，下次存取重新讀取"""
+        with self._lock:
+            if self._records is not None and file_state(self.path) != self._state:
+                self._records = None
+                self._order = None
+
+    @staticmethod
+    def _name_key(name: str) -> str:
+        return (name or "").strip().casefold()
+
+    def _index(self, account: dict):
+        self._by_name.setdefault(self._name_key(account.get("name")), []).append(account["id"])
+
+    def _unindex(self, account: dict):
+        key = self._name_key(account.get("name"))
+        ids = self._by_name.get(key, [])
+        if account["id"] in ids:
+            ids.remove(account["id"])
+        if not ids:
+            self._by_name.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ensure_loaded())
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def all(self) -> list[dict]:
+        """所有帳號（複本，敏感欄位為密文）"""
+        with self._lock:
+            return [dict(account) for account in self._ensure_loaded().values()]
+
+    def get(self, account_id: str) -> dict:
+        with self._lock:
+            account = self._ensure_loaded().get(account_id)
+            return dict(account) if account else None
+
+    def _ids(self) -> list[str]:
+        records = self._ensure_loaded()
+        if self._order is None:
+            self._order = list(records)
+        return self._order
+
+    def at(self, index: int) -> dict:
+        """依列表順序取得帳號，索引無效時返回 None"""
+        with self._lock:
+            ids = self._ids()
+            if not 0 <= index < len(ids):
+                return None
+            return dict(self._ensure_loaded()[ids[index]])
+
+    def index_of(self, account_id: str) -> int:
+        with self._lock:
+            ids = self._ids()
+            return ids.index(account_id) if account_id in self._ensure_loaded() else -1
+
+    def find_by_name(self, name: str) -> list[dict]:
+        """名稱相符（不分大小寫、忽略前後空白）的帳號"""
+        with self._lock:
+            self._ensure_loaded()
+            return [dict(self._records[account_id]) for account_id in self._by_name.get(self._name_key(name), [])]
+
+    # ---- 寫入 ----
+
+    def _append(self, entries: list[dict]):
+        """附加多筆操作，整批只 fsync 一次"""
+        data = "".join(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n" for entry in entries)
+        if self._needs_newline:
+            data = "\n" + data
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._needs_newline = False
+        self._lines += len(entries)
+        self._state = file_state(self.path)
+
+    def put_many(self, accounts: list[dict]):
+        """新增或取代多個帳號（已存在的 id 維持原本位置）"""
+        if not accounts:
+            return
+        with self._lock:
+            records = self._ensure_loaded()
+            accounts = [dict(account) for account in accounts]
+            self._append([{"op": "put", "account": account} for account in accounts])
+            for account in accounts:
+                previous = records.get(account["id"])
+                if previous:
+                    self._unindex(previous)
+                else:
+                    self._order = None
+                records[account["id"]] = account
+                self._index(account)
+            self._compact_if_needed()
+
+    def put(self, account: dict):
+        self.put_many([account])
+
+    def delete(self, account_id: str) -> bool:
+        with self._lock:
+            records = self._ensure_loaded()
+            if account_id not in records:
+                return False
+            self._append([{"op": "delete", "id": account_id}])
+            self._unindex(records.pop(account_id))
+            self._order = None
+            self._compact_if_needed()
+            return True
+
+    def replace_all(self, accounts: list[dict]):
+        """以新的帳號列表重寫整個檔案（從 config.json 遷移時使用）"""
+        with self._lock:
+            self._ensure_loaded()
+            self._records = {account["id"]: dict(account) for account in accounts}
+            self._by_name = {}
+            for account in self._records.values():
+                self._index(account)
+            self._order = None
+            self._rewrite()
+
+    def _compact_if_needed(self):
+        if self._lines > max(self.COMPACT_MIN_LINES, len(self._records) * self.COMPACT_RATIO):
+            try:
+                self._rewrite()
+            except OSError as e:
+                # 整理失敗不影響已寫入的紀錄，下次再試
+                print(f"整理帳號紀錄檔失敗: {e}")
+
+    def _rewrite(self):
+        """每個帳號寫成一行（暫存檔 + fsync + 取代）"""
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for account in self._records.values():
+                f.write(json.dumps({"op": "put", "account": account}, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._lines = len(self._records)
+        self._needs_newline = False
+        self._state = file_state(self.path)
 
 
 class ConfigManager:
     """設定檔管理"""
-    def __init__(self):
-        # 新路徑：使用 Windows AppData\Local
-        appdata_local = Path(os.getenv('LOCALAPPDATA', Path.home() / 'AppData' / 'Local'))
-        self.config_dir = appdata_local / "FF14LoginManager"
+
+    # 加密儲存的帳號欄位
+    ENCRYPTED_FIELDS = ("email", "password", "secret_key")
+    # 最後一次變更後延遲寫入的秒數
+    SAVE_DELAY = 0.5
+    # 解密結果快取筆數
+    DECRYPT_CACHE_SIZE = SECRET_CACHE_SIZE
+
+    def __init__(self, config_dir: Path = None, protection: ProtectionBackend = None):
+        if config_dir is None:
+            # 新路徑：使用 Windows AppData\Local
+            appdata_local = Path(os.getenv('LOCALAPPDATA', Path.home() / 'AppData' / 'Local'))
+            self.config_dir = appdata_local / "FF14LoginManager"
+        else:
+            # 指定資料夾（工具與效能測試使用），不做舊檔遷移
+            self.config_dir = Path(config_dir)
         self.config_path = self.config_dir / "config.json"
+        # 搬移舊版帳號時的暫時備份（含明文，搬移結束後刪除）
+        self.backup_path = self.config_dir / "config.json.bak"
 
         # 舊路徑（用於遷移）
         self.legacy_config_path = Path.home() / ".ff14_login_config.json"
 
         # 確保資料夾存在
         self.config_dir.mkdir(parents=True, exist_ok=True)
-
-        # 自動遷移舊檔案
-        self._migrate_legacy_config()
-
-        self.config = self.load()
+        self._migrate_legacy = config_dir is None
+
+        # 帳號敏感欄位的加密方式（Windows 為 DPAPI）
+        self.protection = protection or default_protection(self.config_dir)
+        # 帳號另外存放，每個帳號一筆紀錄，修改單一帳號不需要重寫 config.json
+        self._accounts = AccountStore(self.config_dir / "accounts.jsonl")
+
+        # 寫入狀態：set / update 只記錄變更的 key，由背景執行緒合併後寫入
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._dirty_keys = set()
+        self._last_change = 0.0
+        self._writer = None
+        # 密文 → 明文，只保留最近使用的幾筆
+        self._plaintexts = OrderedDict()
+
+        # 設定檔在第一次存取 config 時才讀取（或由 preload 在背景先讀取）
+        self._config = None
+        self._config_state = None  # 最後一次讀寫設定檔後的 file_state
+        atexit.register(self.flush)
+
+    @property
+    def config(self) -> dict:
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    # 自動遷移舊檔案
+                    if self._migrate_legacy:
+                        self._migrate_legacy_config()
+                    self._config = self.load()
+        return self._config
+
+    @config.setter
+    def config(self, value: dict):
+        self._config = value
+
+    @property
+    def accounts(self) -> AccountStore:
+        """帳號紀錄檔（先讀取設定檔，確保舊版 config.json 的帳號已經搬移）"""
+        self.config
+        return self._accounts
+
+    def reload_if_changed(self):
+        """設定檔或帳號紀錄檔被其他行程（例如視窗介面）改寫過時重新讀取，本行程尚未寫入的 key 優先"""
+        with self._lock:
+            self._merge_external_changes()
+            self._accounts.refresh()
+
+    def _merge_external_changes(self):
+        """設定檔在上次讀寫後被其他行程改寫時重新讀取，再套回本行程尚未寫入的 key"""
+        if self._config is None or file_state(self.config_path) == self._config_state:
+            return
+        pending = {key: self._config[key] for key in self._dirty_keys if key in self._config}
+        self._config = None
+        self.config.update(pending)
+        self._dirty_keys.update(pending)
+
+    def preload(self) -> threading.Thread:
+        """在背景執行緒讀取設定檔，讓讀檔與其他啟動工作重疊"""
+        thread = threading.Thread(target=lambda: self.config, daemon=True)
+        thread.start()
+        return thread
 
     def _migrate_legacy_config(self):
         """自動遷移舊版設定檔到新位置"""
@@ -192,7 +1692,6 @@ class ConfigManager:
     def load(self) -> dict:
         default = {
             "launcher_path": "",
-            "accounts": [],
             "selected_account": -1,
             "theme": "tsuyukusa",
             "brightness": 50,
@@ -204,8 +1703,14 @@ class ConfigManager:
             "auto_click_play": True,
             "window_x": None,
             "window_y": None,
+            "window_event_detection": True,  # 使用 UIA 事件偵測 Launcher 視窗
+            "step_settle_ms": 50,  # 自動化步驟條件成立後的最短穩定時間
+            "max_concurrent_launches": 2,  # 多開時同時執行的帳號數
+            "otp_rollover_margin": 3,  # OTP 剩餘秒數低於此值時不送出目前的 OTP
+            "otp_rollover_policy": "wait",  # wait：等到下一個時間區間；next：直接送出下一個 OTP
             "encryption_enabled": True  # 標記是否啟用加密
         }
+        self._config_state = file_state(self.config_path)
         if self.config_path.exists():
             try:
                 with open(self.config_path, "r", encoding="utf-8") as f:
@@ -217,34 +1722,30 @@ class ConfigManager:
                         if key in loaded:
                             del loaded[key]
 
-                    # 解密帳號資料
+                    # 舊版帳號列表存放在 config.json，搬到帳號紀錄檔後從設定檔移除
                     if "accounts" in loaded:
-                        needs_upgrade = False
-                        for account in loaded["accounts"]:
-                            # 檢查是否需要升級（明文 → 加密）
-                            # 排除空字串，只有非空且不是 dpapi: 開頭的才需要升級
-                            for field in ["email", "password", "secret_key"]:
-                                if field in account and account[field] and not account[field].startswith("dpapi:"):
-                                    needs_upgrade = True
-                                    break
-
-                            # 解密敏感欄位
-                            if "email" in account:
-                                account["email"] = DPAPIEncryption.decrypt(account["email"])
-                            if "password" in account:
-                                account["password"] = DPAPIEncryption.decrypt(account["password"])
-                            if "secret_key" in account:
-                                account["secret_key"] = DPAPIEncryption.decrypt(account["secret_key"])
-
-                        # 如果偵測到明文資料，自動升級並儲存
-                        if needs_upgrade:
-                            print("偵測到舊版明文設定，正在升級為加密格式...")
-                            loaded["encryption_enabled"] = True
-                            # 暫存解密後的資料
-                            temp_config = loaded.copy()
-                            self.config = temp_config
-                            # 重新加密並儲存
+                        try:
+                            # 改寫設定檔前先保留一份原始檔案；備份含明文帳號資料，搬移結束後一律刪除：
+                            # 成功時帳號已寫入紀錄檔並讀回確認，失敗時設定檔中的帳號保持不動
+                            import shutil
+                            shutil.copy2(self.config_path, self.backup_path)
+                            self._migrate_accounts(loaded["accounts"] or [], loaded.get("encryption_enabled", True))
+                        except OSError as e:
+                            # 保留設定檔中的帳號列表，下次啟動再試
+                            print(f"搬移帳號資料失敗: {e}")
+                        else:
+                            del loaded["accounts"]
+                            print("偵測到舊版設定，已將帳號資料搬到帳號紀錄檔")
+                            self.config = loaded
                             self.save()
+                        finally:
+                            remove_securely(self.backup_path)
+                    else:
+                        # 舊版本搬移後留下的備份
+                        if len(self._accounts) and remove_securely(self.backup_path):
+                            print("已刪除搬移帳號時留下的 config.json.bak")
+                        if loaded.get("encryption_enabled", True):
+                            self._upgrade_plaintext_accounts()
 
                     # 合併預設值（補齊新增的設定項）
                     for key, value in default.items():
@@ -257,498 +1758,1478 @@ class ConfigManager:
                 pass
         return default
 
-    def save(self):
-        # 深拷貝一份用於加密儲存
-        config_to_save = json.loads(json.dumps(self.config))
-
-        # 加密帳號資料
-        if "accounts" in config_to_save and config_to_save.get("encryption_enabled", True):
-            for account in config_to_save["accounts"]:
-                # 加密敏感欄位
-                if "email" in account:
-                    account["email"] = DPAPIEncryption.encrypt(account["email"])
-                if "password" in account:
-                    account["password"] = DPAPIEncryption.encrypt(account["password"])
-                if "secret_key" in account:
-                    account["secret_key"] = DPAPIEncryption.encrypt(account["secret_key"])
-
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(config_to_save, f, ensure_ascii=False, indent=2)
+    def _migrate_accounts(self, legacy: list[dict], encryption_enabled: bool):
+        """
+        將 config.json 的帳號列表寫入帳號紀錄檔（補上 id、明文先整批加密再寫入）
+        紀錄檔已有帳號時表示上次已搬移、只是設定檔還沒來得及改寫，不重複寫入。
+        寫入後重新讀取紀錄檔確認帳號都在，否則拋出 OSError，設定檔中的帳號保持不動
+        """
+        if not len(self._accounts):
+            accounts = []
+            for account in legacy:
+                account = {key: value for key, value in account.items()
+                           if key not in ("has_email", "has_password", "has_secret")}
+                account["id"] = account.get("id") or uuid.uuid4().hex
+                accounts.append(account)
+            if encryption_enabled:
+                self._encrypt_plaintext(accounts)
+            self._accounts.replace_all(accounts)
+
+        stored, expected = len(AccountStore(self._accounts.path)), len(self._accounts)
+        if not expected and legacy or stored != expected:
+            raise OSError(f"帳號紀錄檔驗證失敗：讀回 {stored} 個帳號，應有 {expected} 個")
+
+    def _encrypt_plaintext(self, accounts: list[dict]) -> bool:
+        """
+        帳號資料維持加密，使用時才解密（get_account）
+        將明文欄位（舊版資料或上次加密失敗）整批一次加密，返回是否有變更；加密失敗時保留原始資料，下次啟動再試
+        """
+        plaintext_fields = [
+            (account, field) for account in accounts for field in self.ENCRYPTED_FIELDS
+            if account.get(field) and not is_protected(account[field])
+        ]
+        if not plaintext_fields:
+            return False
+        try:
+            encrypted = self.protection.protect_many([a[f] for a, f in plaintext_fields])
+        except ProtectionError as e:
+            print(f"加密舊版帳號資料失敗: {e}")
+            return False
+        for (account, field), value in zip(plaintext_fields, encrypted):
+            account[field] = value
+        return True
 
+    def _upgrade_plaintext_accounts(self):
+        """帳號紀錄檔中仍有明文時加密後重寫整個檔案，不留下含明文的舊紀錄"""
+        try:
+            accounts = self._accounts.all()
+            if self._encrypt_plaintext(accounts):
+                print("偵測到未加密的帳號資料，正在升級帳號資料格式...")
+                self._accounts.replace_all(accounts)
+        except OSError as e:
+            print(f"升級帳號紀錄檔失敗: {e}")
+
+    def decrypt_fields(self, values: list[str]) -> list[str]:
+        """
+        解密多個欄位（未加密的值原樣返回），快取中沒有的一次交給加密後端解密，
+        最近使用的結果保留在有上限的快取中；解密失敗時拋出 ProtectionError
+        """
+        results = [value or "" for value in values]
+        pending = {}
+        with self._lock:
+            for i, value in enumerate(values):
+                if not is_protected(value):
+                    continue
+                plaintext = self._plaintexts.get(value)
+                if plaintext is None:
+                    pending.setdefault(value, []).append(i)
+                else:
+                    self._plaintexts.move_to_end(value)
+                    results[i] = plaintext
+
+        if pending:
+            encrypted = list(pending)
+            if not all(self.protection.owns(value) for value in encrypted):
+                raise ProtectionError("帳號資料是以其他加密方式儲存，無法在此環境解密")
+            plaintexts = self.protection.unprotect_many(encrypted)
+            with self._lock:
+                for value, plaintext in zip(encrypted, plaintexts):
+                    for i in pending[value]:
+                        results[i] = plaintext
+                    self._plaintexts[value] = plaintext
+                while len(self._plaintexts) > self.DECRYPT_CACHE_SIZE:
+                    self._plaintexts.popitem(last=False)
+        return results
+
+    def decrypt_field(self, encrypted: str) -> str:
+        """解密單一欄位，失敗時拋出 ProtectionError"""
+        return self.decrypt_fields([encrypted])[0]
+
+    def _encrypt_field(self, plaintext: str, previous: str) -> str:
+        """加密單一欄位，與目前的值相同時沿用原本的密文；加密失敗時拋出 ProtectionError"""
+        if previous:
+            try:
+                if self.decrypt_field(previous) == plaintext:
+                    return previous
+            except ProtectionError:
+                # 原本的密文無法解密，直接以新的值取代
+                pass
+        if not plaintext or not self.config.get("encryption_enabled", True):
+            return plaintext
+        return self.protection.protect(plaintext)
+
+    @staticmethod
+    def account_summary(account: dict) -> dict:
+        """不含敏感資料的帳號資訊"""
+        return {
+            "id": account.get("id"),
+            "name": account.get("name", ""),
+            "has_email": bool(account.get("email")),
+            "has_password": bool(account.get("password")),
+            "has_secret": bool(account.get("secret_key")),
+        }
+
+    def account_summaries(self) -> list[dict]:
+        """不含敏感資料的帳號列表"""
+        return [self.account_summary(account) for account in self.accounts.all()]
+
+    def _decrypted(self, account: dict) -> dict:
+        plaintexts = self.decrypt_fields([account.get(field, "") for field in self.ENCRYPTED_FIELDS])
+        account.update(zip(self.ENCRYPTED_FIELDS, plaintexts))
+        return account
+
+    def get_account(self, index: int) -> dict:
+        """取得解密後的單一帳號（依列表順序），索引無效時返回 None"""
+        account = self.accounts.at(index)
+        return self._decrypted(account) if account else None
+
+    def get_account_by_id(self, account_id: str) -> dict:
+        """取得解密後的單一帳號，找不到時返回 None"""
+        account = self.accounts.get(account_id)
+        return self._decrypted(account) if account else None
+
+    def find_accounts(self, name: str) -> list[dict]:
+        """名稱相符的帳號（不分大小寫，含列表索引，敏感欄位為密文）"""
+        accounts = self.accounts.find_by_name(name)
+        for account in accounts:
+            account["index"] = self.accounts.index_of(account["id"])
+        return accounts
+
+    def _account_record(self, fields: dict, previous: dict) -> dict:
+        """
+        將網頁送來的欄位套用到帳號紀錄
+        沒有帶的敏感欄位沿用原本的密文；有帶的欄位只在內容改變時重新加密
+        """
+        record = dict(previous)
+        if "name" in fields:
+            record["name"] = fields["name"] or ""
+        for field in self.ENCRYPTED_FIELDS:
+            if field in fields:
+                record[field] = self._encrypt_field(fields[field] or "", previous.get(field, ""))
+            else:
+                record.setdefault(field, "")
+        return record
+
+    def add_account(self, fields: dict) -> dict:
+        """新增單一帳號（只附加一筆紀錄），返回帳號資訊；加密失敗時拋出 ProtectionError"""
+        record = self._account_record(fields, {"id": uuid.uuid4().hex, "name": ""})
+        self.accounts.put(record)
+        return self.account_summary(record)
+
+    def update_account(self, account_id: str, fields: dict) -> dict:
+        """
+        修改單一帳號（只改寫該帳號的紀錄），返回帳號資訊；找不到帳號時返回 None
+        加密失敗時拋出 ProtectionError，紀錄不會變更
+        """
+        with self._lock:
+            previous = self.accounts.get(account_id)
+            if previous is None:
+                return None
+            record = self._account_record(fields, previous)
+            if record != previous:
+                self.accounts.put(record)
+        return self.account_summary(record)
+
+    def delete_account(self, account_id: str) -> bool:
+        """刪除單一帳號，並調整目前選取的帳號索引"""
+        with self._lock:
+            index = self.accounts.index_of(account_id)
+            if index < 0:
+                return False
+            self.accounts.delete(account_id)
+            selected = self.config.get("selected_account", -1)
+            if selected == index:
+                self.set("selected_account", -1)
+            elif selected > index:
+                self.set("selected_account", selected - 1)
+            return True
+
+    def secret_keys(self) -> set[str]:
+        """所有帳號正規化後的 Secret Key（匯入時檢查重複用）"""
+        encrypted = [account.get("secret_key", "") for account in self.accounts.all()]
+        return {normalize_secret(value) for value in self.decrypt_fields(encrypted) if value}
+
+    def add_accounts(self, accounts: list[dict]) -> list[dict]:
+        """
+        一次新增多個帳號（敏感欄位整批加密後加入），整批只寫入一次帳號紀錄檔
+        返回新增的帳號（密文）；加密失敗時拋出 ProtectionError，不會新增任何帳號
+        """
+        added = [{"id": uuid.uuid4().hex, "name": account.get("name", "")} for account in accounts]
+        fields = [(entry, field, account.get(field) or "")
+                  for entry, account in zip(added, accounts) for field in self.ENCRYPTED_FIELDS]
+        for entry, field, value in fields:
+            entry[field] = value
+        if self.config.get("encryption_enabled", True):
+            to_encrypt = [(entry, field, value) for entry, field, value in fields if value]
+            encrypted = self.protection.protect_many([value for _, _, value in to_encrypt])
+            for (entry, field, _), value in zip(to_encrypt, encrypted):
+                entry[field] = value
+        self.accounts.put_many(added)
+        return added
+
+    def save(self):
+        """立即寫入設定檔（暫存檔 + fsync + 取代，寫到一半中斷也不會留下損壞的設定檔）"""
+        with self._lock:
+            # 其他行程改寫過設定檔時先合併，只覆寫本行程修改過的 key
+            if self._dirty_keys:
+                self._merge_external_changes()
+            self._dirty_keys.clear()
+            data = json.dumps(self.config, ensure_ascii=False, indent=2)
+
+            temp_path = self.config_path.with_name(self.config_path.name + ".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.config_path)
+            self._config_state = file_state(self.config_path)
+
+    def flush(self):
+        """有尚未寫入的變更時立即寫入"""
+        with self._lock:
+            if self._dirty_keys:
+                self.save()
+
+    def _mark_dirty(self, keys):
+        self._dirty_keys.update(keys)
+        self._last_change = time.monotonic()
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+        self._changed.notify()
+
+    def _write_loop(self):
+        """等到最後一次變更後 SAVE_DELAY 秒內沒有新的變更才寫入，合併連續的多次修改"""
+        while True:
+            with self._changed:
+                while not self._dirty_keys:
+                    self._changed.wait()
+                while True:
+                    remaining = self._last_change + self.SAVE_DELAY - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"儲存設定失敗: {e}")
+
+    # 讀取與寫入都複製 list / dict 值：呼叫端就地修改取得的值不會繞過變更偵測，
+    # 修改後再 set 回來時也能與原值比較出差異
     def get(self, key: str, default=None):
-        return self.config.get(key, default)
+        with self._lock:
+            return copy.deepcopy(self.config.get(key, default))
 
     def set(self, key: str, value):
-        self.config[key] = value
-        self.save()
+        self.update({key: value})
 
     def get_all(self) -> dict:
-        return self.config.copy()
+        with self._lock:
+            return copy.deepcopy(self.config)
 
     def update(self, data: dict):
-        self.config.update(data)
-        self.save()
+        # 帳號不放在設定檔，改由 add_account / update_account / delete_account 個別寫入
+        data = {key: value for key, value in data.items() if key != "accounts"}
+        with self._lock:
+            changed = {key: copy.deepcopy(value) for key, value in data.items()
+                       if key not in self.config or self.config[key] != value}
+            if not changed:
+                return
+            self.config.update(changed)
+            self._mark_dirty(changed)
+
+
+# ============ Launcher 視窗綁定 ============
+
+class WindowRegistry:
+    """記錄各自動化流程已綁定的 Launcher 視窗，避免同時執行的流程搶到同一個視窗"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owners = {}
+
+    def claim(self, window: ElementInfo, owner) -> bool:
+        """綁定視窗，已被其他流程綁定時返回 False（handle 未知的視窗無法區分，一律允許）"""
+        if not window.handle:
+            return True
+        with self._lock:
+            current = self._owners.get(window.handle)
+            if current is not None and current is not owner:
+                return False
+            self._owners[window.handle] = owner
+            return True
+
+    def is_available(self, window: ElementInfo, owner) -> bool:
+        with self._lock:
+            current = self._owners.get(window.handle)
+        return not window.handle or current is None or current is owner
+
+    def release(self, owner):
+        """解除 owner 綁定的所有視窗"""
+        with self._lock:
+            self._owners = {h: o for h, o in self._owners.items() if o is not owner}
+
+
+# ============ 自動化流程計時 ============
+
+class AutomationTrace:
+    """
+    單次自動化流程的各階段計時（time.monotonic）
+    同時記錄每個階段的後端（UIA）呼叫次數與輪詢次數
+    """
+
+    def __init__(self, backend: AutomationBackend = None):
+        self.backend = backend
+        self.started_at = time.monotonic()
+        self.phases = []
+        self.notes = {}
+        self._current = None
+        if backend is not None:
+            backend.reset_counters()
+
+    def begin(self, phase: str):
+        """結束目前階段並開始新的階段"""
+        self._end_current()
+        self._current = {"name": phase, "start": time.monotonic(), "polls": 0}
+        if self.backend is not None:
+            self.backend.begin_phase(phase)
+
+    def note(self, key: str, value):
+        """附加一筆說明到這次的紀錄（例如 OTP 的選擇）"""
+        self.notes[key] = value
+
+    def poll(self):
+        """記錄一次輪詢"""
+        if self._current is not None:
+            self._current["polls"] += 1
+
+    def _end_current(self):
+        if self._current is None:
+            return
+        phase = self._current
+        phase["duration"] = time.monotonic() - phase["start"]
+        self.phases.append(phase)
+        self._current = None
+
+    def finish(self, success: bool, message: str) -> dict:
+        """結束計時，返回精簡的紀錄（時間單位：毫秒）"""
+        self._end_current()
+        calls_by_phase = self.backend.calls_by_phase if self.backend is not None else {}
+        return {
+            "t": int(time.time()),
+            "ok": success,
+            "msg": message,
+            "total": round((time.monotonic() - self.started_at) * 1000, 1),
+            # 階段名稱: [耗時毫秒, 後端呼叫次數, 輪詢次數]
+            "phases": {
+                phase["name"]: [
+                    round(phase["duration"] * 1000, 1),
+                    sum(calls_by_phase.get(phase["name"], {}).values()),
+                    phase["polls"],
+                ]
+                for phase in self.phases
+            },
+            **({"notes": self.notes} if self.notes else {}),
+        }
+
+
+def percentile(values: list, pct: float) -> float:
+    """最近排名法百分位數"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class TimingHistory:
+    """自動化計時紀錄檔（每行一筆 JSON，只保留最近 max_runs 筆）"""
+
+    def __init__(self, path: Path, max_runs: int = 200):
+        self.path = Path(path)
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+
+    def append(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+                # 超過上限一定比例才整理，避免每次都重寫檔案
+                if self.path.stat().st_size > self.max_runs * 2 * len(line):
+                    records = self._read()
+                    if len(records) > self.max_runs:
+                        with open(self.path, "w", encoding="utf-8") as f:
+                            for r in records[-self.max_runs:]:
+                                f.write(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n")
+            except OSError as e:
+                print(f"寫入計時紀錄失敗: {e}")
+
+    def _read(self) -> list[dict]:
+        records = []
+        if not self.path.exists():
+            return records
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        return records
+
+    def load(self, last_n: int = None) -> list[dict]:
+        with self._lock:
+            try:
+                records = self._read()
+            except OSError as e:
+                print(f"讀取計時紀錄失敗: {e}")
+                return []
+        return records[-last_n:] if last_n else records
+
+    def stats(self, last_n: int = 20) -> dict:
+        """最近 last_n 次的各階段 p50 / p95"""
+        records = self.load(last_n)
+        phase_names = []
+        samples = {}
+        for record in records:
+            for name, (duration, calls, polls) in record.get("phases", {}).items():
+                if name not in samples:
+                    phase_names.append(name)
+                    samples[name] = {"duration": [], "calls": [], "polls": []}
+                samples[name]["duration"].append(duration)
+                samples[name]["calls"].append(calls)
+                samples[name]["polls"].append(polls)
+
+        totals = [r["total"] for r in records if r.get("ok")]
+        return {
+            "runs": len(records),
+            "succeeded": len(totals),
+            "total": {"p50": percentile(totals, 50), "p95": percentile(totals, 95)},
+            "phases": [
+                {
+                    "name": name,
+                    "p50": percentile(samples[name]["duration"], 50),
+                    "p95": percentile(samples[name]["duration"], 95),
+                    "calls_p50": percentile(samples[name]["calls"], 50),
+                    "polls_p50": percentile(samples[name]["polls"], 50),
+                }
+                for name in phase_names
+            ],
+        }
+
+
+# ============ 自動化步驟排程 ============
+
+@dataclass
+class AutomationStep:
+    """
+    自動化步驟：宣告要等待的條件與條件成立後要執行的動作
+    ready 接收 LauncherSnapshot，條件成立時返回動作的目標（元素），否則返回 None
+    """
+    name: str                 # 階段名稱（同時用於後端呼叫計數）
+    status: str               # 開始等待時顯示的狀態
+    ready: callable
+    action: callable          # 接收 ready 的返回值，返回 (success, msg)
+    timeout: float
+    find_phase: str = ""      # 等待條件的階段名稱（空白時與動作同屬 name 階段）
+    found_status: str = ""    # 條件成立時顯示的狀態
+    missing_status: str = ""  # 逾時時顯示的狀態
+    optional: bool = False    # 逾時時是否略過並繼續下一步
+    after: str = ""           # 只有在此步驟完成後才執行
+
+
+class StepScheduler:
+    """
+    條件驅動的步驟排程
+    每個步驟等待自己的條件成立，成立後只等待最短穩定時間（settle）就立即執行，
+    不再固定 sleep；等待期間以逐步拉長的間隔重新取得快照
+    """
+
+    POLL_INITIAL = 0.05
+    POLL_MAX = 0.25
+
+    def __init__(self, automation: "LauncherAutomation", launcher: ElementInfo, settle: float):
+        self.automation = automation
+        self.launcher = launcher
+        self.settle = settle
+        self.completed = set()
+
+    def wait_for(self, ready, timeout: float) -> tuple[bool, any]:
+        """
+        等待條件成立，返回 (是否成立, 目標)
+        目前的快照已滿足條件時直接使用，不成立時才重新搜尋 Launcher 子樹
+        """
+        automation = self.automation
+        target = ready(automation.snapshot) if automation.snapshot is not None else None
+        deadline = time.monotonic() + timeout
+        interval = self.POLL_INITIAL
+
+        while not target:
+            if automation.cancelled:
+                return False, None
+
+            automation.trace.poll()
+            target = ready(automation.take_snapshot(self.launcher))
+            if target:
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False, None
+
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 1.5, self.POLL_MAX)
+
+        if self.settle > 0:
+            time.sleep(self.settle)
+        return True, target
+
+    def run(self, step: AutomationStep, status_callback) -> tuple[bool, str]:
+        """
+        執行單一步驟
+        返回 (是否繼續流程, 失敗訊息)；選用步驟逾時時略過並繼續
+        """
+        if step.after and step.after not in self.completed:
+            return True, ""
+
+        trace = self.automation.trace
+        trace.begin(step.find_phase or step.name)
+        status_callback(step.status)
+
+        found, target = self.wait_for(step.ready, step.timeout)
+        if not found:
+            if self.automation.cancelled:
+                return False, "已取消"
+            if step.optional:
+                if step.missing_status:
+                    status_callback(step.missing_status)
+                return True, ""
+            return False, step.missing_status or f"等待逾時: {step.name}"
+
+        if step.found_status:
+            status_callback(step.found_status)
+
+        if step.find_phase:
+            trace.begin(step.name)
+        success, msg = step.action(target)
+        if not success:
+            return False, msg
+        status_callback(msg)
+
+        self.completed.add(step.name)
+        return True, ""
 
 
 class LauncherAutomation:
     """FF14 Launcher 自動化操作"""
 
-    def __init__(self, config: ConfigManager):
+    # 事件模式下的備援輪詢間隔（秒），每次未命中後加倍直到上限
+    WINDOW_POLL_INITIAL = 0.5
+    WINDOW_POLL_MAX = 4.0
+
+    def __init__(self, config: ConfigManager, backend: AutomationBackend = None,
+                 registry: WindowRegistry = None, history: TimingHistory = None, hold_window: bool = False):
         self.config = config
+        self.backend = backend or UIABackend()
+        self.registry = registry or WindowRegistry()
+        # 多開時由 MultiLaunchManager 在整批結束後才解除視窗綁定
+        self.hold_window = hold_window
+        # 本次流程啟動的 Launcher 行程（含子行程），為空時退回以標題搜尋整個桌面
+        self.process_ids = set()
+        self.submitted_otp = None
         self.running = False
         self._stop_flag = False
+        self._window_event_source = None
+        self.snapshot = None
+        self.trace = AutomationTrace()
+        self.history = history or TimingHistory(config.config_dir / "timing_history.jsonl")
 
     def stop(self):
         """停止自動化流程"""
         self._stop_flag = True
-
-    def find_window_by_keywords(self, root, keywords: list[str]):
-        """模糊搜尋視窗"""
-        condition = uia.CreatePropertyCondition(
-            UIAutomationClient.UIA_ControlTypePropertyId,
-            UIAutomationClient.UIA_WindowControlTypeId
-        )
-
-        windows = root.FindAll(
-            UIAutomationClient.TreeScope_Children,
-            condition
-        )
-
-        for i in range(windows.Length):
-            window = windows.GetElement(i)
-            name = window.CurrentName or ""
-            name_upper = name.upper()
-
-            if all(kw.upper() in name_upper for kw in keywords):
+        # 喚醒正在等待視窗事件的流程
+        source = self._window_event_source
+        if source:
+            source.notify()
+
+    def create_window_event_source(self, keywords: list[str]):
+        """建立視窗開啟事件來源，未啟用或無法建立時返回 None"""
+        if not self.config.get("window_event_detection", True):
+            return None
+        return self.backend.create_window_event_source(keywords)
+
+    def take_snapshot(self, launcher: ElementInfo) -> LauncherSnapshot:
+        """單次搜尋 Launcher 子樹（Edit 或 Button），建立新快照"""
+        self.snapshot = LauncherSnapshot.classify(self.backend.snapshot(launcher))
+        return self.snapshot
+
+    @property
+    def cancelled(self) -> bool:
+        """是否已要求停止"""
+        return self._stop_flag
+
+    @property
+    def settle_time(self) -> float:
+        """步驟條件成立後的最短穩定時間（秒）"""
+        return max(0, self.config.get("step_settle_ms", 50)) / 1000
+
+    def find_window_by_keywords(self, keywords: list[str], pids: set[int] = None) -> ElementInfo:
+        """模糊搜尋視窗，指定 pids 時只搜尋這些行程的視窗"""
+        for window in self.backend.find_top_windows(pids):
+            name_upper = window.name.upper()
+
+            # 略過已被其他流程綁定的視窗
+            if all(kw.upper() in name_upper for kw in keywords) and self.registry.is_available(window, self):
                 return window
 
         return None
 
     def launch_game(self) -> tuple[bool, str]:
-        """啟動 Launcher"""
-        launcher_path = self.config.get("launcher_path", "")
+        """
+        啟動 Launcher
+        設定為捷徑時直接啟動捷徑的目標並帶入捷徑的參數與開始位置（解析結果有快取），
+        才能取得 Launcher 的 PID；找不到目標時交給 Windows 開啟捷徑本身
+        """
+        launcher_path = self.config.get("launcher_path", "") or ""
 
         if not launcher_path or not os.path.exists(launcher_path):
             return False, "啟動器路徑無效"
 
+        arguments, working_dir = "", ""
+        if launcher_path.lower().endswith(".lnk"):
+            link = resolve_shortcut_link(launcher_path)
+            if link:
+                launcher_path, arguments = link.target, link.arguments
+                working_dir = expand_windows_env(link.working_dir)
+
         try:
-            subprocess.Popen(launcher_path, shell=True)
+            pid = self.backend.launch(launcher_path, arguments, working_dir)
+            self.process_ids = {pid} if pid else set()
             return True, "啟動器已啟動"
         except Exception as e:
             return False, f"啟動失敗: {str(e)}"
 
-    def wait_for_window(self, timeout: int = 30) -> tuple[bool, str, any]:
-        """等待 Launcher 視窗出現"""
-        search_keywords = ["FANTASY", "XIV"]
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            if self._stop_flag:
-                return False, "已取消", None
+    def tracked_pids(self, refresh: bool = True) -> set[int]:
+        """
+        本次啟動的 Launcher 行程與其子行程，未追蹤任何行程時返回 None
+        refresh 為 False 時直接使用上次的結果；為 True 時以單次行程快照更新子行程，
+        追蹤的行程全部結束卻沒有留下視窗時（例如交給已在執行的 Launcher），停止追蹤並改用標題搜尋
+        """
+        if not self.process_ids:
+            return None
+        if not refresh:
+            return self.process_ids
+        tree, running = self.backend.process_tree(self.process_ids)
+        if not running:
+            print("啟動的 Launcher 行程皆已結束，改用視窗標題搜尋")
+            self.trace.note("window_search", "title_fallback")
+            self.process_ids = set()
+            return None
+        self.process_ids = tree
+        return self.process_ids
+
+    def is_own_window(self, window: ElementInfo) -> bool:
+        """
+        視窗是否屬於本次啟動的 Launcher（未追蹤行程時一律視為是）
+        PID 已在追蹤中時不取行程快照，只有未知的 PID（可能是新的子行程）才更新一次
+        """
+        pids = self.tracked_pids(refresh=False)
+        if pids is None or window.pid in pids:
+            return True
+        pids = self.tracked_pids()
+        return pids is None or window.pid in pids
 
-            root = uia.GetRootElement()
-            launcher = self.find_window_by_keywords(root, search_keywords)
+    def wait_for_window(self, timeout: int = 30, event_source: WindowEventSource = None) -> tuple[bool, str, any]:
+        """
+        等待 Launcher 視窗出現
+        優先使用視窗開啟事件喚醒，輪詢作為備援（間隔逐步拉長）；
+        無法訂閱事件時退回固定 0.5 秒輪詢。
+        由本程式啟動 Launcher 時只接受該行程（含子行程）的視窗，其他同名視窗一律略過；
+        這些行程都已結束仍沒有視窗時改用標題搜尋
+        """
+        search_keywords = ["FANTASY", "XIV"]
+        deadline = time.monotonic() + timeout
 
-            if launcher:
-                return True, "找到 Launcher 視窗", launcher
+        if event_source is None:
+            try:
+                event_source = self.create_window_event_source(search_keywords)
+            except Exception as e:
+                print(f"建立視窗事件來源失敗: {e}")
+                event_source = None
 
-            time.sleep(0.5)
+        if event_source is not None:
+            try:
+                event_source.start()
+            except Exception as e:
+                print(f"訂閱視窗事件失敗，改用輪詢: {e}")
+                event_source = None
 
-        return False, "等待 Launcher 視窗逾時", None
+        self._window_event_source = event_source
+        poll_interval = self.WINDOW_POLL_INITIAL
 
-    def find_credential_inputs(self, launcher, timeout: int = 30) -> tuple[bool, str, any, any]:
-        """尋找信箱和密碼輸入框"""
-        edit_condition = uia.CreatePropertyCondition(
-            UIAutomationClient.UIA_ControlTypePropertyId,
-            UIAutomationClient.UIA_EditControlTypeId
-        )
+        try:
+            while time.monotonic() < deadline:
+                if self._stop_flag:
+                    return False, "已取消", None
 
-        start_time = time.time()
+                self.trace.poll()
+                launcher = self.find_window_by_keywords(search_keywords, self.tracked_pids())
 
-        while time.time() - start_time < timeout:
-            if self._stop_flag:
-                return False, "已取消", None, None
+                if launcher and self.registry.claim(launcher, self):
+                    return True, "找到 Launcher 視窗", launcher
 
-            edits = launcher.FindAll(
-                UIAutomationClient.TreeScope_Descendants,
-                edit_condition
-            )
+                if event_source is None:
+                    time.sleep(0.5)
+                    continue
 
-            # 需要至少2個輸入框（信箱、密碼）
-            if edits.Length >= 2:
-                # 假設第一個是信箱，第二個是密碼
-                email_edit = edits.GetElement(0)
-                password_edit = edits.GetElement(1)
-                return True, "找到登入輸入框", email_edit, password_edit
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
 
-            time.sleep(0.5)
+                fired, launcher = event_source.wait(min(poll_interval, remaining))
+                if self._stop_flag:
+                    return False, "已取消", None
+                if launcher and self.is_own_window(launcher) and self.registry.claim(launcher, self):
+                    return True, "找到 Launcher 視窗", launcher
 
-        return False, "找不到登入輸入框", None, None
+                # 事件喚醒但未附帶視窗時立即重新搜尋，否則拉長下次備援輪詢間隔
+                if not fired:
+                    poll_interval = min(poll_interval * 2, self.WINDOW_POLL_MAX)
 
-    def input_credentials(self, email_edit, password_edit, email: str, password: str) -> tuple[bool, str]:
+            return False, "等待 Launcher 視窗逾時", None
+        finally:
+            self._window_event_source = None
+            if event_source is not None:
+                try:
+                    event_source.stop()
+                except Exception:
+                    pass
+
+    def input_credentials(self, email_edit: ElementInfo, password_edit: ElementInfo, email: str, password: str) -> tuple[bool, str]:
         """輸入信箱和密碼"""
         try:
             # 輸入信箱
-            email_pattern = email_edit.GetCurrentPattern(
-                UIAutomationClient.UIA_ValuePatternId
-            ).QueryInterface(UIAutomationClient.IUIAutomationValuePattern)
-            email_pattern.SetValue(email)
+            self.backend.set_value(email_edit, email)
 
-            time.sleep(0.2)
+            time.sleep(self.settle_time)
 
             # 輸入密碼
-            password_pattern = password_edit.GetCurrentPattern(
-                UIAutomationClient.UIA_ValuePatternId
-            ).QueryInterface(UIAutomationClient.IUIAutomationValuePattern)
-            password_pattern.SetValue(password)
+            self.backend.set_value(password_edit, password)
 
             return True, "已輸入帳號密碼"
-        except COMError:
+        except AutomationError:
             return False, "無法輸入帳號密碼"
 
-    def find_otp_input(self, launcher, timeout: int = 30) -> tuple[bool, str, any]:
-        """尋找 OTP 輸入框"""
-        edit_condition = uia.CreatePropertyCondition(
-            UIAutomationClient.UIA_ControlTypePropertyId,
-            UIAutomationClient.UIA_EditControlTypeId
-        )
-
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            if self._stop_flag:
-                return False, "已取消", None
-
-            edits = launcher.FindAll(
-                UIAutomationClient.TreeScope_Descendants,
-                edit_condition
-            )
-
-            if edits.Length > 0:
-                # 嘗試找到 OTP 輸入框
-                otp_edit = None
-                for i in range(edits.Length):
-                    edit = edits.GetElement(i)
-                    name = edit.CurrentName or ""
-                    if "一次性" in name or "驗證碼" in name or "otp" in name.lower():
-                        otp_edit = edit
-                        break
-
-                # 如果找不到特定名稱的，使用最後一個 Edit
-                if not otp_edit:
-                    otp_edit = edits.GetElement(edits.Length - 1)
-
-                return True, "找到 OTP 輸入框", otp_edit
-
-            time.sleep(0.5)
-
-        return False, "找不到 OTP 輸入框", None
+    def choose_otp(self, secret_key: str) -> tuple[str, str]:
+        """
+        在送出前才產生 OTP
+        目前時間區間的剩餘秒數不超過 otp_rollover_margin 時，依 otp_rollover_policy
+        等待下一個區間開始（wait）或直接使用下一個 OTP（next），避免送出後才過期
+        返回 (OTP, 說明)，等待期間取消時 OTP 為 None
+        """
+        margin = max(0.0, float(self.config.get("otp_rollover_margin", 3)))
+        policy = self.config.get("otp_rollover_policy", "wait")
+
+        now = time.time()
+        codes = otp_cache.get(secret_key, now)
+        remaining = TOTP_INTERVAL - now % TOTP_INTERVAL
+
+        if remaining > margin:
+            choice, otp = "current", codes["otp"]
+            detail = f"剩餘 {remaining:.1f} 秒"
+        elif policy == "next":
+            choice, otp = "next", codes["next"]
+            detail = f"剩餘 {remaining:.1f} 秒，改用下一個 OTP"
+        else:
+            choice, otp = "wait", codes["next"]
+            detail = f"剩餘 {remaining:.1f} 秒，等待下一個 OTP"
+            deadline = now + remaining
+            while time.time() < deadline:
+                if self._stop_flag:
+                    return None, "已取消"
+                time.sleep(min(0.1, max(0, deadline - time.time())))
+
+        self.trace.note("otp", {"choice": choice, "remaining": round(remaining, 2), "margin": margin})
+        return otp, detail
+
+    def input_otp(self, otp_edit: ElementInfo, secret_key: str) -> tuple[bool, str]:
+        """產生並輸入 OTP"""
+        otp, detail = self.choose_otp(secret_key)
+        if otp is None:
+            return False, detail
 
-    def input_otp(self, otp_edit, otp: str) -> tuple[bool, str]:
-        """輸入 OTP"""
         try:
-            value_pattern = otp_edit.GetCurrentPattern(
-                UIAutomationClient.UIA_ValuePatternId
-            ).QueryInterface(UIAutomationClient.IUIAutomationValuePattern)
-
-            value_pattern.SetValue(otp)
-            return True, f"已輸入 OTP: {otp}"
-        except COMError:
+            self.backend.set_value(otp_edit, otp)
+            readback = self.backend.read_value(otp_edit)
+        except AutomationError:
             return False, "無法寫入輸入框"
 
-    def press_enter(self, element) -> tuple[bool, str]:
+        # 寫入後重新讀取欄位的值確認；讀不到值、讀回空字串或遮罩字元（沒有數字）時無法確認，記錄在紀錄中
+        if readback and any(c.isdigit() for c in readback):
+            if readback != otp:
+                return False, "OTP 寫入後讀回的值不符"
+            self.trace.note("otp_readback", "verified")
+        else:
+            self.trace.note("otp_readback", "unknown" if readback is None else "unreadable")
+        self.submitted_otp = otp
+        return True, f"已輸入 OTP: {otp}（{detail}）"
+
+    def press_enter(self, element: ElementInfo) -> tuple[bool, str]:
         """按下 Enter"""
         try:
-            # 使用 SendKeys 發送 Enter
-            import ctypes
-            from ctypes import wintypes
+            # 設定焦點與送出按鍵之間不能讓其他流程搶走前景視窗
+            with self.backend.input_lock:
+                # 設定焦點到元素（步驟條件成立後已等待過最短穩定時間，這裡不再等待）
+                try:
+                    self.backend.set_focus(element)
+                except AutomationError:
+                    pass
 
-            # 設定焦點到元素
-            try:
-                element.SetFocus()
-            except:
-                pass
-
-            time.sleep(0.1)
-
-            # 發送 Enter 鍵
-            user32 = ctypes.windll.user32
-            VK_RETURN = 0x0D
-            KEYEVENTF_KEYUP = 0x0002
-
-            user32.keybd_event(VK_RETURN, 0, 0, 0)
-            user32.keybd_event(VK_RETURN, 0, KEYEVENTF_KEYUP, 0)
+                # 發送 Enter 鍵
+                self.backend.send_enter()
 
             return True, "已按下 Enter"
         except Exception as e:
             return False, f"按 Enter 失敗: {str(e)}"
 
-    def find_play_button(self, launcher, timeout: int = 60) -> tuple[bool, str, any]:
-        """尋找 PLAY 按鈕"""
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            if self._stop_flag:
-                return False, "已取消", None
-
-            # 尋找按鈕
-            button_condition = uia.CreatePropertyCondition(
-                UIAutomationClient.UIA_ControlTypePropertyId,
-                UIAutomationClient.UIA_ButtonControlTypeId
-            )
-
-            buttons = launcher.FindAll(
-                UIAutomationClient.TreeScope_Descendants,
-                button_condition
-            )
-
-            for i in range(buttons.Length):
-                button = buttons.GetElement(i)
-                name = (button.CurrentName or "").upper()
-                if "PLAY" in name or "開始" in name or "START" in name:
-                    return True, "找到 PLAY 按鈕", button
-
-            time.sleep(0.5)
-
-        return False, "找不到 PLAY 按鈕", None
-
-    def click_play_button(self, button) -> tuple[bool, str]:
+    def click_play_button(self, button: ElementInfo) -> tuple[bool, str]:
         """點擊 PLAY 按鈕"""
         try:
-            invoke_pattern = button.GetCurrentPattern(
-                UIAutomationClient.UIA_InvokePatternId
-            ).QueryInterface(UIAutomationClient.IUIAutomationInvokePattern)
-
-            invoke_pattern.Invoke()
+            self.backend.invoke(button)
             return True, "已點擊 PLAY 按鈕"
-        except COMError:
-            # 嘗試使用滑鼠點擊
+        except AutomationError:
+            # 嘗試使用滑鼠點擊（按鈕位置取自搜尋時的快取值）
             try:
-                import ctypes
-
-                # 取得按鈕位置
-                rect = button.CurrentBoundingRectangle
-                x = int((rect.left + rect.right) / 2)
-                y = int((rect.top + rect.bottom) / 2)
-
-                # 移動滑鼠並點擊
-                ctypes.windll.user32.SetCursorPos(x, y)
-                time.sleep(0.1)
-
-                MOUSEEVENTF_LEFTDOWN = 0x0002
-                MOUSEEVENTF_LEFTUP = 0x0004
-
-                ctypes.windll.user32.mouse_event(MOUSEEVENTF_LEFTDOWN, 0, 0, 0, 0)
-                ctypes.windll.user32.mouse_event(MOUSEEVENTF_LEFTUP, 0, 0, 0, 0)
-
+                with self.backend.input_lock:
+                    self.backend.click(button)
                 return True, "已點擊 PLAY 按鈕"
             except Exception as e:
                 return False, f"點擊 PLAY 失敗: {str(e)}"
 
+    def build_steps(self, secret_key: str, email: str, password: str) -> list[AutomationStep]:
+        """依設定建立視窗出現後的自動化步驟"""
+        steps = []
+
+        def enabled(element: ElementInfo) -> bool:
+            return element is not None and element.enabled
+
+        # 輸入帳號密碼：兩個欄位都出現且可輸入
+        if self.config.get("auto_input_credentials") and email and password:
+            steps.append(AutomationStep(
+                name="credentials",
+                status="正在尋找登入輸入框...",
+                ready=lambda snap: (snap.email, snap.password)
+                if enabled(snap.email) and enabled(snap.password) else None,
+                action=lambda fields: self.input_credentials(fields[0], fields[1], email, password),
+                timeout=5,
+                find_phase="credentials_find",
+                found_status="找到登入輸入框",
+                optional=True,
+            ))
+
+        if self.config.get("auto_input_otp"):
+            # 輸入 OTP：欄位出現且可輸入；找不到時可能已經登入，繼續嘗試 PLAY
+            steps.append(AutomationStep(
+                name="otp_input",
+                status="正在尋找 OTP 輸入框...",
+                ready=lambda snap: snap.otp if enabled(snap.otp) else None,
+                action=lambda otp_edit: self.input_otp(otp_edit, secret_key),
+                timeout=5,
+                find_phase="otp_find",
+                found_status="找到 OTP 輸入框",
+                missing_status="找不到 OTP 輸入框，嘗試尋找 PLAY...",
+                optional=True,
+            ))
+
+            # 按 Enter：OTP 已寫入（input_otp 寫入後已重新讀值確認），這裡只等待欄位仍可輸入
+            if self.config.get("auto_press_enter"):
+                steps.append(AutomationStep(
+                    name="enter",
+                    status="正在按下 Enter...",
+                    ready=lambda snap: snap.otp if enabled(snap.otp) else None,
+                    action=self.submit_otp,
+                    timeout=5,
+                    missing_status="找不到 OTP 輸入框，無法按下 Enter",
+                    after="otp_input",
+                ))
+
+        # 點擊 PLAY：按鈕出現且已啟用
+        if self.config.get("auto_click_play"):
+            steps.append(AutomationStep(
+                name="play_click",
+                status="正在等待 PLAY 按鈕...",
+                ready=lambda snap: snap.play,
+                action=self.click_play_button,
+                timeout=60,
+                find_phase="play_find",
+                found_status="找到 PLAY 按鈕",
+                missing_status="找不到 PLAY 按鈕",
+            ))
+
+        return steps
+
+    def submit_otp(self, otp_edit: ElementInfo) -> tuple[bool, str]:
+        """在 OTP 欄位按下 Enter 送出"""
+        success, msg = self.press_enter(otp_edit)
+        if success:
+            # 送出後頁面會切換，舊快照的元素已失效
+            self.snapshot = None
+        return success, msg
+
     def run_automation(self, secret_key: str, email: str, password: str, status_callback) -> tuple[bool, str]:
-        """執行完整自動化流程"""
+        """執行完整自動化流程，並將各階段計時寫入紀錄檔"""
         self.running = True
         self._stop_flag = False
-        launcher = None
+        self.snapshot = None
+        self.process_ids = set()
+        self.submitted_otp = None
+        self.trace = AutomationTrace(self.backend)
+        success, msg = False, ""
 
         try:
-            # 產生 OTP
-            try:
-                secret = secret_key.strip().replace(" ", "")
-                totp = pyotp.TOTP(secret)
-                otp = totp.now()
-            except Exception as e:
-                return False, f"OTP 產生失敗: {str(e)}"
-
-            # 步驟 1: 啟動 Launcher
-            if self.config.get("auto_launch"):
-                status_callback("正在啟動 Launcher...")
-                success, msg = self.launch_game()
-                if not success:
-                    return False, msg
-                status_callback(msg)
-                time.sleep(2)
-
-            # 步驟 2: 等待視窗
-            status_callback("正在等待 Launcher 視窗...")
-            success, msg, launcher = self.wait_for_window()
+            success, msg = self._run_steps(secret_key, email, password, status_callback)
+        except Exception as e:
+            success, msg = False, f"發生錯誤: {str(e)}"
+        finally:
+            self.running = False
+            if not self.hold_window:
+                self.registry.release(self)
+            self.history.append(self.trace.finish(success, msg))
+
+        return success, msg
+
+    def _run_steps(self, secret_key: str, email: str, password: str, status_callback) -> tuple[bool, str]:
+        # 先確認 Secret Key 可用；實際的 OTP 在輸入前才產生
+        self.trace.begin("otp")
+        try:
+            otp_cache.get(secret_key)
+        except Exception as e:
+            return False, f"OTP 產生失敗: {str(e)}"
+
+        # 步驟 1: 啟動 Launcher（不再固定等待，直接進入視窗等待）
+        if self.config.get("auto_launch"):
+            self.trace.begin("launch")
+            status_callback("正在啟動 Launcher...")
+            success, msg = self.launch_game()
             if not success:
                 return False, msg
             status_callback(msg)
 
-            # 步驟 2.5: 輸入帳號密碼
-            login_found = False
-            if self.config.get("auto_input_credentials") and email and password:
-                status_callback("正在尋找登入輸入框...")
-                success, msg, email_edit, password_edit = self.find_credential_inputs(launcher, timeout=5)
-                if success:
-                    login_found = True
-                    status_callback(msg)
-                    success, msg = self.input_credentials(email_edit, password_edit, email, password)
-                    if not success:
-                        return False, msg
-                    status_callback(msg)
-                    time.sleep(0.5)
+        # 步驟 2: 等待視窗
+        self.trace.begin("wait_window")
+        status_callback("正在等待 Launcher 視窗...")
+        success, msg, launcher = self.wait_for_window()
+        if not success:
+            return False, msg
+        status_callback(msg)
+
+        # 步驟 3 之後：每個步驟等待自己的條件成立後立即執行
+        scheduler = StepScheduler(self, launcher, self.settle_time)
+        for step in self.build_steps(secret_key, email, password):
+            proceed, msg = scheduler.run(step, status_callback)
+            if not proceed:
+                return False, msg
+
+        return True, "自動化完成"
+
+
+class MultiLaunchManager:
+    """
+    多帳號同時啟動
+    每個帳號有自己的 LauncherAutomation（獨立的停止旗標、後端、Launcher 行程與視窗綁定），
+    同時執行的數量受 max_concurrent_launches 限制
+    """
+
+    def __init__(self, config: ConfigManager, registry: WindowRegistry, history: TimingHistory,
+                 backend_factory=UIABackend):
+        self.config = config
+        self.registry = registry
+        self.history = history
+        self.backend_factory = backend_factory
+        self.workers = {}
+        self._lock = threading.Lock()
+        self._supervisor = None
+
+    @property
+    def running(self) -> bool:
+        return self._supervisor is not None and self._supervisor.is_alive()
+
+    def start(self, accounts: list[tuple[str, dict]], progress_callback) -> tuple[bool, str]:
+        """
+        開始同時啟動多個帳號
+        accounts 為 (帳號 id, 帳號資料) 列表；progress_callback 接收每個帳號的進度事件 dict
+        """
+        with self._lock:
+            if self.running:
+                return False, "多開流程執行中"
+
+            limit = max(1, int(self.config.get("max_concurrent_launches", 2)))
+            semaphore = threading.BoundedSemaphore(limit)
+            self.workers = {
+                account_id: LauncherAutomation(
+                    self.config,
+                    backend=self.backend_factory(),
+                    registry=self.registry,
+                    history=self.history,
+                    hold_window=True,
+                )
+                for account_id, _ in accounts
+            }
+
+            threads = [
+                threading.Thread(
+                    target=self._run_worker,
+                    args=(account_id, account, semaphore, progress_callback),
+                    daemon=True
+                )
+                for account_id, account in accounts
+            ]
+
+            def supervise():
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                # 整批結束後才解除視窗綁定，避免後面的帳號綁到前面帳號的 Launcher
+                for worker in self.workers.values():
+                    self.registry.release(worker)
+                progress_callback({"finished": True})
+
+            self._supervisor = threading.Thread(target=supervise, daemon=True)
+            self._supervisor.start()
+
+        return True, f"已開始啟動 {len(accounts)} 個帳號（同時最多 {limit} 個）"
+
+    def _run_worker(self, account_id: str, account: dict, semaphore, progress_callback):
+        worker = self.workers[account_id]
+        name = account.get("name") or "未命名帳號"
+
+        def report(status: str, done: bool = False, success: bool = None):
+            progress_callback({"id": account_id, "name": name, "status": status, "done": done, "success": success})
+
+        report("排隊中...")
+        with semaphore:
+            if worker.cancelled:
+                report("已取消", done=True, success=False)
+                return
+            success, msg = worker.run_automation(
+                account.get("secret_key", ""),
+                account.get("email", ""),
+                account.get("password", ""),
+                report
+            )
+        report(msg, done=True, success=success)
 
-            # 步驟 3: 尋找並輸入 OTP
-            if self.config.get("auto_input_otp"):
-                status_callback("正在尋找 OTP 輸入框...")
-                success, msg, otp_edit = self.find_otp_input(launcher, timeout=5)
-                if success:
-                    status_callback(msg)
-                    success, msg = self.input_otp(otp_edit, otp)
-                    if not success:
-                        return False, msg
-                    status_callback(msg)
-
-                    # 步驟 4: 按 Enter
-                    if self.config.get("auto_press_enter"):
-                        time.sleep(0.3)
-                        status_callback("正在按下 Enter...")
-                        success, msg = self.press_enter(otp_edit)
-                        if not success:
-                            return False, msg
-                        status_callback(msg)
-                else:
-                    # 找不到 OTP 輸入框，可能已經登入，嘗試找 PLAY
-                    status_callback("找不到 OTP 輸入框，嘗試尋找 PLAY...")
+    def stop(self):
+        """停止所有帳號的流程"""
+        for worker in list(self.workers.values()):
+            worker.stop()
 
-            # 步驟 5: 點擊 PLAY
-            if self.config.get("auto_click_play"):
-                time.sleep(1)
-                status_callback("正在等待 PLAY 按鈕...")
-                success, msg, play_button = self.find_play_button(launcher)
-                if not success:
-                    return False, msg
-                status_callback(msg)
 
-                success, msg = self.click_play_button(play_button)
-                if not success:
-                    return False, msg
-                status_callback(msg)
+# ============ Python → 網頁事件推送 ============
 
-            return True, "自動化完成"
+class EventBus:
+    """
+    由 Python 主動推送狀態給網頁
+    publish() 只放入佇列，背景執行緒每 batch_window 秒把累積的訊息合併成一個 JSON 陣列，
+    以單次 evaluate_js 呼叫網頁端的 onBridgeEvents(messages)；網頁呼叫 subscribe 之前的訊息會先保留
+    """
 
-        except Exception as e:
-            return False, f"發生錯誤: {str(e)}"
-        finally:
-            self.running = False
+    # 只需要最新狀態的訊息類型，同一批中只保留最後一則
+    COALESCE_TYPES = ("detect",)
+    MAX_PENDING = 200
+
+    def __init__(self, batch_window: float = 0.05):
+        self.batch_window = batch_window
+        self.sender = None
+        self.sent_batches = 0
+        self._ready = False
+        self._pending = []
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def attach(self, sender):
+        """設定送出函數，sender(script) 通常為 window.evaluate_js"""
+        self.sender = sender
+
+    def set_ready(self):
+        """網頁已可接收事件，啟動派送執行緒"""
+        with self._condition:
+            self._ready = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def publish(self, message_type: str, data=None):
+        with self._condition:
+            if message_type in self.COALESCE_TYPES:
+                self._pending = [m for m in self._pending if m["type"] != message_type]
+            self._pending.append({"type": message_type, "data": data})
+            del self._pending[:-self.MAX_PENDING]
+            self._condition.notify()
+
+    def _take_batch(self) -> list[dict]:
+        with self._condition:
+            while not (self._ready and self._pending):
+                self._condition.wait()
+        # 等待一小段時間，讓同時發生的事件合併成一批
+        time.sleep(self.batch_window)
+        with self._condition:
+            batch, self._pending = self._pending, []
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if self.sender is None:
+                continue
+            try:
+                self.sender(f"onBridgeEvents({json.dumps(batch, ensure_ascii=False)})")
+                self.sent_batches += 1
+            except Exception as e:
+                print(f"推送事件失敗: {e}")
 
 
 # 全域物件
 config = ConfigManager()
-automation = LauncherAutomation(config)
+window_registry = WindowRegistry()
+automation = LauncherAutomation(config, registry=window_registry)
+multi_launcher = MultiLaunchManager(config, window_registry, automation.history)
+_process_source = default_process_source()
+process_watcher = ProcessWatcher(_process_source) if _process_source else None
 window = None
 
 
-def resolve_shortcut(lnk_path: str) -> str:
+event_bus = EventBus()
+
+
+def detection_state() -> dict:
+    """Launcher 與遊戲是否執行中"""
+    if process_watcher is None:
+        return {"launcher": False, "game": False}
+    return {"launcher": process_watcher.is_running("launcher"), "game": process_watcher.is_running("game")}
+
+
+if process_watcher is not None:
+    process_watcher.add_listener(lambda group, running: event_bus.publish("detect", detection_state()))
+
+
+def ensure_process_watcher() -> bool:
+    """啟動背景行程監看並同步 Launcher 執行檔名稱，無可用的行程來源時返回 False"""
+    if process_watcher is None:
+        return False
+    # 設定的是捷徑時監看捷徑的目標執行檔（resolve_shortcut 有快取，重複呼叫不會重新解析）
+    launcher_name = os.path.basename(resolve_shortcut(config.get("launcher_path", "") or ""))
+    process_watcher.watch("game", GAME_EXECUTABLES)
+    process_watcher.watch("launcher", LAUNCHER_EXECUTABLES + (launcher_name,))
+    process_watcher.start()
+    return True
+
+
+# ============ 捷徑解析 ============
+
+# Shell Link 檔案格式（MS-SHLLINK）
+SHELL_LINK_HEADER_SIZE = 0x4C
+SHELL_LINK_CLSID = bytes.fromhex("0114020000000000c000000000000046")
+LINK_HAS_ID_LIST = 0x1
+LINK_HAS_LINK_INFO = 0x2
+LINK_HAS_NAME = 0x4
+LINK_HAS_RELATIVE_PATH = 0x8
+LINK_HAS_WORKING_DIR = 0x10
+LINK_HAS_ARGUMENTS = 0x20
+LINK_HAS_ICON_LOCATION = 0x40
+LINK_IS_UNICODE = 0x80
+LINK_INFO_VOLUME_AND_LOCAL_PATH = 0x1
+LINK_INFO_NETWORK_AND_SUFFIX = 0x2
+ENVIRONMENT_BLOCK_SIGNATURE = 0xA0000001
+DARWIN_BLOCK_SIGNATURE = 0xA0000006
+# 非 Unicode 字串使用系統的 ANSI 字碼頁
+SHELL_LINK_ANSI = "mbcs" if sys.platform == "win32" else "cp950"
+
+
+@dataclass
+class ShellLink:
+    """解析後的捷徑內容（只保留找出目標路徑與啟動需要的欄位）"""
+    local_path: str = ""  # LinkInfo：本機路徑或網路路徑
+    relative_path: str = ""  # 相對於捷徑檔所在資料夾
+    working_dir: str = ""  # 「開始位置」，可能含環境變數
+    arguments: str = ""  # 命令列參數
+    environment_path: str = ""  # 含環境變數的路徑（例如 %ProgramFiles%\...）
+    darwin_id: str = ""  # Windows Installer 廣告捷徑的描述字串
+    target: str = ""  # resolve_shortcut_link 找到的存在的目標路徑
+
+    def candidates(self, lnk_path: str) -> list[str]:
+        """可能的目標路徑，依可信度排序（環境變數路徑 → LinkInfo → 相對路徑）"""
+        paths = []
+        if self.environment_path:
+            paths.append(expand_windows_env(self.environment_path))
+        if self.local_path:
+            paths.append(self.local_path)
+        if self.relative_path:
+            base = os.path.dirname(os.path.abspath(lnk_path))
+            paths.append(os.path.normpath(os.path.join(base, self.relative_path.replace("\\", os.sep))))
+        return [path for index, path in enumerate(paths) if path and path not in paths[:index]]
+
+
+def expand_windows_env(path: str) -> str:
+    """展開 %VAR% 形式的環境變數（找不到的變數保留原樣），在非 Windows 平台也使用相同規則"""
+    return re.sub(r"%([^%]+)%", lambda m: os.environ.get(m.group(1), m.group(0)), path)
+
+
+def _c_string(data: bytes, offset: int, unicode: bool) -> str:
+    """讀取以 NUL 結尾的字串"""
+    if offset <= 0 or offset >= len(data):
+        return ""
+    if unicode:
+        end = offset
+        while end + 1 < len(data) and data[end:end + 2] != b"\0\0":
+            end += 2
+        return data[offset:end].decode("utf-16-le", errors="replace")
+    end = data.find(b"\0", offset)
+    return data[offset:end if end >= 0 else len(data)].decode(SHELL_LINK_ANSI, errors="replace")
+
+
+def _parse_link_info(info: bytes) -> str:
+    """LinkInfo 結構：本機路徑（或網路分享名稱）加上共同路徑尾段"""
+    if len(info) < 0x1C:
+        raise ValueError("LinkInfo 長度不足")
+    (header_size, flags, _volume_offset, base_offset,
+     network_offset, suffix_offset) = struct.unpack_from("<6I", info, 4)
+    unicode_offsets = struct.unpack_from("<2I", info, 0x1C) if header_size >= 0x24 and len(info) >= 0x24 else (0, 0)
+
+    suffix = _c_string(info, unicode_offsets[1], True) if unicode_offsets[1] else _c_string(info, suffix_offset, False)
+    if flags & LINK_INFO_VOLUME_AND_LOCAL_PATH:
+        if unicode_offsets[0]:
+            base = _c_string(info, unicode_offsets[0], True)
+        else:
+            base = _c_string(info, base_offset, False)
+    elif flags & LINK_INFO_NETWORK_AND_SUFFIX and network_offset:
+        network = info[network_offset:]
+        if len(network) < 0x14:
+            raise ValueError("CommonNetworkRelativeLink 長度不足")
+        net_name_offset = struct.unpack_from("<I", network, 8)[0]
+        if net_name_offset > 0x14 and len(network) >= 0x1C:
+            base = _c_string(network, struct.unpack_from("<I", network, 0x14)[0], True)
+        else:
+            base = _c_string(network, net_name_offset, False)
+    else:
+        return ""
+    if not suffix:
+        return base
+    return base + suffix if base.endswith("\\") else base + "\\" + suffix
+
+
+def parse_shell_link(data: bytes) -> ShellLink:
     """
-    解析 .lnk 捷徑檔案，取得實際目標路徑
-    支援一般捷徑和 Windows Installer 廣告捷徑
+    解析 .lnk 檔案內容（標頭、LinkInfo、字串區段、環境變數與 Darwin 額外資料區塊），不需要 COM
+    格式錯誤時拋出 ValueError
     """
-    if not lnk_path.lower().endswith('.lnk'):
-        return lnk_path
-
-    if not os.path.exists(lnk_path):
-        return lnk_path
-
-    target_path = None
+    if len(data) < SHELL_LINK_HEADER_SIZE or struct.unpack_from("<I", data, 0)[0] != SHELL_LINK_HEADER_SIZE:
+        raise ValueError("不是捷徑檔")
+    if data[4:20] != SHELL_LINK_CLSID:
+        raise ValueError("捷徑檔 CLSID 不符")
+    flags = struct.unpack_from("<I", data, 20)[0]
+    unicode = bool(flags & LINK_IS_UNICODE)
+    link = ShellLink()
+    pos = SHELL_LINK_HEADER_SIZE
 
     try:
-        # 方法1: 使用 COM Shell 物件解析一般捷徑
-        import comtypes.client
-
-        # 建立 Shell 物件
-        shell = comtypes.client.CreateObject("WScript.Shell")
-        shortcut = shell.CreateShortcut(lnk_path)
-        target_path = shortcut.TargetPath
+        # LinkTargetIDList：目標的 Shell 項目清單，目標路徑改由 LinkInfo 取得，直接略過
+        if flags & LINK_HAS_ID_LIST:
+            pos += 2 + struct.unpack_from("<H", data, pos)[0]
+
+        if flags & LINK_HAS_LINK_INFO:
+            size = struct.unpack_from("<I", data, pos)[0]
+            link.local_path = _parse_link_info(data[pos:pos + size])
+            pos += size
+
+        # 字串區段依序出現：名稱、相對路徑、工作目錄、參數、圖示位置
+        strings = {}
+        for flag in (LINK_HAS_NAME, LINK_HAS_RELATIVE_PATH, LINK_HAS_WORKING_DIR,
+                     LINK_HAS_ARGUMENTS, LINK_HAS_ICON_LOCATION):
+            if flags & flag:
+                count = struct.unpack_from("<H", data, pos)[0]
+                pos += 2
+                size = count * 2 if unicode else count
+                raw = data[pos:pos + size]
+                if len(raw) < size:
+                    raise ValueError("字串區段超出檔案長度")
+                strings[flag] = raw.decode("utf-16-le" if unicode else SHELL_LINK_ANSI, errors="replace")
+                pos += size
+        link.relative_path = strings.get(LINK_HAS_RELATIVE_PATH, "")
+        link.working_dir = strings.get(LINK_HAS_WORKING_DIR, "")
+        link.arguments = strings.get(LINK_HAS_ARGUMENTS, "")
+
+        # 額外資料區塊，大小小於 4 的區塊表示結束
+        while pos + 8 <= len(data):
+            size, signature = struct.unpack_from("<II", data, pos)
+            if size < 8 or pos + size > len(data):
+                break
+            block = data[pos:pos + size]
+            if signature in (ENVIRONMENT_BLOCK_SIGNATURE, DARWIN_BLOCK_SIGNATURE) and size >= 0x314:
+                value = _c_string(block, 0x10C, True) or _c_string(block, 8, False)
+                if signature == ENVIRONMENT_BLOCK_SIGNATURE:
+                    link.environment_path = value
+                else:
+                    link.darwin_id = value
+            pos += size
+    except struct.error as e:
+        raise ValueError(f"捷徑檔格式錯誤: {e}") from e
 
-        # 如果取得的路徑有效且存在，直接返回
-        if target_path and os.path.exists(target_path):
-            return target_path
+    return link
 
-    except Exception as e:
-        print(f"WScript.Shell 解析失敗: {e}")
 
-    # 方法2: 嘗試解析 Windows Installer 廣告捷徑
-    # 這類捷徑的 TargetPath 可能是空的或指向 Installer 快取
+def msi_shortcut_target(lnk_path: str) -> str:
+    """以 Windows Installer API 解析廣告捷徑（只有含 Darwin 資料的捷徑需要），失敗時返回空字串"""
     try:
-        # 使用 MsiGetShortcutTarget API
         msi = ctypes.windll.msi
-
-        # 準備緩衝區
         product_code = ctypes.create_unicode_buffer(39)  # GUID + null
         feature_id = ctypes.create_unicode_buffer(256)
         component_code = ctypes.create_unicode_buffer(39)
-
-        result = msi.MsiGetShortcutTargetW(
-            lnk_path,
-            product_code,
-            feature_id,
-            component_code
-        )
-
-        if result == 0:  # ERROR_SUCCESS
-            # 取得元件的安裝路徑
-            path_buffer = ctypes.create_unicode_buffer(512)
-            path_len = ctypes.c_uint(512)
-
-            # INSTALLSTATE_LOCAL = 3
-            state = msi.MsiGetComponentPathW(
-                product_code.value,
-                component_code.value,
-                path_buffer,
-                ctypes.byref(path_len)
-            )
-
-            if state >= 1:  # INSTALLSTATE_LOCAL or better
-                resolved_path = path_buffer.value
-                if resolved_path and os.path.exists(resolved_path):
-                    return resolved_path
+        if msi.MsiGetShortcutTargetW(lnk_path, product_code, feature_id, component_code) != 0:
+            return ""
+        path_buffer = ctypes.create_unicode_buffer(512)
+        path_len = ctypes.c_uint(512)
+        state = msi.MsiGetComponentPathW(product_code.value, component_code.value, path_buffer, ctypes.byref(path_len))
+        if state >= 1:  # INSTALLSTATE_LOCAL 或更好
+            return path_buffer.value
     except Exception as e:
         print(f"MSI 解析失敗: {e}")
+    return ""
 
-    # 方法3: 使用 PowerShell 作為備用方案
-    try:
-        import subprocess
-        # 使用 PowerShell 解析捷徑
-        ps_command = f'''
-$shell = New-Object -ComObject WScript.Shell
-$shortcut = $shell.CreateShortcut("{lnk_path}")
-$shortcut.TargetPath
-'''
-        result = subprocess.run(
-            ['powershell', '-NoProfile', '-Command', ps_command],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
 
-        if result.returncode == 0:
-            ps_target = result.stdout.strip()
-            if ps_target and os.path.exists(ps_target):
-                return ps_target
+def com_shortcut(lnk_path: str) -> ShellLink:
+    """以 WScript.Shell COM 物件解析捷徑（在本行程內呼叫，不啟動 PowerShell），失敗時返回 None
+    只在內建解析器找不到目標時使用，例如只有 IDList 的捷徑"""
+    try:
+        import comtypes.client
+        shell = comtypes.client.CreateObject("WScript.Shell")
+        shortcut = shell.CreateShortcut(lnk_path)
+        return ShellLink(target=shortcut.TargetPath or "", arguments=shortcut.Arguments or "",
+                         working_dir=shortcut.WorkingDirectory or "")
     except Exception as e:
-        print(f"PowerShell 解析失敗: {e}")
+        print(f"WScript.Shell 解析失敗: {e}")
+    return None
+
+
+# 捷徑路徑 → (修改時間, 大小, ShellLink)，捷徑檔改變後重新解析
+_shortcut_cache = {}
+
+
+def resolve_shortcut_link(lnk_path: str) -> ShellLink:
+    """
+    解析 .lnk 捷徑檔案，返回含目標路徑（target）、參數與開始位置的 ShellLink（直接讀取捷徑檔，不啟動其他行程）
+    依序嘗試環境變數路徑、LinkInfo、相對路徑；Windows Installer 廣告捷徑再交給 MSI API，
+    仍找不到時（只有 IDList 的捷徑、無法解析的檔案）在 Windows 上改用 WScript.Shell COM。
+    找到存在的目標時依捷徑檔的修改時間快取；找不到時返回 None（交給 Windows 直接開啟捷徑）
+    """
+    state = file_state(lnk_path)
+    if state is None:
+        return None
+    key = os.path.normcase(os.path.abspath(lnk_path))
+    cached = _shortcut_cache.get(key)
+    if cached and cached[0] == state:
+        return cached[1]
+
+    try:
+        with open(lnk_path, "rb") as f:
+            link = parse_shell_link(f.read())
+    except (OSError, ValueError) as e:
+        print(f"捷徑解析失敗: {e}")
+        link = None
+
+    candidates = link.candidates(lnk_path) if link else []
+    target = next((path for path in candidates if os.path.exists(path)), "")
+    if not target and link and link.darwin_id and sys.platform == "win32":
+        target = msi_shortcut_target(lnk_path)
+        if target and not os.path.exists(target):
+            target = ""
+    if target:
+        link.target = target
+    elif sys.platform == "win32":
+        link = com_shortcut(lnk_path)
+        if not link or not link.target or not os.path.exists(link.target):
+            link = None
+    else:
+        link = None
+
+    if link:
+        _shortcut_cache[key] = (state, link)
+    return link
 
-    # 如果所有方法都失敗，返回原始 TargetPath（如果有的話）
-    if target_path and target_path != lnk_path:
-        return target_path
 
-    return lnk_path
+def resolve_shortcut(lnk_path: str) -> str:
+    """.lnk 捷徑的目標路徑；不是捷徑或找不到存在的目標時返回原路徑"""
+    if not lnk_path.lower().endswith('.lnk'):
+        return lnk_path
+    link = resolve_shortcut_link(lnk_path)
+    return link.target if link else lnk_path
 
 
 class Api:
     """pywebview API - 提供給 JavaScript 呼叫的方法"""
 
+    def __init__(self):
+        # 本視窗交給背景服務執行、尚未結束的自動化流程數；停止時只在有這類流程時通知背景服務
+        self._daemon_runs = 0
+        self._daemon_lock = threading.Lock()
+
     def get_config(self):
-        """取得設定"""
-        return config.get_all()
+        """取得設定（帳號只包含名稱與是否已設定各欄位，敏感資料以 get_account 個別取得）"""
+        # 頁面載入後第一個呼叫，代表 JS 橋接已就緒
+        startup_trace.mark("bridge_ready")
+        data = config.get_all()
+        data["accounts"] = config.account_summaries()
+        return data
+
+    def get_account(self, account_id: str):
+        """取得單一帳號的解密資料（以帳號 id 指定，列表順序可能因其他行程改寫而變動）"""
+        try:
+            account = config.get_account_by_id(account_id)
+        except ProtectionError as e:
+            return {"success": False, "error": f"無法解密帳號資料: {e}"}
+        if account is None:
+            return {"success": False, "error": "帳號不存在"}
+        return {"success": True, "account": account}
+
+    def add_account(self, fields: dict = None):
+        """新增單一帳號，返回帳號資訊（不含敏感資料）"""
+        try:
+            summary = config.add_account(dict(fields or {}))
+        except ProtectionError as e:
+            return {"success": False, "error": f"加密失敗，未儲存: {e}"}
+        except OSError as e:
+            return {"success": False, "error": f"寫入帳號資料失敗: {e}"}
+        return {"success": True, "account": summary}
+
+    def update_account(self, account_id: str, fields: dict):
+        """修改單一帳號（只送出有變更的欄位即可），返回帳號資訊"""
+        try:
+            summary = config.update_account(account_id, dict(fields or {}))
+        except ProtectionError as e:
+            return {"success": False, "error": f"加密失敗，未儲存: {e}"}
+        except OSError as e:
+            return {"success": False, "error": f"寫入帳號資料失敗: {e}"}
+        if summary is None:
+            return {"success": False, "error": "帳號不存在"}
+        return {"success": True, "account": summary}
+
+    def delete_account(self, account_id: str):
+        """刪除單一帳號"""
+        try:
+            deleted = config.delete_account(account_id)
+        except OSError as e:
+            return {"success": False, "error": f"寫入帳號資料失敗: {e}"}
+        if not deleted:
+            return {"success": False, "error": "帳號不存在"}
+        return {"success": True, "selected_account": config.get("selected_account", -1)}
 
     def save_config(self, data: dict):
-        """儲存設定"""
+        """儲存設定（不含帳號，帳號以 add_account / update_account / delete_account 個別儲存）"""
         config.update(data)
-        return True
+        return {"success": True}
 
     def get_otp(self, secret_key: str):
         """取得當前 OTP"""
@@ -756,13 +3237,47 @@ class Api:
             return {"otp": "------", "remaining": 0, "error": "請輸入 Secret Key"}
 
         try:
-            secret = secret_key.strip().replace(" ", "")
-            totp = pyotp.TOTP(secret)
-            otp = totp.now()
-            remaining = totp.interval - (int(time.time()) % totp.interval)
-            return {"otp": otp, "remaining": remaining, "error": None}
-        except Exception as e:
-            return {"otp": "------", "remaining": 0, "error": "Secret Key 格式錯誤"}
+            return {**otp_cache.get(secret_key), "error": None}
+        except ValueError as e:
+            return {"otp": "------", "remaining": 0, "error": str(e)}
+
+    def validate_secret(self, secret_key: str):
+        """
+        檢查 Secret Key 格式（OTP 本身由網頁的 totp.js 計算）
+        只在 Secret Key 改變時呼叫一次
+        """
+        error = validate_secret(secret_key)
+        return {"valid": error is None, "error": error}
+
+    def parse_otp_urls(self, urls: list):
+        """解析 QR Code 內容（otpauth-migration:// 或 otpauth://），不寫入設定"""
+        accounts, warnings = decode_otp_urls(list(urls))
+        if not accounts:
+            return {"success": False, "error": "未找到可使用的 OTP 帳號", "warnings": warnings}
+        return {
+            "success": True,
+            "accounts": [{"name": account.label, "secret": account.secret} for account in accounts],
+            "warnings": warnings,
+        }
+
+    def import_otp_urls(self, urls: list):
+        """將 QR Code 中的所有帳號新增到帳號列表（已存在相同 Secret Key 的略過），整批只寫入一次帳號紀錄檔"""
+        accounts, warnings = decode_otp_urls(list(urls))
+        try:
+            existing = config.secret_keys()
+            new_accounts = [account for account in accounts if account.secret not in existing]
+            added = config.add_accounts([
+                {"name": account.label, "secret_key": account.secret} for account in new_accounts
+            ])
+        except ProtectionError as e:
+            return {"success": False, "error": f"加密失敗，未匯入: {e}", "warnings": warnings}
+        return {
+            "success": True,
+            "added": len(added),
+            "duplicates": len(accounts) - len(new_accounts),
+            "warnings": warnings,
+            "accounts": [config.account_summary(account) for account in added],
+        }
 
     def get_config_path(self):
         """取得設定檔路徑"""
@@ -831,18 +3346,9 @@ class Api:
             if ctypes.windll.comdlg32.GetOpenFileNameW(ctypes.byref(ofn)):
                 selected_path = file_buffer.value
 
-                # 如果選擇的是 .lnk 捷徑，解析出實際路徑
+                # .lnk 捷徑保留捷徑本身，啟動時才解析，才能帶入捷徑的參數與開始位置
                 if selected_path.lower().endswith('.lnk'):
-                    resolved_path = resolve_shortcut(selected_path)
-                    print(f"捷徑解析: {selected_path} -> {resolved_path}")
-
-                    # 確保解析後的路徑有效
-                    if resolved_path and os.path.exists(resolved_path):
-                        return resolved_path
-                    else:
-                        # 解析失敗，返回空字串並提示錯誤
-                        print(f"無法解析捷徑目標: {selected_path}")
-                        return ""
+                    print(f"捷徑解析: {selected_path} -> {resolve_shortcut(selected_path)}")
 
                 return selected_path
             return ""
@@ -856,13 +3362,33 @@ class Api:
             return {"success": False, "message": "請輸入 Secret Key"}
 
         def status_callback(msg):
-            if window:
-                window.evaluate_js(f'updateStatus("{msg}")')
+            event_bus.publish("status", msg)
 
         def run():
-            success, msg = automation.run_automation(secret_key, email, password, status_callback)
-            if window:
-                window.evaluate_js(f'automationComplete({str(success).lower()}, "{msg}")')
+            # 背景服務執行中時交給背景服務（已建立 UI Automation），沒有時在本行程執行
+            # 先以 ping 確認背景服務在執行，帳號資料只送給已確認的背景服務
+            client = DaemonClient(config.config_dir)
+            run_locally = not client.available()
+            if not run_locally:
+                with self._daemon_lock:
+                    self._daemon_runs += 1
+                try:
+                    result = client.request(
+                        "launch", on_event=lambda event: status_callback(event["message"]),
+                        secret_key=secret_key, email=email, password=password
+                    )
+                    success, msg = result["success"], result.get("message") or result.get("error", "")
+                except DaemonUnavailable:
+                    # ping 之後背景服務才結束，請求沒有送出
+                    run_locally = True
+                except DaemonError as e:
+                    success, msg = False, str(e)
+                finally:
+                    with self._daemon_lock:
+                        self._daemon_runs -= 1
+            if run_locally:
+                success, msg = automation.run_automation(secret_key, email, password, status_callback)
+            event_bus.publish("automation_complete", {"success": success, "message": msg})
 
         thread = threading.Thread(target=run, daemon=True)
         thread.start()
@@ -872,11 +3398,61 @@ class Api:
     def stop_automation(self):
         """停止自動化流程"""
         automation.stop()
+        # 只停止本視窗交給背景服務的流程，不影響命令列啟動的流程
+        with self._daemon_lock:
+            daemon_running = self._daemon_runs > 0
+        if daemon_running:
+            try:
+                DaemonClient(config.config_dir).request("stop")
+            except DaemonError:
+                pass
+        return {"success": True, "message": "已停止"}
+
+    def start_multi_automation(self, account_ids: list, max_concurrent: int = None):
+        """同時啟動多個帳號（每個帳號各自啟動一個 Launcher），以帳號 id 指定"""
+        if not config.get("auto_launch"):
+            return {"success": False, "message": "多開需要啟用「自動啟動 Launcher」"}
+
+        if max_concurrent is not None:
+            config.set("max_concurrent_launches", max(1, int(max_concurrent)))
+
+        selected = []
+        for account_id in account_ids:
+            try:
+                account = config.get_account_by_id(account_id)
+            except ProtectionError as e:
+                return {"success": False, "message": f"無法解密帳號資料: {e}"}
+            if account is not None:
+                if not account.get("secret_key"):
+                    name = account.get("name") or "未命名帳號"
+                    return {"success": False, "message": f"{name} 尚未設定 Secret Key"}
+                selected.append((account_id, account))
+
+        if not selected:
+            return {"success": False, "message": "請選擇要啟動的帳號"}
+
+        def progress_callback(event: dict):
+            event_bus.publish("multi_progress", event)
+
+        success, msg = multi_launcher.start(selected, progress_callback)
+        return {"success": success, "message": msg}
+
+    def stop_multi_automation(self):
+        """停止所有多開流程"""
+        multi_launcher.stop()
         return {"success": True, "message": "已停止"}
 
-    def check_update(self):
-        """檢查更新"""
-        return check_for_updates()
+    def get_timing_stats(self, last_n: int = 20):
+        """取得最近 last_n 次自動化流程各階段耗時的 p50 / p95（毫秒）"""
+        try:
+            return {"success": True, **automation.history.stats(int(last_n))}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def check_update(self, manual: bool = False):
+        """開始在背景檢查更新，結果以 update 事件推送（不等待網路）"""
+        check_for_updates(manual=bool(manual))
+        return {"started": True}
 
     def get_version(self):
         """取得當前版本"""
@@ -903,61 +3479,38 @@ class Api:
     def save_hotkey_config(self, hotkey_config: dict):
         """儲存快捷鍵設定"""
         try:
-            config.set("enable_reset_hotkey", hotkey_config.get("enable_reset_hotkey", True))
-            config.set("reset_hotkey", hotkey_config.get("reset_hotkey", "F5"))
+            config.update({
+                "enable_reset_hotkey": hotkey_config.get("enable_reset_hotkey", True),
+                "reset_hotkey": hotkey_config.get("reset_hotkey", "F5"),
+            })
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def subscribe(self):
+        """
+        網頁載入完成後呼叫：開始推送事件（Launcher / 遊戲狀態、流程進度）
+        返回目前的偵測狀態；push_detection 為 False 時網頁需自行輪詢 detect_launcher / detect_game
+        """
+        watching = ensure_process_watcher()
+        event_bus.set_ready()
+        return {"push_detection": watching, "detect": detection_state()}
+
     def detect_launcher(self):
-        """偵測 Launcher 是否已啟動"""
+        """偵測 Launcher 是否已啟動（讀取背景行程監看的結果）"""
         try:
-            root = uia.GetRootElement()
-            launcher = automation.find_window_by_keywords(root, ["FINAL FANTASY XIV 繁體中文版"])
+            if ensure_process_watcher():
+                return {"running": process_watcher.is_running("launcher")}
+            launcher = automation.find_window_by_keywords(["FINAL FANTASY XIV 繁體中文版"])
             return {"running": launcher is not None}
         except Exception:
             return {"running": False}
 
     def detect_game(self):
-        """偵測遊戲是否已開啟（透過進程名稱）"""
+        """偵測遊戲是否已開啟（讀取背景行程監看的結果）"""
         try:
-            import ctypes
-            from ctypes import wintypes
-
-            # 使用 Windows API 列舉進程
-            PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
-
-            # 取得所有進程 ID
-            EnumProcesses = ctypes.windll.psapi.EnumProcesses
-            GetProcessImageFileNameW = ctypes.windll.psapi.GetProcessImageFileNameW
-            OpenProcess = ctypes.windll.kernel32.OpenProcess
-            CloseHandle = ctypes.windll.kernel32.CloseHandle
-
-            # 列舉進程
-            process_ids = (ctypes.c_ulong * 2048)()
-            bytes_returned = ctypes.c_ulong()
-            EnumProcesses(process_ids, ctypes.sizeof(process_ids), ctypes.byref(bytes_returned))
-
-            num_processes = bytes_returned.value // ctypes.sizeof(ctypes.c_ulong)
-
-            game_executables = ["ffxiv_dx11.exe", "ffxiv.exe"]
-
-            for i in range(num_processes):
-                pid = process_ids[i]
-                if pid == 0:
-                    continue
-
-                handle = OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
-                if handle:
-                    try:
-                        image_name = ctypes.create_unicode_buffer(512)
-                        if GetProcessImageFileNameW(handle, image_name, 512):
-                            exe_name = image_name.value.split("\\")[-1].lower()
-                            if exe_name in game_executables:
-                                return {"running": True}
-                    finally:
-                        CloseHandle(handle)
-
+            if ensure_process_watcher():
+                return {"running": process_watcher.is_running("game")}
             return {"running": False}
         except Exception:
             return {"running": False}
@@ -969,8 +3522,7 @@ def save_window_position():
     if window:
         try:
             x, y = window.x, window.y
-            config.set("window_x", x)
-            config.set("window_y", y)
+            config.update({"window_x": x, "window_y": y})
         except:
             pass
 
@@ -978,34 +3530,150 @@ def save_window_position():
 def on_closing():
     """視窗關閉時儲存位置"""
     save_window_position()
+    config.flush()
+    if process_watcher is not None:
+        process_watcher.stop()
 
 
-def check_for_updates():
-    """檢查是否有新版本"""
-    try:
-        req = urllib.request.Request(
-            VERSION_CHECK_URL,
-            headers={'User-Agent': 'FF14LoginManager'}
-        )
-        with urllib.request.urlopen(req, timeout=5) as response:
-            data = json.loads(response.read().decode('utf-8'))
-            remote_version = data.get("version", "0.0.0")
-            download_url = data.get("download_url", "")
-            changelog = data.get("changelog", "")
-
-            # 比較版本
-            if remote_version > VERSION:
-                return {
-                    "has_update": True,
-                    "current_version": VERSION,
-                    "new_version": remote_version,
-                    "download_url": download_url,
-                    "changelog": changelog
+def version_key(version: str) -> tuple:
+    """
+    語意化版本的排序 key（"1.0.10" > "1.0.5"，"1.1" == "1.1.0"，"1.1.0-beta.2" < "1.1.0"）
+    可帶 v 前綴，+ 之後的建置資訊不影響排序
+    """
+    text = str(version).strip().lstrip("vV").split("+")[0]
+    core, _, prerelease = text.partition("-")
+    numbers = [int(part) if part.isdigit() else 0 for part in core.split(".")]
+    while len(numbers) > 1 and numbers[-1] == 0:
+        numbers.pop()
+    if not prerelease:
+        return tuple(numbers), (1,)
+    # 預先發行版排在正式版之前；數字識別字排在文字之前
+    identifiers = tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in prerelease.split("."))
+    return tuple(numbers), (0, identifiers)
+
+
+def is_newer_version(remote: str, current: str) -> bool:
+    return version_key(remote) > version_key(current)
+
+
+class UpdateChecker:
+    """
+    檢查新版本（在背景執行緒執行，結果以回呼送出，不讓介面等待網路）
+    最後一次取得的 version.json 連同 ETag / Last-Modified 存到快取檔，TTL 內直接使用快取；
+    過期後以條件式 GET 詢問（304 表示沒有變更，只更新檢查時間），網路失敗時沿用舊的快取
+    """
+
+    def __init__(self, url: str, current_version: str, cache_path: Path,
+                 ttl: float = UPDATE_CHECK_TTL, timeout: float = 5):
+        self.url = url
+        self.current_version = current_version
+        self.cache_path = Path(cache_path)
+        self.ttl = ttl
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def _load_cache(self) -> dict:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # 檢查網址改變時舊的快取不適用
+        if not isinstance(cache, dict) or cache.get("url") != self.url or not isinstance(cache.get("data"), dict):
+            return {}
+        return cache
+
+    def _save_cache(self, cache: dict):
+        temp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"寫入更新快取失敗: {e}")
+
+    def fetch(self, force: bool = False) -> dict:
+        """
+        取得 version.json 的內容，force 為 True 時忽略 TTL（仍使用條件式 GET）
+        網路或格式錯誤時拋出 OSError / ValueError
+        """
+        cache = self._load_cache()
+        now = time.time()
+        if cache and not force and 0 <= now - cache.get("checked_at", 0) < self.ttl:
+            return cache["data"]
+
+        # urllib.request 載入 http / email / ssl 相關模組較慢，只在真的要連線時才載入
+        import urllib.error
+        import urllib.request
+
+        headers = {"User-Agent": "FF14LoginManager"}
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+        request = urllib.request.Request(self.url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                data = json.loads(response.read().decode("utf-8"))
+                if not isinstance(data, dict):
+                    raise ValueError("version.json 格式錯誤")
+                cache = {
+                    "url": self.url,
+                    "checked_at": now,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "data": data,
                 }
-    except Exception as e:
-        print(f"檢查更新失敗: {e}")
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or not cache:
+                raise
+            cache["checked_at"] = now
+        self._save_cache(cache)
+        return cache["data"]
+
+    def check(self, force: bool = False) -> dict:
+        """返回檢查結果；無法連線時使用上次的快取，沒有快取時結果帶 error"""
+        with self._lock:
+            try:
+                data = self.fetch(force)
+            except (OSError, ValueError) as e:
+                print(f"檢查更新失敗: {e}")
+                data = self._load_cache().get("data")
+                if data is None:
+                    return {"has_update": False, "current_version": self.current_version, "error": str(e)}
+        return self.result(data)
+
+    def result(self, data: dict) -> dict:
+        remote_version = str(data.get("version", "0.0.0"))
+        if is_newer_version(remote_version, self.current_version):
+            return {
+                "has_update": True,
+                "current_version": self.current_version,
+                "new_version": remote_version,
+                "download_url": data.get("download_url", ""),
+                "changelog": data.get("changelog", ""),
+            }
+        return {"has_update": False, "current_version": self.current_version}
+
+    def check_async(self, callback, force: bool = False) -> threading.Thread:
+        """在背景執行緒檢查，完成後呼叫 callback(result)"""
+        thread = threading.Thread(target=lambda: callback(self.check(force)), daemon=True)
+        thread.start()
+        return thread
+
+
+update_checker = UpdateChecker(VERSION_CHECK_URL, VERSION, config.config_dir / "update_cache.json")
 
-    return {"has_update": False, "current_version": VERSION}
+
+def check_for_updates(manual: bool = False) -> threading.Thread:
+    """
+    在背景檢查更新，結果以 update 事件推送到網頁
+    手動檢查時忽略快取的 TTL，並讓網頁在沒有更新時也顯示結果
+    """
+    return update_checker.check_async(
+        lambda result: event_bus.publish("update", {**result, "manual": manual}),
+        force=manual,
+    )
 
 
 def set_window_icon(icon_path):
@@ -1045,6 +3713,9 @@ def set_window_icon(icon_path):
 def main():
     global window
 
+    # 讀取設定檔與載入 pywebview 同時進行
+    config.preload()
+    import webview
 
     # 取得腳本所在目錄
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -1058,6 +3729,7 @@ def main():
     # 讀取已儲存的視窗位置
     saved_x = config.get("window_x")
     saved_y = config.get("window_y")
+    startup_trace.mark("config")
 
     # 建立視窗（如果有儲存位置則使用）
     window_params = {
@@ -1075,12 +3747,21 @@ def main():
         window_params["y"] = saved_y
 
     window = webview.create_window(**window_params)
+    event_bus.attach(window.evaluate_js)
+    startup_trace.mark("window_created")
+
+    # 更新檢查與視窗啟動同時進行，結果在網頁訂閱事件後送出
+    if config.get("auto_check_update", True):
+        check_for_updates()
+    window.events.loaded += lambda: startup_trace.mark("page_loaded")
 
     # 註冊關閉事件
     window.events.closing += on_closing
 
     # 視窗顯示後設定圖示
     def on_shown():
+        # 視窗出現後才在背景預先載入 UIA，不延遲第一次繪製
+        threading.Thread(target=automation.backend.warm, daemon=True).start()
         time.sleep(0.1)  # 等待視窗完全顯示
         set_window_icon(icon_path)
 
@@ -1136,7 +3817,582 @@ def show_error_dialog(log_path: str, error_text: str):
     root.mainloop()
 
 
+# ============ 背景服務 ============
+
+# 結束代碼（命令列模式的 exit code，背景服務的回應也帶有相同的代碼）
+EXIT_OK = 0
+EXIT_FAILED = 1  # 自動化流程失敗
+EXIT_USAGE = 2  # 參數錯誤（argparse 預設）
+EXIT_ACCOUNT = 3  # 找不到帳號或名稱不唯一
+EXIT_CREDENTIALS = 4  # 帳號資料無法解密或缺少 Secret Key
+EXIT_DAEMON = 5  # 背景服務未執行或連線中斷
+EXIT_INTERRUPTED = 130  # Ctrl+C 中斷
+
+
+class AccountSelectionError(Exception):
+    """依名稱或索引找不到可用的帳號"""
+
+    def __init__(self, message: str, exit_code: int):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+
+def select_account(config: ConfigManager, name: str = None, index: int = None) -> dict:
+    """依名稱（不分大小寫）或索引取得解密後的帳號；找不到、名稱不唯一或無法使用時拋出 AccountSelectionError"""
+    if index is not None:
+        account = config.accounts.at(index)
+        if account is None:
+            raise AccountSelectionError(f"找不到第 {index} 個帳號（共 {len(config.accounts)} 個）", EXIT_ACCOUNT)
+    else:
+        matches = config.find_accounts(name or "")
+        if not matches:
+            raise AccountSelectionError(f"找不到帳號: {name}", EXIT_ACCOUNT)
+        if len(matches) > 1:
+            indices = ", ".join(str(account["index"]) for account in matches)
+            raise AccountSelectionError(f"有 {len(matches)} 個帳號名稱為 {name}，請改用 --index（{indices}）", EXIT_ACCOUNT)
+        account = matches[0]
+
+    try:
+        account = config.get_account_by_id(account["id"])
+    except ProtectionError as e:
+        raise AccountSelectionError(f"無法解密帳號資料: {e}", EXIT_CREDENTIALS) from e
+    if not account.get("secret_key"):
+        raise AccountSelectionError(f"{account.get('name') or '帳號'} 尚未設定 Secret Key", EXIT_CREDENTIALS)
+    return account
+
+
+def daemon_address(config_dir: Path) -> tuple[str, str]:
+    """返回 (位址, multiprocessing 連線類型)：Windows 為具名管道，其他平台為設定資料夾中的 Unix socket"""
+    if sys.platform == "win32":
+        # 以設定資料夾區分，測試用的設定資料夾不會連到使用者的背景服務
+        suffix = hashlib.sha256(str(Path(config_dir).resolve()).lower().encode("utf-8")).hexdigest()[:12]
+        return rf"\\.\pipe\FF14LoginManager-{suffix}", "AF_PIPE"
+    return str(Path(config_dir) / "daemon.sock"), "AF_UNIX"
+
+
+def daemon_authkey(config_dir: Path, create: bool = False) -> bytes:
+    """
+    連線驗證金鑰（設定資料夾中的 daemon.key），只有同一個使用者才能連線：
+    Windows 忽略檔案權限，金鑰以 DPAPI 加密後儲存；其他平台為權限 0600 的原始金鑰
+    不存在或無法解密時：create 為 True 則重新建立，否則返回 None
+    """
+    path = Path(config_dir) / "daemon.key"
+    protection = DPAPIProtection() if sys.platform == "win32" else None
+    try:
+        data = path.read_bytes()
+        return protection.unprotect_blobs([data])[0] if protection else data
+    except FileNotFoundError:
+        if not create:
+            return None
+    except ProtectionError as e:
+        # 舊版本留下的未加密金鑰，或其他使用者建立的金鑰
+        print(f"無法讀取背景服務金鑰: {e}")
+        if not create:
+            return None
+    key = os.urandom(32)
+    data = protection.protect_blobs([key])[0] if protection else key
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return key
+
+
+class DaemonError(Exception):
+    """與背景服務的連線在請求途中中斷"""
+
+
+class DaemonUnavailable(DaemonError):
+    """背景服務未執行或無法連線（請求尚未送出，可改在本行程執行）"""
+
+
+def send_message(conn, message: dict):
+    conn.send_bytes(json.dumps(message, ensure_ascii=False).encode("utf-8"))
+
+
+def recv_message(conn) -> dict:
+    return json.loads(conn.recv_bytes().decode("utf-8"))
+
+
+class DaemonClient:
+    """
+    背景服務的用戶端（視窗介面與命令列模式使用），每個請求一條連線
+    訊息以 JSON 傳送，不使用 pickle
+    """
+
+    def __init__(self, config_dir: Path):
+        self.config_dir = Path(config_dir)
+        self.address, self.family = daemon_address(self.config_dir)
+
+    def connect(self):
+        # 沒有金鑰檔表示從未啟動過背景服務，不需要載入 multiprocessing
+        authkey = daemon_authkey(self.config_dir)
+        if authkey is None:
+            raise DaemonUnavailable("背景服務未執行")
+        from multiprocessing.connection import Client, AuthenticationError
+        try:
+            return Client(self.address, family=self.family, authkey=authkey)
+        except (OSError, EOFError, AuthenticationError) as e:
+            raise DaemonUnavailable(f"背景服務未執行: {e}") from e
+
+    def available(self) -> bool:
+        """以不含任何帳號資料的 ping 確認背景服務正在執行"""
+        try:
+            return bool(self.request("ping").get("success"))
+        except DaemonError:
+            return False
+
+    def request(self, command: str, on_event=None, **params) -> dict:
+        """
+        送出請求並等待結果；結果之前的進度訊息（{"event": ...}）交給 on_event
+        無法連線時拋出 DaemonUnavailable，請求途中斷線時拋出 DaemonError
+        """
+        conn = self.connect()
+        try:
+            send_message(conn, {"command": command, **params})
+            while True:
+                message = recv_message(conn)
+                if "event" not in message:
+                    return message
+                if on_event:
+                    on_event(message)
+        except (OSError, EOFError, ValueError) as e:
+            raise DaemonError(f"背景服務連線中斷: {e}") from e
+        finally:
+            conn.close()
+
+
+class LauncherDaemon:
+    """
+    常駐背景服務
+    保留已讀取的設定與帳號、已建立的 UI Automation 與自動化流程，
+    透過本機 IPC（Windows 具名管道 / Unix socket）接受 ping / status / accounts / otp / launch / stop / shutdown 請求。
+    每條連線處理一個請求；launch 會先逐筆送出 {"event": "status", "message": ...}，最後送出結果。
+    自動化固定在同一個執行緒執行，UI Automation 物件只建立一次。
+    """
+
+    COMMANDS = ("ping", "status", "accounts", "otp", "launch", "stop", "shutdown")
+
+    def __init__(self, config: ConfigManager, automation: "LauncherAutomation"):
+        self.config = config
+        self.automation = automation
+        self.address, self.family = daemon_address(config.config_dir)
+        self.started = time.time()
+        self.launches = 0
+        self.current = None  # 正在啟動的帳號名稱
+        self._listener = None
+        self._stopped = threading.Event()
+        self._jobs = []
+        self._jobs_changed = threading.Condition()
+        self._launch_lock = threading.Lock()
+
+    # ---- 啟動與停止 ----
+
+    def serve_forever(self):
+        """開始接受連線，直到收到 shutdown 請求或 Ctrl+C；已有背景服務在執行時拋出 DaemonError"""
+        from multiprocessing.connection import Listener
+
+        try:
+            DaemonClient(self.config.config_dir).request("ping")
+            raise DaemonError("背景服務已在執行")
+        except DaemonUnavailable:
+            pass
+        if self.family == "AF_UNIX" and os.path.exists(self.address):
+            os.unlink(self.address)  # 上次未正常結束留下的 socket 檔
+
+        authkey = daemon_authkey(self.config.config_dir, create=True)
+        self._listener = Listener(self.address, family=self.family, authkey=authkey)
+        if self.family == "AF_UNIX":
+            os.chmod(self.address, 0o600)
+
+        # 先讀取設定與帳號，並在自動化執行緒上建立 UI Automation
+        self.config.account_summaries()
+        threading.Thread(target=self._automation_loop, daemon=True).start()
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        print(f"背景服務已啟動: {self.address}", flush=True)
+
+        # 主執行緒只等待結束，讓 Ctrl+C 在各平台都能中斷
+        try:
+            while not self._stopped.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        self._stopped.set()
+        self.automation.stop()
+        if self._listener is not None:
+            listener, self._listener = self._listener, None
+            try:
+                listener.close()
+            except OSError:
+                pass
+        self.config.flush()
+        print("背景服務已停止", flush=True)
+
+    def _accept_loop(self):
+        from multiprocessing.connection import AuthenticationError
+
+        while not self._stopped.is_set():
+            listener = self._listener
+            if listener is None:
+                break
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError, AuthenticationError) as e:
+                if not self._stopped.is_set():
+                    print(f"背景服務連線失敗: {e}")
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    # ---- 請求處理 ----
+
+    def _serve(self, conn):
+        with conn:
+            try:
+                request = recv_message(conn)
+            except (OSError, EOFError, ValueError) as e:
+                print(f"背景服務讀取請求失敗: {e}")
+                return
+            try:
+                reply = self._handle(request, lambda message: send_message(conn, message))
+            except Exception as e:
+                # 處理過程的任何錯誤都回覆給用戶端，背景服務繼續執行
+                print(f"背景服務處理請求失敗: {e}")
+                reply = {"success": False, "error": str(e), "exit_code": EXIT_FAILED}
+            try:
+                send_message(conn, reply)
+            except (OSError, ValueError) as e:
+                print(f"背景服務回覆失敗: {e}")
+
+    def _handle(self, request: dict, send) -> dict:
+        command = request.get("command")
+        if command not in self.COMMANDS:
+            return {"success": False, "error": f"未知的請求: {command}", "exit_code": EXIT_USAGE}
+        # 視窗介面可能改過設定或帳號
+        self.config.reload_if_changed()
+        return getattr(self, f"do_{command}")(request, send)
+
+    def _select(self, request: dict) -> dict:
+        index = request.get("index")
+        return select_account(self.config, request.get("account"), None if index is None else int(index))
+
+    def do_ping(self, request: dict, send) -> dict:
+        return {"success": True, "pid": os.getpid(), "version": VERSION}
+
+    def do_status(self, request: dict, send) -> dict:
+        return {
+            "success": True,
+            "pid": os.getpid(),
+            "version": VERSION,
+            "uptime": round(time.time() - self.started, 1),
+            "running": self.automation.running,
+            "current": self.current,
+            "launches": self.launches,
+            "accounts": len(self.config.accounts),
+        }
+
+    def do_accounts(self, request: dict, send) -> dict:
+        return {"success": True, "accounts": self.config.account_summaries()}
+
+    def do_otp(self, request: dict, send) -> dict:
+        try:
+            account = self._select(request)
+            return {"success": True, **otp_cache.get(account["secret_key"])}
+        except AccountSelectionError as e:
+            return {"success": False, "error": str(e), "exit_code": e.exit_code}
+        except ValueError as e:
+            return {"success": False, "error": f"Secret Key 格式錯誤: {e}", "exit_code": EXIT_CREDENTIALS}
+
+    def do_launch(self, request: dict, send) -> dict:
+        """以帳號名稱 / 索引，或直接帶入 secret_key / email / password（視窗介面尚未儲存的內容）啟動"""
+        if "secret_key" in request:
+            account = {key: request.get(key) or "" for key in ("name", "secret_key", "email", "password")}
+        else:
+            try:
+                account = self._select(request)
+            except AccountSelectionError as e:
+                return {"success": False, "error": str(e), "exit_code": e.exit_code}
+
+        if not self._launch_lock.acquire(blocking=False):
+            return {"success": False, "error": "已有自動化流程執行中", "exit_code": EXIT_FAILED}
+        try:
+            self.current = account.get("name") or ""
+            disconnected = []
+
+            def status_callback(msg):
+                # 用戶端中斷連線後流程繼續執行，只是不再送出進度
+                if disconnected:
+                    return
+                try:
+                    send({"event": "status", "message": msg})
+                except OSError:
+                    disconnected.append(True)
+
+            success, msg = self._run_on_automation_thread(lambda: self.automation.run_automation(
+                account["secret_key"], account.get("email", ""), account.get("password", ""), status_callback
+            ))
+            self.launches += 1
+            return {"success": success, "message": msg, "exit_code": EXIT_OK if success else EXIT_FAILED}
+        finally:
+            self.current = None
+            self._launch_lock.release()
+
+    def do_stop(self, request: dict, send) -> dict:
+        self.automation.stop()
+        return {"success": True, "message": "已停止"}
+
+    def do_shutdown(self, request: dict, send) -> dict:
+        self._stopped.set()
+        return {"success": True, "message": "背景服務即將停止"}
+
+    # ---- 自動化執行緒 ----
+
+    def _run_on_automation_thread(self, function):
+        job = {"function": function, "done": threading.Event()}
+        with self._jobs_changed:
+            self._jobs.append(job)
+            self._jobs_changed.notify()
+        job["done"].wait()
+        if "error" in job:
+            return False, f"發生錯誤: {job['error']}"
+        return job["result"]
+
+    def _automation_loop(self):
+        self.automation.backend.prepare()
+        while True:
+            with self._jobs_changed:
+                while not self._jobs:
+                    self._jobs_changed.wait()
+                job = self._jobs.pop(0)
+            try:
+                job["result"] = job["function"]()
+            except Exception as e:
+                job["error"] = str(e)
+            finally:
+                job["done"].set()
+
+
+# ============ 命令列模式 ============
+
+CLI_COMMANDS = ("launch", "otp", "accounts", "status", "stop", "daemon")
+
+
+def build_cli_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="ff14_launcher.py",
+        description="FF14 Login Manager 命令列模式（不開啟視窗）",
+        epilog="結束代碼：0 成功、1 自動化失敗、2 參數錯誤、3 找不到帳號、4 帳號資料無法使用、5 背景服務未執行、130 中斷",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_account_options(command):
+        group = command.add_mutually_exclusive_group(required=True)
+        group.add_argument("--account", "-a", metavar="NAME", help="帳號名稱（不分大小寫）")
+        group.add_argument("--index", "-i", type=int, metavar="N", help="帳號在列表中的位置（從 0 開始）")
+        command.add_argument("--no-daemon", action="store_true", help="不使用背景服務，在本行程執行")
+
+    launch = commands.add_parser("launch", help="啟動 Launcher 並自動登入（背景服務執行中時交給背景服務）")
+    add_account_options(launch)
+
+    otp = commands.add_parser("otp", help="輸出目前的 OTP")
+    add_account_options(otp)
+    otp.add_argument("--json", action="store_true", help="以 JSON 輸出目前 / 下一個 OTP 與剩餘秒數")
+
+    commands.add_parser("accounts", help="列出帳號")
+    commands.add_parser("status", help="顯示背景服務狀態")
+    commands.add_parser("stop", help="停止背景服務正在執行的自動化流程")
+
+    daemon = commands.add_parser("daemon", help="執行常駐背景服務（保留設定與 UI Automation，加快之後的啟動）")
+    daemon.add_argument("--shutdown", action="store_true", help="停止執行中的背景服務")
+    return parser
+
+
+def run_interruptible(function, on_interrupt):
+    """在背景執行緒執行 function，主執行緒等待並處理 Ctrl+C；中斷時呼叫 on_interrupt 並返回 None"""
+    result = {}
+
+    def run():
+        try:
+            result["value"] = function()
+        except BaseException as e:
+            result["error"] = e
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(0.2)
+    except KeyboardInterrupt:
+        on_interrupt()
+        worker.join(5)
+        return None
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def cli_launch(args) -> int:
+    start = time.monotonic()
+
+    def status_callback(msg):
+        print(f"[{time.monotonic() - start:6.2f}s] {msg}", flush=True)
+
+    # 背景服務執行中時交給背景服務，沒有時才在本行程執行
+    if not args.no_daemon:
+        client = DaemonClient(config.config_dir)
+
+        def stop_remote():
+            try:
+                client.request("stop")
+            except DaemonError:
+                pass
+
+        try:
+            result = run_interruptible(
+                lambda: client.request("launch", on_event=lambda event: status_callback(event["message"]),
+                                       account=args.account, index=args.index),
+                stop_remote,
+            )
+        except DaemonUnavailable:
+            pass
+        except DaemonError as e:
+            print(str(e), file=sys.stderr)
+            return EXIT_DAEMON
+        else:
+            if result is None:
+                print("已中斷", flush=True)
+                return EXIT_INTERRUPTED
+            if "error" in result:
+                print(result["error"], file=sys.stderr)
+            else:
+                status_callback(result["message"])
+            return result.get("exit_code", EXIT_FAILED)
+
+    try:
+        account = select_account(config, args.account, args.index)
+    except AccountSelectionError as e:
+        print(str(e), file=sys.stderr)
+        return e.exit_code
+
+    result = run_interruptible(
+        lambda: automation.run_automation(
+            account["secret_key"], account.get("email", ""), account.get("password", ""), status_callback
+        ),
+        automation.stop,
+    )
+    if result is None:
+        print("已中斷", flush=True)
+        return EXIT_INTERRUPTED
+    success, msg = result
+    status_callback(msg)
+    return EXIT_OK if success else EXIT_FAILED
+
+
+def cli_otp(args) -> int:
+    result = None
+    if not args.no_daemon:
+        try:
+            result = DaemonClient(config.config_dir).request("otp", account=args.account, index=args.index)
+        except DaemonError:
+            result = None
+    if result is None:
+        try:
+            account = select_account(config, args.account, args.index)
+            result = {"success": True, **otp_cache.get(account["secret_key"])}
+        except AccountSelectionError as e:
+            result = {"success": False, "error": str(e), "exit_code": e.exit_code}
+        except ValueError as e:
+            result = {"success": False, "error": f"Secret Key 格式錯誤: {e}", "exit_code": EXIT_CREDENTIALS}
+
+    if not result["success"]:
+        print(result["error"], file=sys.stderr)
+        return result["exit_code"]
+    if args.json:
+        print(json.dumps({key: result[key] for key in ("otp", "next", "remaining")}))
+    else:
+        print(result["otp"])
+    return EXIT_OK
+
+
+def cli_accounts(args) -> int:
+    for index, summary in enumerate(config.account_summaries()):
+        flag = "" if summary["has_secret"] else "  （未設定 Secret Key）"
+        print(f"{index:>3}  {summary['name'] or f'帳號 {index + 1}'}{flag}")
+    return EXIT_OK
+
+
+def cli_status(args) -> int:
+    try:
+        status = DaemonClient(config.config_dir).request("status")
+    except DaemonError as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_DAEMON
+    state = f"正在啟動 {status['current'] or '帳號'}" if status["running"] else "閒置"
+    print(f"背景服務 v{status['version']}（PID {status['pid']}），已執行 {status['uptime']:.0f} 秒")
+    print(f"{state}，已啟動 {status['launches']} 次，帳號 {status['accounts']} 個")
+    return EXIT_OK
+
+
+def cli_stop(args) -> int:
+    try:
+        result = DaemonClient(config.config_dir).request("stop")
+    except DaemonError as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_DAEMON
+    print(result["message"])
+    return EXIT_OK
+
+
+def cli_daemon(args) -> int:
+    if args.shutdown:
+        try:
+            result = DaemonClient(config.config_dir).request("shutdown")
+        except DaemonError as e:
+            print(str(e), file=sys.stderr)
+            return EXIT_DAEMON
+        print(result["message"])
+        return EXIT_OK
+    try:
+        LauncherDaemon(config, automation).serve_forever()
+    except DaemonError as e:
+        print(str(e), file=sys.stderr)
+        return EXIT_DAEMON
+    return EXIT_OK
+
+
+def cli_main(argv: list[str]) -> int:
+    """
+    命令列模式：不載入 pywebview，直接使用 ConfigManager 與 LauncherAutomation（或交給背景服務）
+    進度逐行輸出到 stdout，錯誤輸出到 stderr，以結束代碼表示結果
+    """
+    # 輸出到管線時也逐行送出；打包成無 console 的執行檔時 stdout 為 None
+    for stream in (sys.stdout, sys.stderr):
+        if stream is not None and hasattr(stream, "reconfigure"):
+            stream.reconfigure(line_buffering=True, errors="replace")
+
+    args = build_cli_parser().parse_args(argv)
+    handlers = {
+        "launch": cli_launch, "otp": cli_otp, "accounts": cli_accounts,
+        "status": cli_status, "stop": cli_stop, "daemon": cli_daemon,
+    }
+    try:
+        return handlers[args.command](args)
+    finally:
+        config.flush()
+
+
+startup_trace.mark("import")
+
+
 if __name__ == "__main__":
+    # 有子命令時以命令列模式執行，不建立視窗
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+        sys.exit(cli_main(sys.argv[1:]))
+
     try:
         main()
     except Exception as e:
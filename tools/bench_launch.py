@@ -0,0 +1,209 @@
+"""
+登入流程延遲效能測試
+以模擬 Launcher 執行完整的 Api.start_automation 流程，量測從呼叫到點擊 PLAY 的時間，
+以及每個階段對後端的呼叫次數。不需要 Windows 桌面，可在無介面的 Linux 上執行。
+
+用法：
+    python tools/bench_launch.py --runs 5
+    python tools/bench_launch.py --budget-ms 2000   # 中位數超過預算時以 exit code 1 結束
+    python tools/bench_launch.py --accounts 4       # 同時啟動 4 個帳號，量測整批完成時間
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+# 避免效能測試讀寫使用者真正的設定檔
+_tmp_appdata = tempfile.mkdtemp(prefix="ff14lm-bench-")
+os.environ["LOCALAPPDATA"] = _tmp_appdata
+
+import ff14_launcher  # noqa: E402
+from ff14_launcher import percentile  # noqa: E402
+from sim_launcher import SimulatedBackend, SimulatedDesktop, SimulatedLauncher  # noqa: E402
+
+# RFC 6238 測試用 Secret
+SECRET_KEY = "GEZDGNBVGY3TQOJQGEZDGNBVGY3TQOJQ"
+
+
+def create_config(args) -> "ff14_launcher.ConfigManager":
+    """在暫存目錄建立效能測試用的設定"""
+    work_dir = Path(tempfile.mkdtemp(dir=_tmp_appdata))
+    launcher_exe = work_dir / "ffxivboot.exe"
+    launcher_exe.write_bytes(b"")
+
+    config = ff14_launcher.ConfigManager(config_dir=work_dir)
+    config.config.update({
+        "launcher_path": str(launcher_exe),
+        "auto_launch": True,
+        "auto_input_credentials": args.credentials,
+        "auto_input_otp": True,
+        "auto_press_enter": True,
+        "auto_click_play": True,
+        "window_event_detection": not args.poll,
+        "max_concurrent_launches": args.concurrency,
+    })
+    return config
+
+
+def create_launcher(args) -> SimulatedLauncher:
+    return SimulatedLauncher(
+        window_delay=args.window_delay,
+        login_delay=args.login_delay,
+        otp_delay=args.otp_delay,
+        play_delay=args.play_delay,
+        decoy_elements=args.decoy_elements,
+    )
+
+
+def run_once(args) -> tuple[float, dict, list]:
+    """執行一次完整流程，返回 (耗時秒數, 各階段計時紀錄, 操作記錄)"""
+    config = create_config(args)
+    launcher = create_launcher(args)
+    desktop = SimulatedDesktop(args.decoy_windows, args.stale_launchers)
+    backend = SimulatedBackend(launcher, call_latency=args.call_latency / 1000, events=not args.poll,
+                               desktop=desktop)
+    automation = ff14_launcher.LauncherAutomation(config, backend)
+
+    # Api 使用模組層級的 config / automation
+    ff14_launcher.config = config
+    ff14_launcher.automation = automation
+
+    api = ff14_launcher.Api()
+    start = time.perf_counter()
+    result = api.start_automation(SECRET_KEY, "user@example.com", "password")
+    if not result["success"]:
+        raise RuntimeError(result["message"])
+
+    if not launcher.played.wait(args.timeout):
+        automation.stop()
+        raise RuntimeError(f"逾時：{args.timeout} 秒內未點擊 PLAY，操作記錄：{launcher.actions}")
+    elapsed = time.perf_counter() - start
+
+    # 等待背景執行緒結束，避免影響下一輪
+    while automation.running:
+        time.sleep(0.01)
+
+    return elapsed, automation.history.load(1)[-1], launcher.actions
+
+
+def run_multi_once(args) -> tuple[float, list[dict], list]:
+    """同時啟動 args.accounts 個帳號，返回 (整批耗時秒數, 各帳號計時紀錄, 第一個 Launcher 的操作記錄)"""
+    config = create_config(args)
+    desktop = SimulatedDesktop(args.decoy_windows, args.stale_launchers)
+    launchers = []
+
+    def backend_factory():
+        launcher = create_launcher(args)
+        launchers.append(launcher)
+        return SimulatedBackend(launcher, call_latency=args.call_latency / 1000, events=not args.poll,
+                                desktop=desktop)
+
+    history = ff14_launcher.TimingHistory(config.config_dir / "timing_history.jsonl")
+    manager = ff14_launcher.MultiLaunchManager(config, ff14_launcher.WindowRegistry(), history, backend_factory)
+    accounts = [
+        (f"bench-{i}", {"name": f"帳號 {i + 1}", "secret_key": SECRET_KEY, "email": f"user{i}@example.com", "password": "password"})
+        for i in range(args.accounts)
+    ]
+
+    finished = threading.Event()
+    failures = []
+
+    def on_progress(event: dict):
+        if event.get("finished"):
+            finished.set()
+        elif event["done"] and not event["success"]:
+            failures.append(f"{event['name']}: {event['status']}")
+
+    start = time.perf_counter()
+    success, msg = manager.start(accounts, on_progress)
+    if not success:
+        raise RuntimeError(msg)
+
+    if not finished.wait(args.timeout):
+        manager.stop()
+        raise RuntimeError(f"逾時：{args.timeout} 秒內未完成所有帳號")
+    elapsed = time.perf_counter() - start
+
+    if failures:
+        raise RuntimeError(f"部分帳號失敗：{failures}")
+    if not all(launcher.played.is_set() for launcher in launchers):
+        raise RuntimeError("部分 Launcher 未點擊 PLAY")
+
+    return elapsed, history.load(args.accounts), launchers[0].actions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FF14 Login Manager 登入流程延遲效能測試")
+    parser.add_argument("--runs", type=int, default=5, help="執行次數")
+    parser.add_argument("--window-delay", type=float, default=0.5, help="啟動後視窗出現前的延遲（秒）")
+    parser.add_argument("--login-delay", type=float, default=0.2, help="視窗出現後登入欄位出現的延遲（秒）")
+    parser.add_argument("--otp-delay", type=float, default=0.2, help="視窗出現後 OTP 欄位出現的延遲（秒）")
+    parser.add_argument("--play-delay", type=float, default=0.5, help="送出後 PLAY 按鈕出現的延遲（秒）")
+    parser.add_argument("--call-latency", type=float, default=1.0, help="每次後端呼叫的模擬耗時（毫秒）")
+    parser.add_argument("--decoy-windows", type=int, default=20, help="桌面上其他視窗數量")
+    parser.add_argument("--stale-launchers", type=int, default=0, help="桌面上其他行程開啟的同名視窗數量")
+    parser.add_argument("--decoy-elements", type=int, default=200, help="Launcher 中無關元素數量")
+    parser.add_argument("--credentials", action="store_true", help="啟用自動輸入帳密")
+    parser.add_argument("--poll", action="store_true", help="停用視窗事件，只使用輪詢")
+    parser.add_argument("--accounts", type=int, default=1, help="同時啟動的帳號數量")
+    parser.add_argument("--concurrency", type=int, default=2, help="同時執行數量上限（max_concurrent_launches）")
+    parser.add_argument("--timeout", type=float, default=60.0, help="單次執行逾時（秒）")
+    parser.add_argument("--budget-ms", type=float, default=None, help="中位數延遲預算（毫秒），超過時 exit code 1")
+    parser.add_argument("--verbose", action="store_true", help="輸出最後一次的操作記錄")
+    args = parser.parse_args()
+
+    timings = []
+    phases = {}
+    actions = []
+    for i in range(args.runs):
+        if args.accounts > 1:
+            elapsed, records, actions = run_multi_once(args)
+        else:
+            elapsed, record, actions = run_once(args)
+            records = [record]
+        timings.append(elapsed)
+        for record in records:
+            for name, values in record["phases"].items():
+                phases.setdefault(name, []).append(values)
+        print(f"第 {i + 1} 次: {elapsed * 1000:8.1f} ms")
+
+    # 模擬 Launcher 本身的延遲，流程不可能比這更快
+    floor = args.window_delay + max(args.otp_delay, args.login_delay if args.credentials else 0) + args.play_delay
+    if args.accounts > 1:
+        # 同時執行數量受限時需分成多批
+        floor *= -(-args.accounts // max(1, args.concurrency))
+
+    print()
+    print(f"模擬延遲下限: {floor * 1000:8.1f} ms")
+    print(f"最小值:       {min(timings) * 1000:8.1f} ms")
+    print(f"中位數:       {statistics.median(timings) * 1000:8.1f} ms")
+    print(f"p95:          {percentile(timings, 95) * 1000:8.1f} ms")
+    print(f"額外耗時中位數: {(statistics.median(timings) - floor) * 1000:6.1f} ms")
+
+    print()
+    print("各階段中位數（耗時 / 後端呼叫次數 / 輪詢次數）:")
+    for name, values in phases.items():
+        durations, calls, polls = zip(*values)
+        print(f"  {name:18s} {percentile(durations, 50):8.1f} ms  {percentile(calls, 50):4d} 次呼叫  {percentile(polls, 50):4d} 次輪詢")
+
+    if args.verbose:
+        print()
+        print("操作記錄（最後一次）:")
+        for entry in actions:
+            print(f"  {entry}")
+
+    if args.budget_ms is not None and statistics.median(timings) * 1000 > args.budget_ms:
+        print(f"\n中位數超過預算 {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+加密後端效能測試
+量測 1 / 100 / 1000 個欄位時 protect_many / unprotect_many 的吞吐量，
+以及逐一呼叫 protect / unprotect 的耗時。Windows 上同時測試 DPAPI，其他平台只測試金鑰檔後端。
+
+用法：
+    python tools/bench_protection.py
+    python tools/bench_protection.py --sizes 1 100 1000 --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+os.environ.setdefault("LOCALAPPDATA", tempfile.mkdtemp(prefix="ff14lm-protect-"))
+
+from ff14_launcher import DPAPIProtection, KeyFileProtection, ProtectionError  # noqa: E402
+
+# 與帳號欄位長度相近的測試資料（信箱、密碼、Secret Key）
+SAMPLE_FIELDS = ["player@example.com", "correct horse battery", "GEZDGNBVGY3TQOJQGEZDGNBVGY3TQOJQ"]
+
+
+def backends() -> list[tuple[str, object]]:
+    result = [("keyfile", KeyFileProtection(Path(tempfile.mkdtemp(prefix="ff14lm-key-")) / "secret.key"))]
+    if sys.platform == "win32":
+        result.insert(0, ("dpapi", DPAPIProtection()))
+    return result
+
+
+def timed(function, runs: int) -> float:
+    """執行 runs 次，返回中位數秒數"""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FF14 Login Manager 加密後端效能測試")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000], help="每批欄位數量")
+    parser.add_argument("--runs", type=int, default=5, help="每種情境的執行次數（取中位數）")
+    args = parser.parse_args()
+
+    print(f"{'後端':<10}{'欄位數':>8}{'批次加密':>14}{'批次解密':>14}{'逐一加密':>14}{'逐一解密':>14}")
+    for name, backend in backends():
+        for size in args.sizes:
+            plaintexts = [SAMPLE_FIELDS[i % len(SAMPLE_FIELDS)] for i in range(size)]
+            try:
+                tokens = backend.protect_many(plaintexts)
+                if backend.unprotect_many(tokens) != plaintexts:
+                    print(f"{name}: 解密結果不一致")
+                    sys.exit(1)
+            except ProtectionError as e:
+                print(f"{name}: {e}")
+                sys.exit(1)
+
+            results = [
+                timed(lambda: backend.protect_many(plaintexts), args.runs),
+                timed(lambda: backend.unprotect_many(tokens), args.runs),
+                timed(lambda: [backend.protect(p) for p in plaintexts], args.runs),
+                timed(lambda: [backend.unprotect(t) for t in tokens], args.runs),
+            ]
+            columns = "".join(f"{size / seconds:>10.0f}/s  " for seconds in results)
+            print(f"{name:<10}{size:>8}  {columns}")
+
+
+if __name__ == "__main__":
+    main()
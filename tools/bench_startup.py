@@ -0,0 +1,156 @@
+"""
+啟動時間效能測試
+每次以新的 Python 行程執行 ff14_launcher.main()，以假的 webview 模組取代 pywebview
+（建立視窗、觸發 shown / loaded 事件並模擬頁面呼叫 get_config），
+讀取 startup_trace.jsonl 統計 import → 設定載入 → 建立視窗 → 頁面載入 → JS 橋接就緒 各階段的時間。
+不需要 Windows 桌面，可在無介面的 Linux 上執行。
+
+用法：
+    python tools/bench_startup.py --runs 10
+    python tools/bench_startup.py --accounts 50 --budget-ms 300   # 橋接就緒中位數超過預算時以 exit code 1 結束
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+# 避免載入模組時建立使用者真正的設定資料夾
+os.environ.setdefault("LOCALAPPDATA", tempfile.mkdtemp(prefix="ff14lm-startup-"))
+
+from ff14_launcher import StartupTrace, percentile  # noqa: E402
+
+# 子行程執行的程式：先放入假的 webview 模組，再執行 main()
+BOOTSTRAP = """
+import sys, threading, time, types
+
+page_delay = float(sys.argv[2]) / 1000
+webview = types.ModuleType("webview")
+
+
+class Event:
+    def __init__(self):
+        self.handlers = []
+
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+
+    def fire(self):
+        for handler in self.handlers:
+            handler()
+
+
+class Window:
+    def __init__(self, **params):
+        self.params = params
+        self.x = params.get("x", 0)
+        self.y = params.get("y", 0)
+        self.events = types.SimpleNamespace(shown=Event(), loaded=Event(), closing=Event())
+
+    def evaluate_js(self, script):
+        pass
+
+
+windows = []
+
+
+def create_window(**params):
+    windows.append(Window(**params))
+    return windows[-1]
+
+
+def start():
+    window = windows[0]
+    # pywebview 在其他執行緒觸發事件
+    threading.Thread(target=window.events.shown.fire, daemon=True).start()
+    time.sleep(page_delay)
+    window.events.loaded.fire()
+    # 模擬 app.js 的 loadConfig
+    api = window.params["js_api"]
+    config = api.get_config()
+    if 0 <= config["selected_account"] < len(config["accounts"]):
+        api.get_account(config["accounts"][config["selected_account"]]["id"])
+    window.events.closing.fire()
+
+
+webview.create_window = create_window
+webview.start = start
+sys.modules["webview"] = webview
+
+sys.path.insert(0, sys.argv[1])
+import ff14_launcher
+ff14_launcher.main()
+"""
+
+
+def create_config(appdata: Path, accounts: int):
+    """建立含 accounts 個帳號的設定檔（未加密，避免依賴 DPAPI）"""
+    config_dir = appdata / "FF14LoginManager"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    data = {
+        "launcher_path": "",
+        "accounts": [
+            {"id": f"{i:032x}", "name": f"帳號 {i + 1}", "email": f"user{i}@example.com",
+             "password": "password", "secret_key": "GEZDGNBVGY3TQOJQGEZDGNBVGY3TQOJQ"}
+            for i in range(accounts)
+        ],
+        "selected_account": 0 if accounts else -1,
+        "encryption_enabled": False,
+        "auto_check_update": False,  # 不在效能測試中連線
+    }
+    (config_dir / "config.json").write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    return config_dir
+
+
+def run_once(args) -> dict:
+    """以新的行程啟動一次，返回各階段的毫秒數"""
+    appdata = Path(tempfile.mkdtemp(prefix="ff14lm-startup-"))
+    config_dir = create_config(appdata, args.accounts)
+    env = {**os.environ, "LOCALAPPDATA": str(appdata), "FF14LM_STARTUP_TRACE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-c", BOOTSTRAP, str(ROOT_DIR), str(args.page_delay)],
+        env=env, capture_output=True, text=True, encoding="utf-8", timeout=60
+    )
+    trace_path = config_dir / "startup_trace.jsonl"
+    if result.returncode != 0 or not trace_path.exists():
+        raise RuntimeError(f"啟動失敗:\n{result.stdout}\n{result.stderr}")
+    lines = trace_path.read_text(encoding="utf-8").splitlines()
+    return json.loads(lines[-1])["marks"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FF14 Login Manager 啟動時間效能測試")
+    parser.add_argument("--runs", type=int, default=10, help="執行次數")
+    parser.add_argument("--accounts", type=int, default=5, help="設定檔中的帳號數量")
+    parser.add_argument("--page-delay", type=float, default=0.0, help="模擬頁面載入的耗時（毫秒）")
+    parser.add_argument("--budget-ms", type=float, default=None, help="橋接就緒中位數預算（毫秒），超過時 exit code 1")
+    args = parser.parse_args()
+
+    samples = {stage: [] for stage in StartupTrace.STAGES}
+    for _ in range(args.runs):
+        marks = run_once(args)
+        for stage in StartupTrace.STAGES:
+            samples[stage].append(marks[stage])
+
+    print(f"執行 {args.runs} 次，帳號 {args.accounts} 個，頁面載入 {args.page_delay:.0f}ms")
+    print(f"{'階段':<16}{'最小':>10}{'中位數':>10}{'p95':>10}")
+    for stage in StartupTrace.STAGES:
+        values = samples[stage]
+        print(f"{stage:<16}{min(values):>9.1f}ms{statistics.median(values):>9.1f}ms{percentile(values, 95):>9.1f}ms")
+
+    median = statistics.median(samples["bridge_ready"])
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"\n橋接就緒中位數 {median:.1f}ms 超過預算 {args.budget_ms:.0f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
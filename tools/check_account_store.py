@@ -0,0 +1,143 @@
+"""
+帳號紀錄檔檢查
+確認 AccountStore 的附加寫入、索引、刪除、中斷的最後一行、整理（compaction）、
+其他行程改寫後的 refresh，以及 ConfigManager 從舊版 config.json 搬移帳號
+（加密、刪除含明文的備份、失敗時保留原資料）與升級紀錄檔中的明文。
+
+用法：
+    python tools/check_account_store.py
+"""
+
+import json
+from pathlib import Path
+
+from harness import Checker, temp_dir  # 設定 sys.path 與 LOCALAPPDATA，須在 ff14_launcher 之前匯入
+from ff14_launcher import AccountStore, ConfigManager, KeyFileProtection, is_protected
+
+SECRET = "JBSWY3DPEHPK3PXP"
+
+
+def account(account_id: str, name: str, **fields) -> dict:
+    return {"id": account_id, "name": name, "email": "", "password": "", "secret_key": "", **fields}
+
+
+def log_lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def config_manager(config_dir: Path) -> ConfigManager:
+    return ConfigManager(config_dir, KeyFileProtection(config_dir / "secret.key"))
+
+
+def check_store(expect):
+    path = temp_dir("accounts") / "accounts.jsonl"
+    store = AccountStore(path)
+    expect(len(store) == 0 and not store.exists(), "新的紀錄檔應為空")
+
+    # 附加：每個帳號一行，依加入順序建立索引
+    store.put_many([account("a", "Alice"), account("b", " bob "), account("c", "Bob")])
+    store.put(account("d", "Dora"))
+    expect(len(log_lines(path)) == 4, f"應附加 4 行: {len(log_lines(path))}")
+    expect([store.at(i)["id"] for i in range(4)] == ["a", "b", "c", "d"] and store.at(4) is None, "列表順序錯誤")
+    expect(sorted(a["id"] for a in store.find_by_name("BOB")) == ["b", "c"], "名稱搜尋應不分大小寫並忽略空白")
+
+    # 修改維持原位置；刪除後後面的索引往前
+    store.put(account("b", "Bobby"))
+    expect(store.index_of("b") == 1 and store.get("b")["name"] == "Bobby", "修改後應維持原位置")
+    expect(store.find_by_name("bob")[0]["id"] == "c", "修改名稱後應更新名稱索引")
+    expect(store.delete("a") and not store.delete("a"), "刪除結果錯誤")
+    expect(store.index_of("d") == 2 and store.index_of("a") == -1, "刪除後索引錯誤")
+    expect(log_lines(path)[-1] == {"op": "delete", "id": "a"}, "刪除應附加一筆 delete")
+
+    # 寫到一半中斷的最後一行：讀取時略過，下次附加從新的一行開始
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op":"put","account":{"id":"x"')
+    store = AccountStore(path)
+    expect([a["id"] for a in store.all()] == ["b", "c", "d"], f"中斷的最後一行應略過: {store.all()}")
+    store.put(account("e", "Eve"))
+    expect([a["id"] for a in AccountStore(path).all()] == ["b", "c", "d", "e"], "中斷後的附加應可讀回")
+
+    # 整理：舊紀錄過多時重寫為每個帳號一行
+    for i in range(AccountStore.COMPACT_MIN_LINES):
+        store.put(account("e", f"Eve {i}"))
+    lines = log_lines(path)
+    expect(len(lines) < AccountStore.COMPACT_MIN_LINES, f"應已整理紀錄檔: {len(lines)} 行")
+    reloaded = AccountStore(path)
+    expect([a["id"] for a in reloaded.all()] == ["b", "c", "d", "e"], "整理後帳號順序錯誤")
+    expect(reloaded.get("e")["name"] == f"Eve {AccountStore.COMPACT_MIN_LINES - 1}", "整理後應保留最新內容")
+
+    # refresh：其他行程改寫後重新讀取（含列表順序）
+    other = AccountStore(path)
+    expect(store.at(0)["id"] == "b", "refresh 前的順序")
+    other.delete("b")
+    other.put(account("f", "Fay"))
+    expect(store.at(0)["id"] == "b", "refresh 前應沿用記憶體中的資料")
+    store.refresh()
+    expect([store.at(i)["id"] for i in range(4)] == ["c", "d", "e", "f"], "refresh 後列表順序應更新")
+    expect(store.index_of("b") == -1 and store.find_by_name("fay"), "refresh 後索引應更新")
+
+
+def check_migration(expect):
+    # 舊版 config.json 的明文帳號：加密後寫入紀錄檔並從設定檔移除，不留下含明文的備份
+    config_dir = temp_dir("accounts")
+    legacy = {"accounts": [{"name": "Alice", "email": "alice@example.com", "password": "pw", "secret_key": SECRET},
+                           {"name": "Bob", "secret_key": SECRET, "has_secret": True}],
+              "selected_account": 1, "encryption_enabled": True}
+    (config_dir / "config.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    manager = config_manager(config_dir)
+    expect(len(manager.accounts) == 2 and manager.get("selected_account") == 1, "搬移後帳號數或設定錯誤")
+    saved = json.loads((config_dir / "config.json").read_text(encoding="utf-8"))
+    expect("accounts" not in saved, "搬移後 config.json 不應再有帳號")
+    expect(not (config_dir / "config.json.bak").exists(), "搬移成功後應刪除含明文的 config.json.bak")
+    raw = (config_dir / "accounts.jsonl").read_text(encoding="utf-8")
+    expect(SECRET not in raw and "alice@example.com" not in raw, "紀錄檔不應含明文")
+    expect(all("has_secret" not in e["account"] for e in log_lines(config_dir / "accounts.jsonl")), "應移除 has_* 欄位")
+    alice = manager.get_account(0)
+    expect(alice["email"] == "alice@example.com" and alice["secret_key"] == SECRET, f"解密結果錯誤: {alice}")
+
+    # 寫入紀錄檔失敗：config.json 的帳號保持不動，下次再試
+    config_dir = temp_dir("accounts")
+    (config_dir / "config.json").write_text(json.dumps(legacy), encoding="utf-8")
+    (config_dir / "accounts.jsonl").mkdir()
+    manager = config_manager(config_dir)
+    manager.config
+    saved = json.loads((config_dir / "config.json").read_text(encoding="utf-8"))
+    expect(saved.get("accounts") == legacy["accounts"], "搬移失敗時 config.json 應保留帳號")
+    expect(not (config_dir / "config.json.bak").exists(), "搬移失敗時也不應留下備份")
+
+    (config_dir / "accounts.jsonl").rmdir()
+    manager = config_manager(config_dir)
+    expect(len(manager.accounts) == 2, "下次啟動應重新搬移")
+
+    # 舊版本搬移後留下的備份：紀錄檔已有帳號時刪除
+    (config_dir / "config.json.bak").write_text(json.dumps(legacy), encoding="utf-8")
+    manager = config_manager(config_dir)
+    manager.config
+    expect(not (config_dir / "config.json.bak").exists(), "應刪除舊版本留下的 config.json.bak")
+
+    # 紀錄檔中的明文（例如加密失敗後留下）：加密後重寫，不留下含明文的舊紀錄
+    config_dir = temp_dir("accounts")
+    (config_dir / "config.json").write_text(json.dumps({"encryption_enabled": True}), encoding="utf-8")
+    store = AccountStore(config_dir / "accounts.jsonl")
+    store.put(account("a", "Alice", secret_key=SECRET))
+    store.put(account("a", "Alice", secret_key=SECRET, email="alice@example.com"))
+    manager = config_manager(config_dir)
+    expect(len(manager.accounts) == 1, "升級後帳號數錯誤")
+    lines = log_lines(config_dir / "accounts.jsonl")
+    expect(len(lines) == 1 and is_protected(lines[0]["account"]["secret_key"]), f"升級後應重寫為密文: {lines}")
+    expect(manager.get_account(0)["email"] == "alice@example.com", "升級後解密結果錯誤")
+
+
+def main():
+    check = Checker()
+    expect = check.expect
+
+    check_store(expect)
+    check_migration(expect)
+
+    check.report("帳號紀錄檔檢查")
+
+
+if __name__ == "__main__":
+    main()
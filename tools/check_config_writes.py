@@ -0,0 +1,130 @@
+"""
+設定檔寫入檢查
+確認 ConfigManager 的延遲寫入：連續修改只在最後一次修改後 SAVE_DELAY 秒寫入一次、
+沒有變更時不寫入、flush 立即寫入且不重複寫入、寫入後不留下暫存檔，
+其他行程改寫設定檔後 reload_if_changed 與寫入時以 key 合併（本行程尚未寫入的 key 優先），
+以及 get / set 複製 list / dict 值，就地修改不會繞過變更偵測。
+
+用法：
+    python tools/check_config_writes.py
+"""
+
+import json
+import time
+from pathlib import Path
+
+from harness import Checker, temp_dir  # 設定 sys.path 與 LOCALAPPDATA，須在 ff14_launcher 之前匯入
+from ff14_launcher import ConfigManager, KeyFileProtection
+
+SAVE_DELAY = 0.1
+
+
+def create_manager(config_dir: Path) -> tuple[ConfigManager, list]:
+    """建立縮短延遲的 ConfigManager，返回 (manager, 每次寫入的時間)"""
+    manager = ConfigManager(config_dir, KeyFileProtection(config_dir / "secret.key"))
+    manager.SAVE_DELAY = SAVE_DELAY
+    saves = []
+    original_save = manager.save
+
+    def counting_save():
+        saves.append(time.monotonic())
+        original_save()
+
+    manager.save = counting_save
+    manager.config
+    return manager, saves
+
+
+def read_config(config_dir: Path) -> dict:
+    return json.loads((config_dir / "config.json").read_text(encoding="utf-8"))
+
+
+def main():
+    check = Checker()
+    expect = check.expect
+
+    config_dir = temp_dir("config")
+    manager, saves = create_manager(config_dir)
+
+    # 連續修改合併成一次寫入，內容為最後的值
+    start = time.monotonic()
+    for i in range(50):
+        manager.set("window_x", i)
+    manager.update({"window_y": 7, "accounts": [{"name": "不應寫入"}]})
+    time.sleep(SAVE_DELAY * 4)
+    expect(len(saves) == 1, f"連續修改應只寫入一次: {len(saves)} 次")
+    expect(saves and saves[0] - start >= SAVE_DELAY, "應等到 SAVE_DELAY 後才寫入")
+    saved = read_config(config_dir)
+    expect(saved.get("window_x") == 49 and saved.get("window_y") == 7, f"寫入內容錯誤: {saved}")
+    expect("accounts" not in saved, "update 不應把帳號寫入設定檔")
+    expect(not (config_dir / "config.json.tmp").exists(), "不應留下暫存檔")
+
+    # 沒有變更時不寫入
+    manager.set("window_x", 49)
+    time.sleep(SAVE_DELAY * 3)
+    expect(len(saves) == 1, f"值沒有改變時不應寫入: {len(saves)} 次")
+
+    # 間隔短於 SAVE_DELAY 的修改持續延後寫入，最後只寫入一次
+    saves.clear()
+    start = time.monotonic()
+    for i in range(5):
+        manager.set("step_settle_ms", 100 + i)
+        time.sleep(SAVE_DELAY / 2)
+    time.sleep(SAVE_DELAY * 3)
+    expect(len(saves) == 1, f"持續修改應只寫入一次: {len(saves)} 次")
+    expect(saves and saves[0] - start >= SAVE_DELAY * 2.5, "持續修改期間不應寫入")
+    expect(read_config(config_dir).get("step_settle_ms") == 104, "應寫入最後的值")
+
+    # flush：立即寫入，之後背景執行緒不再重複寫入
+    saves.clear()
+    manager.set("window_x", 1)
+    manager.flush()
+    expect(len(saves) == 1 and read_config(config_dir).get("window_x") == 1, "flush 應立即寫入")
+    time.sleep(SAVE_DELAY * 3)
+    expect(len(saves) == 1, f"flush 後不應重複寫入: {len(saves)} 次")
+
+    # 其他行程改寫設定檔：重新讀取；尚未寫入的修改優先
+    other = ConfigManager(config_dir, KeyFileProtection(config_dir / "secret.key"))
+    other.set("window_x", 500)
+    other.flush()
+    manager.reload_if_changed()
+    expect(manager.get("window_x") == 500, f"應讀取其他行程寫入的值: {manager.get('window_x')}")
+    manager.set("window_y", 8)
+    other.set("window_y", 600)
+    other.set("brightness", 70)
+    other.flush()
+    manager.reload_if_changed()
+    expect(manager.get("window_y") == 8, "尚未寫入的修改不應被覆蓋")
+    expect(manager.get("brightness") == 70, "其他 key 應讀取其他行程寫入的值")
+    manager.flush()
+    saved = read_config(config_dir)
+    expect(saved.get("window_y") == 8 and saved.get("brightness") == 70, f"flush 後應寫入本行程的修改: {saved}")
+
+    # 寫入前其他行程改寫了設定檔：只覆寫本行程修改過的 key
+    manager.set("window_x", 9)
+    other.reload_if_changed()
+    other.set("theme", "other-theme")
+    other.flush()
+    manager.flush()
+    saved = read_config(config_dir)
+    expect(saved.get("window_x") == 9 and saved.get("theme") == "other-theme",
+           f"寫入時應保留其他行程修改的 key: {saved}")
+
+    # 就地修改取得的值不影響設定，修改後 set 回來才視為變更並寫入
+    saves.clear()
+    manager.set("recent", [1])
+    manager.flush()
+    recent = manager.get("recent")
+    recent.append(2)
+    expect(manager.get("recent") == [1], "get 返回的值應為複本")
+    manager.set("recent", recent)
+    recent.append(3)
+    expect(manager.get("recent") == [1, 2], "set 應保存值的複本")
+    manager.flush()
+    expect(len(saves) == 2 and read_config(config_dir).get("recent") == [1, 2], f"就地修改後 set 應寫入: {len(saves)} 次")
+
+    check.report("設定檔寫入檢查")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+樣式表檢查
+web/tailwind.css 是手動維護的樣式表（沿用 Tailwind v3 的 class 名稱，不經過 Tailwind 編譯），只寫入用到的 class。
+此工具列出 index.html / app.js 使用、但 tailwind.css 與 style.css 都沒有定義的 class，
+以及 tailwind.css 中已經沒有被使用的 class。
+
+用法：
+    python tools/check_css.py
+"""
+
+import re
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+WEB_DIR = ROOT_DIR / "web"
+
+# 只給 JS 選取元素用、不需要樣式的 class
+HOOK_CLASSES = {"group", "multi-launch-check", "multi-launch-status", "tab-content"}
+
+
+def used_classes() -> set[str]:
+    """index.html 與 app.js 中出現的 class"""
+    html = (WEB_DIR / "index.html").read_text(encoding="utf-8")
+    js = (WEB_DIR / "app.js").read_text(encoding="utf-8")
+    classes = set()
+    for match in re.finditer(r'class="([^"]*)"', html + js):
+        classes.update(match.group(1).split())
+    for match in re.finditer(r"className\s*=\s*[`'\"]([^`'\"]*)", js):
+        classes.update(match.group(1).split())
+    for match in re.finditer(r"classList\.(?:add|remove|toggle|contains)\(([^)]*)\)", js):
+        classes.update(re.findall(r"'([^']*)'", match.group(1)))
+    return {name for name in classes if "$" not in name}
+
+
+def defined_classes(path: Path) -> set[str]:
+    """樣式表中出現在選擇器內的 class（處理 Tailwind 的跳脫字元）"""
+    css = re.sub(r"/\*.*?\*/", "", path.read_text(encoding="utf-8"), flags=re.S)
+    classes = set()
+    for selector in re.findall(r"([^{}]+)\{", css):
+        for name in re.findall(r"\.((?:\\.|[\w-])+)", selector):
+            classes.add(re.sub(r"\\(.)", r"\1", name))
+    return classes
+
+
+def main():
+    used = used_classes()
+    tailwind = defined_classes(WEB_DIR / "tailwind.css")
+    custom = defined_classes(WEB_DIR / "style.css")
+
+    missing = sorted(used - tailwind - custom - HOOK_CLASSES)
+    unused = sorted(tailwind - used)
+
+    for name in missing:
+        print(f"未定義: {name}")
+    for name in unused:
+        print(f"未使用: {name}")
+
+    if missing or unused:
+        print(f"\n{len(missing)} 個 class 未定義，{len(unused)} 個 class 未使用")
+        sys.exit(1)
+    print(f"全部 {len(used)} 個 class 都有定義，tailwind.css 共 {len(tailwind)} 個 class")
+
+
+if __name__ == "__main__":
+    main()
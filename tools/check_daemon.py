@@ -0,0 +1,158 @@
+"""
+背景服務往返檢查
+在暫存設定資料夾啟動 LauncherDaemon（Unix socket），以 DaemonClient 實際連線，確認：
+未執行時的 available、ping / status / accounts / otp 的回覆、找不到帳號與未知請求的結束代碼、launch 的進度訊息與結果
+（以模擬 Launcher 執行完整流程）、處理請求時發生例外仍回覆錯誤並繼續服務、錯誤的驗證金鑰、
+其他行程改寫帳號後重新讀取、重複啟動，以及 shutdown。不需要 Windows，可在 Linux 上執行。
+
+用法：
+    python tools/check_daemon.py
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from harness import Checker, temp_dir  # 設定 sys.path 與 LOCALAPPDATA，須在 ff14_launcher 之前匯入
+from ff14_launcher import (
+    EXIT_ACCOUNT, EXIT_FAILED, EXIT_USAGE, ConfigManager, DaemonClient, DaemonError, DaemonUnavailable,
+    KeyFileProtection, LauncherAutomation, LauncherDaemon, daemon_address, otp_cache
+)
+from sim_launcher import SimulatedBackend, SimulatedLauncher
+
+# RFC 6238 測試用 Secret
+SECRET_KEY = "GEZDGNBVGY3TQOJQGEZDGNBVGY3TQOJQ"
+
+
+def create_config(config_dir: Path) -> ConfigManager:
+    launcher_exe = config_dir / "ffxivboot.exe"
+    launcher_exe.write_bytes(b"")
+    config = ConfigManager(config_dir, KeyFileProtection(config_dir / "secret.key"))
+    config.config.update({
+        "launcher_path": str(launcher_exe),
+        "auto_launch": True,
+        "auto_input_credentials": False,
+        "auto_input_otp": True,
+        "auto_press_enter": True,
+        "auto_click_play": True,
+    })
+    config.save()
+    config.add_account({"name": "Alice", "secret_key": SECRET_KEY})
+    return config
+
+
+def wait_until_ready(client: DaemonClient, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return client.request("ping")
+        except DaemonUnavailable:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def main():
+    if daemon_address(Path("."))[1] != "AF_UNIX":
+        print("此檢查使用 Unix socket，請在 Linux / macOS 上執行")
+        sys.exit(0)
+
+    check = Checker()
+    expect = check.expect
+
+    config_dir = temp_dir("daemon")
+    config = create_config(config_dir)
+    expect(not DaemonClient(config_dir).available(), "尚未啟動背景服務時 available 應為 False")
+
+    backend = SimulatedBackend(SimulatedLauncher(window_delay=0.1, otp_delay=0.05, play_delay=0.1), decoy_windows=3)
+    daemon = LauncherDaemon(config, LauncherAutomation(config, backend))
+    server = threading.Thread(target=daemon.serve_forever, daemon=True)
+    server.start()
+
+    client = DaemonClient(config_dir)
+    reply = wait_until_ready(client)
+    expect(reply.get("success") and reply.get("pid") == os.getpid(), f"ping: {reply}")
+    expect(oct(os.stat(daemon.address).st_mode & 0o777) == "0o600", "socket 權限應為 0600")
+    expect(oct(os.stat(config_dir / "daemon.key").st_mode & 0o777) == "0o600", "daemon.key 權限應為 0600")
+    expect(client.available(), "背景服務執行中時 available 應為 True")
+
+    reply = client.request("status")
+    expect(reply.get("accounts") == 1 and reply.get("running") is False, f"status: {reply}")
+
+    reply = client.request("accounts")
+    expect([a["name"] for a in reply.get("accounts", [])] == ["Alice"], f"accounts: {reply}")
+    expect(all("secret_key" not in a for a in reply.get("accounts", [])), "accounts 不應包含 Secret Key")
+
+    # 請求前後各算一次，跨過時間區間時兩者之一相符
+    before = otp_cache.get(SECRET_KEY)["otp"]
+    reply = client.request("otp", account="alice")
+    after = otp_cache.get(SECRET_KEY)["otp"]
+    expect(reply.get("success") and reply.get("otp") in (before, after), f"otp: {reply}")
+
+    reply = client.request("otp", account="nobody")
+    expect(not reply.get("success") and reply.get("exit_code") == EXIT_ACCOUNT, f"找不到帳號: {reply}")
+    reply = client.request("reboot")
+    expect(not reply.get("success") and reply.get("exit_code") == EXIT_USAGE, f"未知請求: {reply}")
+
+    # launch：先逐筆送出進度，最後送出結果
+    events = []
+    reply = client.request("launch", on_event=events.append, account="Alice")
+    expect(reply.get("success") and reply.get("exit_code") == 0, f"launch: {reply}")
+    expect(events and all(e.get("event") == "status" for e in events), f"launch 進度訊息: {events}")
+    expect(backend.launcher.played.is_set(), "模擬 Launcher 應已按下 PLAY")
+    expect(client.request("status").get("launches") == 1, "launch 次數應為 1")
+
+    # 處理請求時發生例外：回覆錯誤，背景服務繼續執行
+    original = daemon.do_status
+    daemon.do_status = lambda request, send: 1 / 0
+    try:
+        reply = client.request("status")
+    finally:
+        daemon.do_status = original
+    expect(not reply.get("success") and reply.get("exit_code") == EXIT_FAILED and "division" in reply.get("error", ""),
+           f"例外應回覆錯誤: {reply}")
+    expect(client.request("ping").get("success"), "發生例外後應繼續服務")
+
+    # 錯誤的驗證金鑰：無法連線，背景服務不受影響
+    from multiprocessing.connection import AuthenticationError, Client
+    try:
+        Client(daemon.address, family="AF_UNIX", authkey=b"wrong key").close()
+        check.fail("錯誤的驗證金鑰不應能連線")
+    except (AuthenticationError, EOFError, OSError):
+        pass
+    expect(client.request("ping").get("success"), "驗證失敗後應繼續服務")
+
+    # 其他行程（例如視窗介面）新增帳號後重新讀取
+    other = ConfigManager(config_dir, KeyFileProtection(config_dir / "secret.key"))
+    other.add_account({"name": "Bob", "secret_key": SECRET_KEY})
+    reply = client.request("accounts")
+    expect([a["name"] for a in reply.get("accounts", [])] == ["Alice", "Bob"], f"重新讀取帳號: {reply}")
+
+    # 已有背景服務時不能再啟動第二個
+    try:
+        LauncherDaemon(config, LauncherAutomation(config, backend)).serve_forever()
+        check.fail("重複啟動應拋出 DaemonError")
+    except DaemonUnavailable:
+        check.fail("重複啟動時應偵測到執行中的背景服務")
+    except DaemonError:
+        pass
+
+    # shutdown
+    reply = client.request("shutdown")
+    expect(reply.get("success"), f"shutdown: {reply}")
+    server.join(5)
+    expect(not server.is_alive(), "shutdown 後背景服務應停止")
+    try:
+        client.request("ping")
+        check.fail("shutdown 後不應能連線")
+    except DaemonUnavailable:
+        pass
+    expect(not client.available(), "shutdown 後 available 應為 False")
+
+    check.report("背景服務往返檢查")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Google Authenticator 匯出資料解析檢查
+自行編碼 otpauth-migration:// 的 protobuf 內容，確認多位元組 varint（長名稱、大型 batch_id）、
+大量帳號、分批匯出與缺少的批次、重複與不支援的帳號、未知欄位、截斷資料與各種 base64 寫法都能正確處理。
+
+用法：
+    python tools/check_migration.py
+"""
+
+import base64
+from urllib.parse import quote
+
+from harness import Checker  # 設定 sys.path 與 LOCALAPPDATA，須在 ff14_launcher 之前匯入
+from ff14_launcher import decode_otp_urls, parse_migration_payload, parse_otp_url, read_varint
+
+
+# ---- protobuf 編碼 ----
+
+def varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def field_varint(number: int, value: int) -> bytes:
+    return varint(number << 3) + varint(value)
+
+
+def field_bytes(number: int, value: bytes) -> bytes:
+    return varint(number << 3 | 2) + varint(len(value)) + value
+
+
+def otp_parameters(secret: bytes, name: str, issuer: str = "", algorithm: int = 1, digits: int = 1,
+                   otp_type: int = 2) -> bytes:
+    return (field_bytes(1, secret) + field_bytes(2, name.encode()) + field_bytes(3, issuer.encode())
+            + field_varint(4, algorithm) + field_varint(5, digits) + field_varint(6, otp_type))
+
+
+def payload(accounts: list[bytes], batch_size: int = 1, batch_index: int = 0, batch_id: int = 0) -> bytes:
+    data = b"".join(field_bytes(1, account) for account in accounts)
+    data += field_varint(2, 1) + field_varint(3, batch_size) + field_varint(4, batch_index) + field_varint(5, batch_id)
+    return data
+
+
+def migration_url(data: bytes, style: str = "quoted") -> str:
+    encoded = base64.b64encode(data).decode("ascii")
+    if style == "quoted":
+        encoded = quote(encoded, safe="")
+    elif style == "urlsafe":
+        encoded = base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+    return f"otpauth-migration://offline?data={encoded}"
+
+
+def secret(i: int) -> bytes:
+    return bytes((i * 7 + j) % 256 for j in range(20))
+
+
+def b32(data: bytes) -> str:
+    return base64.b32encode(data).decode("ascii").rstrip("=")
+
+
+# ---- 檢查 ----
+
+def main():
+    check = Checker()
+    expect = check.expect
+
+    # varint：單一與多位元組、64 位元上限、過長與截斷
+    for value in (0, 1, 127, 128, 300, 16383, 16384, 2 ** 32, 2 ** 64 - 1):
+        decoded, pos = read_varint(varint(value) + b"\xff", 0)
+        expect(decoded == value and pos == len(varint(value)), f"varint {value}: {decoded} @ {pos}")
+    for name, data in (("過長", b"\xff" * 10 + b"\x01"), ("截斷", b"\x80\x80")):
+        try:
+            read_varint(data, 0)
+            check.fail(f"varint {name}: 應拋出 ValueError")
+        except ValueError:
+            pass
+
+    # 長名稱（長度需要兩個位元組的 varint）、大型 batch_id、未知的固定長度欄位
+    long_name = "測試帳號" * 20 + "@example.com"
+    account = otp_parameters(secret(1), long_name, "Square Enix")
+    account += bytes([7 << 3 | 5]) + b"\0\0\0\0" + bytes([8 << 3 | 1]) + bytes(8)
+    result = parse_migration_payload(payload([account], batch_size=2, batch_index=1, batch_id=1234567890))
+    expect(len(result.accounts) == 1 and result.accounts[0].name == long_name, "長名稱解析錯誤")
+    expect(result.accounts[0].secret == b32(secret(1)) and result.accounts[0].supported, f"帳號內容: {result.accounts}")
+    expect((result.batch_size, result.batch_index, result.batch_id) == (2, 1, 1234567890),
+           f"批次欄位: {result.batch_size} {result.batch_index} {result.batch_id}")
+
+    # 大量帳號：一張 QR Code 內 150 組
+    many = [otp_parameters(secret(i), f"user{i}@example.com", "FF14") for i in range(150)]
+    result = parse_migration_payload(payload(many))
+    expect(len(result.accounts) == 150 and result.accounts[149].name == "user149@example.com",
+           f"大量帳號: {len(result.accounts)} 組")
+
+    # 各種 base64 寫法（URL 編碼、未編碼的 +、URL-safe）
+    data = payload([otp_parameters(bytes([0xfb, 0xff, 0xfe] * 7), "plus/slash")])
+    for style in ("quoted", "raw", "urlsafe"):
+        try:
+            accounts = parse_otp_url(migration_url(data, style)).accounts
+            expect(accounts and accounts[0].name == "plus/slash", f"base64 {style}: {accounts}")
+        except ValueError as e:
+            check.fail(f"base64 {style}: {e}")
+
+    # 截斷的資料
+    try:
+        parse_migration_payload(payload(many[:3])[:-40])
+        check.fail("截斷的資料應拋出 ValueError")
+    except ValueError:
+        pass
+
+    # 分批匯出：合併、去除重複、不支援的類型與缺少的批次
+    batch_id = 2 ** 31 + 5
+    urls = [
+        migration_url(payload([otp_parameters(secret(1), "a"), otp_parameters(secret(2), "b")], 3, 0, batch_id)),
+        migration_url(payload([otp_parameters(secret(2), "b"), otp_parameters(secret(3), "hotp", otp_type=1),
+                               otp_parameters(secret(4), "sha256", algorithm=2),
+                               otp_parameters(secret(5), "eight", digits=2)], 3, 2, batch_id)),
+        "otpauth://totp/Square%20Enix:c@example.com?secret=" + b32(secret(6)) + "&issuer=Square%20Enix",
+        "not a qr code",
+    ]
+    accounts, warnings = decode_otp_urls(urls)
+    expect([a.name for a in accounts] == ["a", "b", "c@example.com"], f"合併結果: {[a.name for a in accounts]}")
+    expect(accounts[2].issuer == "Square Enix", f"otpauth issuer: {accounts[2].issuer!r}")
+    expect(sum("不支援的 OTP 類型" in w for w in warnings) == 3, f"不支援的帳號警告: {warnings}")
+    expect(any("共 3 張" in w and "缺少第 2 張" in w for w in warnings), f"缺少批次警告: {warnings}")
+    expect(any(w.startswith("第 4 張 QR Code") for w in warnings), f"無法解析的內容警告: {warnings}")
+
+    check.report("匯出資料解析檢查")
+
+
+if __name__ == "__main__":
+    main()
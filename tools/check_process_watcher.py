@@ -0,0 +1,102 @@
+"""
+背景行程監看檢查
+以 FakeProcessSource 驅動 ProcessWatcher，確認群組比對、啟動與結束的狀態回呼、PID 被其他行程重複使用、
+更改監看名稱後重新比對，以及背景執行緒的更新；另以假的 /proc 目錄確認 ProcFSProcessSource
+使用 cmdline 中完整的執行檔名稱（comm 只有 15 個字元）。不需要 Windows，可在 Linux 上執行。
+
+用法：
+    python tools/check_process_watcher.py
+"""
+
+import time
+from pathlib import Path
+
+from harness import Checker, temp_dir  # 設定 sys.path 與 LOCALAPPDATA，須在 ff14_launcher 之前匯入
+from ff14_launcher import (
+    GAME_EXECUTABLES, LAUNCHER_EXECUTABLES, FakeProcessSource, ProcessWatcher, ProcFSProcessSource
+)
+
+
+def fake_proc(root: Path, pid: int, cmdline: bytes, comm: str):
+    entry = root / str(pid)
+    entry.mkdir()
+    (entry / "cmdline").write_bytes(cmdline)
+    (entry / "comm").write_text(comm + "\n", encoding="utf-8")
+
+
+def main():
+    check = Checker()
+    expect = check.expect
+
+    source = FakeProcessSource({1: "explorer.exe"})
+    watcher = ProcessWatcher(source, interval=0.05)
+    watcher.watch("game", GAME_EXECUTABLES)
+    watcher.watch("launcher", LAUNCHER_EXECUTABLES)
+    events = []
+    watcher.add_listener(lambda group, running: events.append((group, running)))
+
+    watcher.refresh()
+    expect(not watcher.is_running("launcher") and not events, "沒有相符的行程時不應執行中")
+
+    # 啟動與結束
+    source.start(10, "ffxivboot.exe")
+    source.start(11, "FFXIVLauncher64.exe")
+    watcher.refresh()
+    expect(watcher.pids("launcher") == {10, 11}, f"Launcher 行程: {watcher.pids('launcher')}")
+    expect(events == [("launcher", True)], f"由無到有應只回呼一次: {events}")
+
+    source.exit(10)
+    watcher.refresh()
+    expect(watcher.pids("launcher") == {11} and events == [("launcher", True)], "仍有行程時不應回呼")
+    source.exit(11)
+    watcher.refresh()
+    expect(not watcher.is_running("launcher") and events[-1] == ("launcher", False), f"全部結束應回呼: {events}")
+
+    # PID 被其他行程重複使用：視為舊行程結束、新行程開始
+    source.start(20, "ffxiv_dx11.exe")
+    watcher.refresh()
+    expect(watcher.pids("game") == {20}, "遊戲行程應執行中")
+    source.processes[20] = "notepad.exe"
+    watcher.refresh()
+    expect(not watcher.is_running("game") and events[-1] == ("game", False), f"PID 重複使用後應結束: {events}")
+    source.processes[20] = "ffxivboot.exe"
+    watcher.refresh()
+    expect(watcher.pids("launcher") == {20}, "PID 重複使用為 Launcher 時應加入 Launcher 群組")
+
+    # 更改監看名稱：依目前快照重新比對
+    source.start(30, "mylauncher.exe")
+    watcher.refresh()
+    watcher.watch("launcher", LAUNCHER_EXECUTABLES + ("MyLauncher.exe",))
+    expect(watcher.pids("launcher") == {20, 30}, f"更改名稱後應重新比對: {watcher.pids('launcher')}")
+
+    # 背景執行緒：start() 先同步取一次快照，之後定期更新
+    source = FakeProcessSource({40: "ffxiv.exe"})
+    watcher = ProcessWatcher(source, interval=0.05)
+    watcher.watch("game", GAME_EXECUTABLES)
+    watcher.start()
+    expect(watcher.is_running("game"), "start() 後應立即有結果")
+    source.exit(40)
+    deadline = time.monotonic() + 2
+    while watcher.is_running("game") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    watcher.stop()
+    expect(not watcher.is_running("game"), "背景執行緒應更新行程狀態")
+    expect(source.snapshots >= 2, f"背景執行緒應定期取快照: {source.snapshots} 次")
+
+    # ProcFSProcessSource：cmdline 的檔名（含 Wine 的 Windows 路徑），cmdline 為空時才用 comm
+    root = temp_dir("proc")
+    fake_proc(root, 100, b"C:\\Program Files\\SquareEnix\\FFXIVLauncher64.exe\0--lang=zh\0", "FFXIVLauncher64")
+    fake_proc(root, 101, b"/usr/bin/python3\0script.py\0", "python3")
+    fake_proc(root, 102, b"", "kworker/0:1")
+    (root / "self").mkdir()
+    snapshot = ProcFSProcessSource(str(root)).snapshot()
+    expect(snapshot.get(100) == "ffxivlauncher64.exe", f"Wine 路徑應取完整檔名: {snapshot.get(100)!r}")
+    expect(snapshot.get(101) == "python3", f"Linux 路徑: {snapshot.get(101)!r}")
+    expect(snapshot.get(102) == "kworker/0:1", f"cmdline 為空時應使用 comm: {snapshot.get(102)!r}")
+    expect(set(snapshot) == {100, 101, 102}, f"只列出數字目錄: {sorted(snapshot)}")
+
+    check.report("行程監看檢查")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+捷徑解析檢查
+在暫存資料夾產生各種 .lnk 範例檔（ANSI / Unicode LinkInfo、網路路徑、相對路徑、
+環境變數與 Darwin 額外資料區塊、損毀的檔案），確認 parse_shell_link 與 resolve_shortcut 的結果、
+找不到目標時改用 COM 的備援、launch_game 帶入捷徑的參數與開始位置，
+以及依捷徑檔修改時間快取的行為。不需要 Windows，可在 Linux 上執行。
+
+用法：
+    python tools/check_shortcuts.py
+"""
+
+import os
+import struct
+import sys
+import time
+
+from harness import Checker, temp_dir  # 設定 sys.path 與 LOCALAPPDATA，須在 ff14_launcher 之前匯入
+import ff14_launcher
+from ff14_launcher import (
+    DARWIN_BLOCK_SIGNATURE, ENVIRONMENT_BLOCK_SIGNATURE, SHELL_LINK_CLSID, AutomationBackend, LauncherAutomation,
+    ShellLink, parse_shell_link, resolve_shortcut, resolve_shortcut_link
+)
+
+
+# ---- 產生範例捷徑檔 ----
+
+def c_string(value: str, unicode: bool) -> bytes:
+    return value.encode("utf-16-le") + b"\0\0" if unicode else value.encode("ascii") + b"\0"
+
+
+def link_info(local_path: str = None, network: str = None, suffix: str = "", unicode: bool = False) -> bytes:
+    """LinkInfo 結構；unicode 為 True 時使用 0x24 的標頭並附加 Unicode 路徑"""
+    header_size = 0x24 if unicode else 0x1C
+    body = b""
+    flags = volume_offset = base_offset = network_offset = 0
+    base_offset_unicode = suffix_offset_unicode = 0
+
+    if local_path is not None:
+        flags |= 0x1
+        volume_offset = header_size
+        body += struct.pack("<IIII", 0x10, 3, 0x12345678, 0x10)  # VolumeID，無標籤
+        base_offset = header_size + len(body)
+        body += c_string(local_path if not unicode else "?", False)
+    if network is not None:
+        flags |= 0x2
+        network_offset = header_size + len(body)
+        net_name = c_string(network, False)
+        block = struct.pack("<IIIII", 0x14 + len(net_name), 0, 0x14, 0, 0) + net_name
+        body += block
+    suffix_offset = header_size + len(body)
+    body += c_string(suffix if not unicode else "", False)
+    if unicode:
+        if local_path is not None:
+            base_offset_unicode = header_size + len(body)
+            body += c_string(local_path, True)
+        suffix_offset_unicode = header_size + len(body)
+        body += c_string(suffix, True)
+
+    header = struct.pack("<IIIIIII", header_size + len(body), header_size, flags, volume_offset,
+                         base_offset, network_offset, suffix_offset)
+    if unicode:
+        header += struct.pack("<II", base_offset_unicode, suffix_offset_unicode)
+    return header + body
+
+
+def data_block(signature: int, value: str) -> bytes:
+    """環境變數 / Darwin 區塊：ANSI 260 bytes + Unicode 520 bytes"""
+    ansi = value.encode("ascii", errors="replace")[:259].ljust(260, b"\0")
+    wide = value.encode("utf-16-le")[:518].ljust(520, b"\0")
+    return struct.pack("<II", 0x314, signature) + ansi + wide
+
+
+def shell_link(info: bytes = None, relative_path: str = None, working_dir: str = None, arguments: str = None,
+               blocks: list[bytes] = (), id_list: bool = True, unicode: bool = True) -> bytes:
+    flags = 0x80 if unicode else 0
+    sections = b""
+    if id_list:
+        flags |= 0x1
+        item = b"\x14\x00\x1f\x50" + bytes(16)  # 一個 Shell 項目（內容不影響解析）
+        sections += struct.pack("<H", len(item) + 2) + item + b"\0\0"
+    if info is not None:
+        flags |= 0x2
+        sections += info
+    for flag, value in ((0x8, relative_path), (0x10, working_dir), (0x20, arguments)):
+        if value is not None:
+            flags |= flag
+            sections += struct.pack("<H", len(value)) + (value.encode("utf-16-le") if unicode else value.encode("ascii"))
+    header = struct.pack("<I", 0x4C) + SHELL_LINK_CLSID + struct.pack("<II", flags, 0x20) + bytes(0x4C - 28)
+    return header + sections + b"".join(blocks) + struct.pack("<I", 0)
+
+
+# ---- 檢查 ----
+
+def main():
+    check = Checker()
+    expect = check.expect
+
+    work_dir = temp_dir("lnk")
+    target = work_dir / "sub" / "ffxivboot.exe"
+    target.parent.mkdir()
+    target.write_bytes(b"")
+
+    # 解析各種格式
+    link = parse_shell_link(shell_link(
+        link_info(local_path=r"C:\Program Files\FF14\ffxivboot.exe"),
+        relative_path=r".\sub\ffxivboot.exe", working_dir=r"C:\Program Files\FF14", arguments="-fast",
+    ))
+    expect(link.local_path == r"C:\Program Files\FF14\ffxivboot.exe", f"ANSI LinkInfo: {link.local_path!r}")
+    expect(link.relative_path == r".\sub\ffxivboot.exe", f"相對路徑: {link.relative_path!r}")
+    expect(link.working_dir == r"C:\Program Files\FF14" and link.arguments == "-fast", f"字串區段: {link}")
+
+    link = parse_shell_link(shell_link(link_info(local_path=r"D:\遊戲\最終幻想XIV\ffxivboot.exe", unicode=True)))
+    expect(link.local_path == r"D:\遊戲\最終幻想XIV\ffxivboot.exe", f"Unicode LinkInfo: {link.local_path!r}")
+
+    link = parse_shell_link(shell_link(link_info(network=r"\\server\games", suffix=r"FF14\ffxivboot.exe"), id_list=False))
+    expect(link.local_path == r"\\server\games\FF14\ffxivboot.exe", f"網路路徑: {link.local_path!r}")
+
+    link = parse_shell_link(shell_link(relative_path=r"..\boot.exe", unicode=False, id_list=False))
+    expect(link.relative_path == r"..\boot.exe", f"ANSI 字串區段: {link.relative_path!r}")
+
+    link = parse_shell_link(shell_link(blocks=[
+        data_block(ENVIRONMENT_BLOCK_SIGNATURE, r"%ProgramFiles%\FF14\ffxivboot.exe"),
+        data_block(DARWIN_BLOCK_SIGNATURE, "w_1^VX!!!!!!!!!MKKSkFF14>M5KDYSUnf(HA*L[xeX)"),
+    ]))
+    expect(link.environment_path == r"%ProgramFiles%\FF14\ffxivboot.exe", f"環境變數區塊: {link.environment_path!r}")
+    expect(link.darwin_id.startswith("w_1^VX"), f"Darwin 區塊: {link.darwin_id!r}")
+
+    for name, data in (("空檔案", b""), ("截斷", shell_link(link_info(local_path=r"C:\a.exe"))[:90]),
+                       ("錯誤 CLSID", b"\x4c\0\0\0" + bytes(80))):
+        try:
+            parse_shell_link(data)
+            check.fail(f"{name}: 應拋出 ValueError")
+        except ValueError:
+            pass
+
+    # resolve_shortcut：環境變數 → LinkInfo → 相對路徑，返回第一個存在的路徑
+    os.environ["FF14LM_SHORTCUT_DIR"] = str(target.parent)
+    lnk = work_dir / "env.lnk"
+    lnk.write_bytes(shell_link(
+        link_info(local_path=r"C:\missing\ffxivboot.exe"),
+        blocks=[data_block(ENVIRONMENT_BLOCK_SIGNATURE, f"%FF14LM_SHORTCUT_DIR%{os.sep}ffxivboot.exe")],
+    ))
+    expect(resolve_shortcut(str(lnk)) == str(target), f"環境變數路徑: {resolve_shortcut(str(lnk))}")
+
+    lnk = work_dir / "relative.lnk"
+    lnk.write_bytes(shell_link(link_info(local_path=r"C:\missing\ffxivboot.exe"), relative_path=r".\sub\ffxivboot.exe"))
+    expect(resolve_shortcut(str(lnk)) == str(target), f"相對路徑: {resolve_shortcut(str(lnk))}")
+
+    # 目標都不存在：視為無法解析並返回捷徑本身，不返回不存在的候選路徑
+    lnk = work_dir / "missing.lnk"
+    lnk.write_bytes(shell_link(link_info(local_path=r"C:\missing\ffxivboot.exe"), relative_path=r".\missing.exe"))
+    expect(resolve_shortcut(str(lnk)) == str(lnk), f"目標不存在時應返回原路徑: {resolve_shortcut(str(lnk))}")
+    expect(resolve_shortcut_link(str(lnk)) is None, "目標不存在時 resolve_shortcut_link 應返回 None")
+
+    # 參數與開始位置隨解析結果一起返回
+    lnk = work_dir / "arguments.lnk"
+    lnk.write_bytes(shell_link(relative_path=r".\sub\ffxivboot.exe", working_dir="%FF14LM_SHORTCUT_DIR%",
+                               arguments="-region 3 /fast"))
+    link = resolve_shortcut_link(str(lnk))
+    expect(link is not None and link.target == str(target), f"參數捷徑的目標: {link}")
+    expect(link is not None and link.arguments == "-region 3 /fast" and link.working_dir == "%FF14LM_SHORTCUT_DIR%",
+           f"參數與開始位置: {link}")
+
+    lnk = work_dir / "broken.lnk"
+    lnk.write_bytes(b"not a shortcut")
+    expect(resolve_shortcut(str(lnk)) == str(lnk), "無法解析時應返回原路徑")
+    expect(resolve_shortcut(str(target)) == str(target), "非捷徑應原樣返回")
+
+    # 內建解析器找不到目標時（只有 IDList、無法解析），Windows 上改用 WScript.Shell COM
+    com_calls = []
+    original_com, original_platform = ff14_launcher.com_shortcut, sys.platform
+    ff14_launcher.com_shortcut = lambda path: com_calls.append(path) or ShellLink(target=str(target), arguments="-com")
+    sys.platform = "win32"
+    try:
+        lnk = work_dir / "idlist.lnk"
+        lnk.write_bytes(shell_link())
+        expect(resolve_shortcut(str(lnk)) == str(target), f"只有 IDList 時應改用 COM: {resolve_shortcut(str(lnk))}")
+        lnk = work_dir / "broken-com.lnk"
+        lnk.write_bytes(b"not a shortcut")
+        expect(resolve_shortcut(str(lnk)) == str(target), "無法解析時應改用 COM")
+        calls = len(com_calls)
+        lnk = work_dir / "parsed.lnk"
+        lnk.write_bytes(shell_link(relative_path=r".\sub\ffxivboot.exe"))
+        resolve_shortcut(str(lnk))
+        expect(len(com_calls) == calls, "內建解析器找到目標時不應呼叫 COM")
+    finally:
+        ff14_launcher.com_shortcut, sys.platform = original_com, original_platform
+
+    # launch_game：解析成功時啟動目標並帶入參數與開始位置，無法解析時啟動捷徑本身
+    class LaunchRecorder(AutomationBackend):
+        def __init__(self):
+            super().__init__()
+            self.launches = []
+
+        def launch(self, path: str, arguments: str = "", working_dir: str = "") -> int:
+            self.launches.append((path, arguments, working_dir))
+            return None
+
+    backend = LaunchRecorder()
+    automation = LauncherAutomation(ff14_launcher.config, backend)
+    for name, expected in (("arguments.lnk", (str(target), "-region 3 /fast", str(target.parent))),
+                           ("missing.lnk", (str(work_dir / "missing.lnk"), "", ""))):
+        ff14_launcher.config.config["launcher_path"] = str(work_dir / name)
+        success, msg = automation.launch_game()
+        expect(success and backend.launches[-1] == expected, f"launch_game {name}: {msg} {backend.launches[-1:]}")
+
+    # 快取：捷徑檔沒有改變時不重新解析，改變後重新解析
+    parse_calls = []
+    original_parse = ff14_launcher.parse_shell_link
+    ff14_launcher.parse_shell_link = lambda data: parse_calls.append(1) or original_parse(data)
+    try:
+        lnk = work_dir / "cached.lnk"
+        lnk.write_bytes(shell_link(relative_path=r".\sub\ffxivboot.exe"))
+        start = time.perf_counter()
+        resolve_shortcut(str(lnk))
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(1000):
+            resolve_shortcut(str(lnk))
+        cached = (time.perf_counter() - start) / 1000
+        expect(len(parse_calls) == 1, f"快取命中時不應重新解析: {len(parse_calls)} 次")
+
+        other = work_dir / "other.exe"
+        other.write_bytes(b"")
+        lnk.write_bytes(shell_link(relative_path=r".\other.exe", working_dir="x"))
+        os.utime(lnk, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+        expect(resolve_shortcut(str(lnk)) == str(other), "捷徑檔改變後應重新解析")
+        expect(len(parse_calls) == 2, f"捷徑檔改變後應重新解析: {len(parse_calls)} 次")
+    finally:
+        ff14_launcher.parse_shell_link = original_parse
+
+    check.report("捷徑解析檢查", f"（第一次解析 {first * 1e6:.0f}µs，快取命中 {cached * 1e6:.1f}µs）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+TOTP 測試向量檢查
+以 web/totp_vectors.json（RFC 6238 附錄 B）同時驗證 Python 的 generate_otp 與網頁的 web/totp.js，
+確保兩邊算出的 OTP 一致。網頁實作以 node 執行，找不到 node 時只檢查 Python。
+
+用法：
+    python tools/check_totp_vectors.py
+"""
+
+import json
+import shutil
+import subprocess
+
+from harness import ROOT_DIR, Checker  # 設定 sys.path 與 LOCALAPPDATA，須在 ff14_launcher 之前匯入
+from ff14_launcher import generate_otp, validate_secret
+
+VECTORS_PATH = ROOT_DIR / "web" / "totp_vectors.json"
+TOTP_JS_PATH = ROOT_DIR / "web" / "totp.js"
+
+# 以 node 執行 totp.js，輸出與 vectors 相同順序的 OTP 列表
+NODE_SCRIPT = """
+const { generateTotp } = require(process.argv[1]);
+const data = JSON.parse(require('fs').readFileSync(process.argv[2], 'utf8'));
+(async () => {
+    const secrets = [data.secret, ...data.secret_variants];
+    const results = [];
+    for (const secret of secrets) {
+        for (const vector of data.vectors) {
+            results.push(await generateTotp(secret, vector.time * 1000, vector.digits, data.period));
+        }
+    }
+    console.log(JSON.stringify(results));
+})();
+"""
+
+
+def expected_results(data: dict) -> list[tuple[str, dict]]:
+    secrets = [data["secret"]] + data["secret_variants"]
+    return [(secret, vector) for secret in secrets for vector in data["vectors"]]
+
+
+def check_python(data: dict, check: Checker):
+    for secret, vector in expected_results(data):
+        error = validate_secret(secret)
+        if error:
+            check.fail(f"python: {secret!r} 驗證失敗: {error}")
+            continue
+        otp = generate_otp(secret, vector["time"], vector["digits"])
+        if otp != vector["otp"]:
+            check.fail(f"python: {secret!r} t={vector['time']} 得到 {otp}，預期 {vector['otp']}")
+
+
+def check_javascript(data: dict, check: Checker):
+    node = shutil.which("node")
+    if node is None:
+        print("找不到 node，略過 web/totp.js")
+        return
+
+    result = subprocess.run(
+        [node, "-e", NODE_SCRIPT, str(TOTP_JS_PATH), str(VECTORS_PATH)],
+        capture_output=True, text=True, encoding="utf-8"
+    )
+    if result.returncode != 0:
+        check.fail(f"javascript: node 執行失敗: {result.stderr.strip()}")
+        return
+
+    for (secret, vector), otp in zip(expected_results(data), json.loads(result.stdout)):
+        if otp != vector["otp"]:
+            check.fail(f"javascript: {secret!r} t={vector['time']} 得到 {otp}，預期 {vector['otp']}")
+
+
+def main():
+    data = json.loads(VECTORS_PATH.read_text(encoding="utf-8"))
+    check = Checker()
+    check_python(data, check)
+    check_javascript(data, check)
+    check.report(f"{len(expected_results(data))} 組 TOTP 測試向量")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+更新檢查驗證
+在本機啟動提供 version.json 的 HTTP 伺服器（支援 ETag / Last-Modified 條件式請求），
+確認 UpdateChecker 的快取、TTL、304 處理、離線時沿用快取，以及語意化版本比較。
+
+用法：
+    python tools/check_update.py
+"""
+
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from harness import Checker, temp_dir  # 設定 sys.path 與 LOCALAPPDATA，須在 ff14_launcher 之前匯入
+from ff14_launcher import UpdateChecker, is_newer_version
+
+# (remote, current, remote 是否較新)
+VERSION_CASES = [
+    ("1.0.10", "1.0.5", True),
+    ("1.0.5", "1.0.10", False),
+    ("1.0.5", "1.0.5", False),
+    ("v1.1", "1.0.9", True),
+    ("1.1.0", "1.1", False),
+    ("2.0.0-beta.2", "2.0.0-beta.10", False),
+    ("2.0.0", "2.0.0-rc.1", True),
+    ("2.0.0-rc.1", "1.9.9", True),
+    ("1.0.5+build.7", "1.0.5", False),
+]
+
+
+class VersionServer(ThreadingHTTPServer):
+    """提供 /version.json，記錄收到的請求與回應的狀態碼"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), VersionHandler)
+        self.requests = []
+        self.set_version("1.0.10")
+
+    def set_version(self, version: str):
+        self.body = json.dumps({"version": version, "download_url": "https://example.com/dl", "changelog": "測試"}).encode()
+        self.etag = f'"{version}"'
+        self.last_modified = formatdate(time.time(), usegmt=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/version.json"
+
+
+class VersionHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        not_modified = self.headers.get("If-None-Match") == server.etag
+        server.requests.append({"etag": self.headers.get("If-None-Match"), "status": 304 if not_modified else 200})
+        if not_modified:
+            self.send_response(304)
+            self.send_header("ETag", server.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", server.etag)
+        self.send_header("Last-Modified", server.last_modified)
+        self.send_header("Content-Length", str(len(server.body)))
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def check_versions(check: Checker):
+    for remote, current, expected in VERSION_CASES:
+        if is_newer_version(remote, current) != expected:
+            check.fail(f"版本比較: {remote} > {current} 應為 {expected}")
+
+
+def check_cache(check: Checker):
+    expect = check.expect
+
+    server = VersionServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    cache_path = temp_dir("update") / "update_cache.json"
+    checker = UpdateChecker(server.url, "1.0.5", cache_path, ttl=60, timeout=2)
+
+    # 第一次：完整下載並寫入快取
+    result = checker.check()
+    expect(result.get("has_update") and result.get("new_version") == "1.0.10", f"第一次檢查結果錯誤: {result}")
+    expect([r["status"] for r in server.requests] == [200], f"第一次應下載一次: {server.requests}")
+    expect(cache_path.exists(), "未寫入快取檔")
+
+    # TTL 內：不連線
+    checker.check()
+    expect(len(server.requests) == 1, f"TTL 內不應連線: {server.requests}")
+
+    # 強制檢查：條件式 GET，伺服器回應 304，沿用快取內容
+    result = checker.check(force=True)
+    expect(server.requests[-1] == {"etag": '"1.0.10"', "status": 304}, f"應送出條件式請求並收到 304: {server.requests}")
+    expect(result.get("new_version") == "1.0.10", f"304 後應沿用快取: {result}")
+
+    # 新的 UpdateChecker（模擬下次啟動）讀取同一個快取檔，TTL 過期後重新詢問並取得新版本
+    server.set_version("1.1.0")
+    later = UpdateChecker(server.url, "1.0.5", cache_path, ttl=0, timeout=2)
+    result = later.check()
+    expect(server.requests[-1]["status"] == 200 and result.get("new_version") == "1.1.0", f"版本變更後應重新下載: {result}")
+
+    # 目前已是最新版本
+    result = UpdateChecker(server.url, "1.1.0", cache_path, ttl=60).check()
+    expect(result == {"has_update": False, "current_version": "1.1.0"}, f"已是最新版本時結果錯誤: {result}")
+
+    # 伺服器關閉：沿用快取；沒有快取時返回 error
+    server.shutdown()
+    server.server_close()
+    result = UpdateChecker(server.url, "1.0.5", cache_path, ttl=0, timeout=2).check()
+    expect(result.get("new_version") == "1.1.0", f"離線時應沿用快取: {result}")
+    result = UpdateChecker(server.url, "1.0.5", cache_path.with_name("missing.json"), timeout=2).check()
+    expect("error" in result and not result["has_update"], f"離線且沒有快取時應返回 error: {result}")
+
+    # 背景檢查：立即返回，完成後呼叫回呼
+    done = threading.Event()
+    results = []
+    start = time.perf_counter()
+    UpdateChecker(server.url, "1.0.5", cache_path, ttl=60).check_async(lambda r: (results.append(r), done.set()))
+    expect(time.perf_counter() - start < 0.05, "check_async 不應等待檢查完成")
+    expect(done.wait(5) and results[0].get("new_version") == "1.1.0", f"背景檢查結果錯誤: {results}")
+
+
+def main():
+    check = Checker()
+    check_versions(check)
+    check_cache(check)
+    check.report(f"版本比較 {len(VERSION_CASES)} 組、快取與條件式請求檢查")
+
+
+if __name__ == "__main__":
+    main()
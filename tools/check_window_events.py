@@ -0,0 +1,151 @@
+"""
+視窗事件偵測檢查
+以 FakeWindowEventSource 與記憶體中的桌面取代 UIA，驅動 LauncherAutomation.wait_for_window，確認：
+事件附帶視窗時直接綁定、僅喚醒時立即重新搜尋、沒有事件時以備援輪詢找到視窗、
+略過其他行程與已被綁定的視窗、追蹤的行程全部結束時改用標題搜尋、取消與逾時。
+不需要 Windows，可在 Linux 上執行。
+
+用法：
+    python tools/check_window_events.py
+"""
+
+import threading
+import time
+
+from harness import Checker  # 設定 sys.path 與 LOCALAPPDATA，須在 ff14_launcher 之前匯入
+import ff14_launcher
+from ff14_launcher import (
+    AutomationBackend, AutomationTrace, ElementInfo, FakeWindowEventSource, LauncherAutomation, WindowRegistry
+)
+
+CONTROL_TYPE_WINDOW = 50032
+LAUNCHER_TITLE = "FINAL FANTASY XIV 繁體中文版"
+
+
+def window(handle: int, pid: int, title: str = LAUNCHER_TITLE) -> ElementInfo:
+    return ElementInfo(None, title, CONTROL_TYPE_WINDOW, "", True, (0, 0, 100, 30), handle=handle, pid=pid)
+
+
+class DesktopBackend(AutomationBackend):
+    """只提供視窗列舉的後端；alive 為 None 時所有行程都視為執行中"""
+
+    def __init__(self):
+        super().__init__()
+        self.windows = []
+        self.alive = None
+
+    def find_top_windows(self, pids: set[int] = None) -> list[ElementInfo]:
+        self.count_call("find_top_windows")
+        return [w for w in list(self.windows) if not pids or w.pid in pids]
+
+    def process_tree(self, pids: set[int]) -> tuple[set[int], set[int]]:
+        self.count_call("process_tree")
+        return set(pids), (set(pids) if self.alive is None else set(pids) & self.alive)
+
+    @property
+    def searches(self) -> int:
+        return sum(counters.get("find_top_windows", 0) for counters in self.calls_by_phase.values())
+
+
+def create_automation(backend: DesktopBackend, registry: WindowRegistry = None,
+                      pids: set[int] = None) -> LauncherAutomation:
+    automation = LauncherAutomation(ff14_launcher.config, backend, registry=registry)
+    automation.trace = AutomationTrace(backend)
+    automation.process_ids = set(pids or ())
+    automation.WINDOW_POLL_INITIAL = 0.1
+    automation.WINDOW_POLL_MAX = 0.4
+    return automation
+
+
+def later(delay: float, action):
+    timer = threading.Timer(delay, action)
+    timer.daemon = True
+    timer.start()
+
+
+def run_wait(automation: LauncherAutomation, source: FakeWindowEventSource, timeout: float = 3):
+    start = time.perf_counter()
+    result = automation.wait_for_window(timeout, event_source=source)
+    return result, time.perf_counter() - start
+
+
+def main():
+    check = Checker()
+    expect = check.expect
+
+    # 事件附帶視窗：不必等下一次輪詢即綁定
+    backend, source = DesktopBackend(), FakeWindowEventSource()
+    own = window(1, 100)
+
+    def open_own():
+        backend.windows.append(own)
+        source.fire(own)
+
+    later(0.15, open_own)
+    (found, msg, launcher), elapsed = run_wait(create_automation(backend, pids={100}), source)
+    expect(found and launcher is own, f"事件附帶視窗時應直接綁定: {msg}")
+    expect(elapsed < 0.25, f"事件喚醒後應立即返回: {elapsed * 1000:.0f}ms")
+    expect(source.started and source.stopped, "wait_for_window 應啟動並停止事件來源")
+    expect(backend.searches <= 3, f"事件模式不應頻繁搜尋: {backend.searches} 次")
+
+    # 僅喚醒（事件未附帶視窗）：立即重新搜尋
+    backend, source = DesktopBackend(), FakeWindowEventSource()
+
+    def wake_only():
+        backend.windows.append(window(2, 200))
+        source.fire()
+
+    later(0.15, wake_only)
+    (found, msg, launcher), elapsed = run_wait(create_automation(backend, pids={200}), source)
+    expect(found and launcher.handle == 2, f"僅喚醒時應重新搜尋並找到視窗: {msg}")
+    expect(elapsed < 0.25, f"僅喚醒後應立即重新搜尋: {elapsed * 1000:.0f}ms")
+
+    # 沒有任何事件：備援輪詢仍能找到視窗
+    backend, source = DesktopBackend(), FakeWindowEventSource()
+    later(0.15, lambda: backend.windows.append(window(3, 300)))
+    (found, msg, launcher), elapsed = run_wait(create_automation(backend, pids={300}), source)
+    expect(found and launcher.handle == 3, f"沒有事件時應由備援輪詢找到視窗: {msg}")
+    expect(elapsed < 0.6, f"備援輪詢間隔過長: {elapsed * 1000:.0f}ms")
+
+    # 其他行程的同名視窗與已被其他流程綁定的視窗一律略過
+    backend, source, registry = DesktopBackend(), FakeWindowEventSource(), WindowRegistry()
+    foreign, claimed, own = window(4, 999), window(5, 400), window(6, 400)
+    backend.windows = [foreign, claimed]
+    registry.claim(claimed, object())
+
+    def open_after_foreign():
+        source.fire(foreign)
+        time.sleep(0.1)
+        backend.windows.append(own)
+        source.fire(own)
+
+    later(0.1, open_after_foreign)
+    (found, msg, launcher), _ = run_wait(create_automation(backend, registry, pids={400}), source)
+    expect(found and launcher is own, f"應略過其他行程與已綁定的視窗: {launcher}")
+
+    # 追蹤的行程全部結束且沒有視窗：改用標題搜尋
+    backend, source = DesktopBackend(), FakeWindowEventSource()
+    backend.windows = [window(7, 700)]
+    backend.alive = set()
+    automation = create_automation(backend, pids={500})
+    (found, msg, launcher), _ = run_wait(automation, source)
+    expect(found and launcher.handle == 7, f"行程結束後應改用標題搜尋: {msg}")
+    expect(automation.trace.notes.get("window_search") == "title_fallback", "應記錄改用標題搜尋")
+
+    # 取消：stop() 喚醒等待中的流程
+    backend, source = DesktopBackend(), FakeWindowEventSource()
+    automation = create_automation(backend, pids={800})
+    later(0.1, automation.stop)
+    (found, msg, _), elapsed = run_wait(automation, source)
+    expect(not found and msg == "已取消" and elapsed < 0.3, f"取消後應立即返回: {msg} {elapsed * 1000:.0f}ms")
+
+    # 逾時
+    backend, source = DesktopBackend(), FakeWindowEventSource()
+    (found, msg, _), elapsed = run_wait(create_automation(backend, pids={900}), source, timeout=0.3)
+    expect(not found and "逾時" in msg and elapsed < 0.6, f"逾時結果錯誤: {msg} {elapsed * 1000:.0f}ms")
+
+    check.report("視窗事件偵測檢查")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+下載 QR Code 解碼器 jsQR 到 web/jsQR.js（選用）
+網頁在第一次開啟 QR Dialog 時才載入 jsQR，優先使用 web/ 內的檔案，找不到時從 CDN 取得；
+儲存庫不附帶 jsQR.js，CDN 是預設支援的來源，需要離線掃描時才在打包前執行此工具。
+
+下載的內容必須符合 JSQR_SHA256（或以 --sha256 指定的雜湊），不符合時不寫入檔案。
+JSQR_SHA256 尚未設定時只顯示下載內容的雜湊，確認來源後填入再執行一次。
+
+用法：
+    python tools/fetch_jsqr.py
+    python tools/fetch_jsqr.py --sha256 <預期的 sha256>
+"""
+
+import argparse
+import hashlib
+import sys
+import urllib.request
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+JSQR_VERSION = "1.4.0"
+JSQR_URL = f"https://cdn.jsdelivr.net/npm/jsqr@{JSQR_VERSION}/dist/jsQR.js"
+# jsqr@1.4.0 dist/jsQR.js 的 sha256（更換版本時一併更新）
+JSQR_SHA256 = ""
+TARGET_PATH = ROOT_DIR / "web" / "jsQR.js"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="下載 jsQR 到 web/jsQR.js")
+    parser.add_argument("--sha256", default=JSQR_SHA256, help="預期的 sha256（預設為 JSQR_SHA256）")
+    args = parser.parse_args()
+    expected = args.sha256.strip().lower()
+
+    request = urllib.request.Request(JSQR_URL, headers={"User-Agent": "FF14LoginManager"})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            data = response.read()
+    except OSError as e:
+        print(f"下載失敗: {e}")
+        sys.exit(1)
+
+    digest = hashlib.sha256(data).hexdigest()
+    if not expected:
+        print(f"未設定預期的 sha256，不寫入檔案。下載內容：{len(data)} bytes, sha256 {digest}")
+        print("確認來源後填入 JSQR_SHA256 或以 --sha256 指定")
+        sys.exit(1)
+    if digest != expected:
+        print(f"sha256 不符，不寫入檔案：預期 {expected}，實際 {digest}")
+        sys.exit(1)
+
+    TARGET_PATH.write_bytes(data)
+    print(f"已下載 jsQR {JSQR_VERSION} → {TARGET_PATH}")
+    print(f"{len(data)} bytes, sha256 {digest}")
+
+
+if __name__ == "__main__":
+    main()
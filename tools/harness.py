@@ -0,0 +1,56 @@
+"""
+tools/check_*.py 共用的檢查輔助
+匯入時把專案根目錄加入 sys.path，並把 LOCALAPPDATA 指向暫存資料夾（Windows 上一定有設定，
+不能沿用，否則會讀寫使用者真正的設定檔）；
+ff14_launcher 需要 requirements.txt 中的套件（pyotp 等），缺少時提示安裝方式後結束。
+
+用法（在檢查腳本最前面匯入）：
+    from harness import Checker
+    check = Checker()
+    check.expect(條件, "失敗訊息")
+    check.report("某某檢查")
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+os.environ["LOCALAPPDATA"] = tempfile.mkdtemp(prefix="ff14lm-check-")
+
+try:
+    import ff14_launcher  # noqa: F401
+except ModuleNotFoundError as e:
+    print(f"缺少套件 {e.name}，請先執行：pip install -r requirements.txt")
+    sys.exit(2)
+
+
+class Checker:
+    """收集失敗項目，檢查結束時一次輸出；有失敗時以 exit code 1 結束"""
+
+    def __init__(self):
+        self.failures = []
+
+    def expect(self, condition: bool, message: str):
+        if not condition:
+            self.failures.append(message)
+
+    def fail(self, message: str):
+        self.failures.append(message)
+
+    def report(self, name: str, detail: str = ""):
+        """輸出結果；detail 附加在通過訊息之後（例如量測到的耗時）"""
+        for failure in self.failures:
+            print(failure)
+        if self.failures:
+            print(f"\n{len(self.failures)} 項失敗")
+            sys.exit(1)
+        print(f"{name}全部通過{detail}")
+
+
+def temp_dir(prefix: str) -> Path:
+    """每個情境使用自己的暫存資料夾"""
+    return Path(tempfile.mkdtemp(prefix=f"ff14lm-{prefix}-"))
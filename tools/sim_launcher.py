@@ -0,0 +1,302 @@
+"""
+模擬 Launcher 後端
+以記憶體中的元素樹模擬 FF14 Launcher，可設定各階段出現前的延遲，
+並記錄所有 SetValue / Invoke 等操作，讓 run_automation 能在沒有 Windows 桌面的環境執行
+"""
+
+import itertools
+import threading
+import time
+
+from ff14_launcher import (
+    CONTROL_TYPE_BUTTON,
+    CONTROL_TYPE_EDIT,
+    CONTROL_TYPE_WINDOW,
+    AutomationBackend,
+    AutomationError,
+    ElementInfo,
+    WindowEventSource,
+)
+
+# 模擬的視窗代碼與行程 ID
+_window_handles = itertools.count(0x10000, 4)
+_process_ids = itertools.count(4000, 4)
+
+
+class SimElement:
+    """模擬的 UI 元素"""
+
+    def __init__(self, name: str, control_type: int, automation_id: str = "", rect: tuple = (0, 0, 100, 30),
+                 owner: "SimulatedLauncher" = None, pid: int = 0):
+        self.name = name
+        self.control_type = control_type
+        self.automation_id = automation_id
+        self.rect = rect
+        self.owner = owner
+        self.enabled = True
+        self.value = ""
+        self.handle = next(_window_handles) if control_type == CONTROL_TYPE_WINDOW else 0
+        self.pid = pid
+
+    def info(self) -> ElementInfo:
+        value = self.value if self.control_type == CONTROL_TYPE_EDIT else None
+        return ElementInfo(self, self.name, self.control_type, self.automation_id, self.enabled, self.rect,
+                           value, self.handle, self.pid)
+
+
+class SimulatedDesktop:
+    """
+    模擬桌面
+    包含無關的視窗與所有已加入的模擬 Launcher，並分派 WindowOpened 事件；
+    多個後端共用同一個桌面時可模擬同時開啟多個 Launcher。
+    stale_launchers 為其他行程開啟、標題與 Launcher 相同但沒有登入欄位的視窗
+    """
+
+    def __init__(self, decoy_windows: int = 20, stale_launchers: int = 0):
+        self.decoys = [SimElement(f"視窗 {i}", CONTROL_TYPE_WINDOW, pid=next(_process_ids))
+                       for i in range(decoy_windows)]
+        self.decoys += [SimElement("FINAL FANTASY XIV 繁體中文版", CONTROL_TYPE_WINDOW, pid=next(_process_ids))
+                        for _ in range(stale_launchers)]
+        self.launchers = []
+        self._lock = threading.Lock()
+        self._window_listeners = []
+
+    def add(self, launcher: "SimulatedLauncher"):
+        with self._lock:
+            self.launchers.append(launcher)
+        launcher.desktop = self
+
+    def windows(self) -> list[SimElement]:
+        with self._lock:
+            launchers = list(self.launchers)
+        return list(self.decoys) + [l.window for l in launchers if l.window_visible()]
+
+    def add_window_listener(self, callback):
+        with self._lock:
+            self._window_listeners.append(callback)
+            visible = [l.window for l in self.launchers if l.window_visible()]
+        # 訂閱前已開啟的視窗也通知一次
+        for window in visible:
+            callback(window)
+
+    def remove_window_listener(self, callback):
+        with self._lock:
+            if callback in self._window_listeners:
+                self._window_listeners.remove(callback)
+
+    def window_opened(self, window: SimElement):
+        with self._lock:
+            listeners = list(self._window_listeners)
+        for callback in listeners:
+            callback(window)
+
+
+class SimulatedLauncher:
+    """
+    依時間腳本演出的 Launcher
+    launch() 之後經過 window_delay 視窗出現，再經過 login_delay / otp_delay 出現登入欄位與 OTP 欄位，
+    OTP 填入並按下 Enter 後經過 play_delay 出現 PLAY 按鈕。
+    spawn_child 為 True 時視窗屬於另一個子行程（模擬啟動程式再啟動 Launcher 的情況）
+    """
+
+    def __init__(self, window_delay: float = 0.5, login_delay: float = 0.2, otp_delay: float = 0.2,
+                 play_delay: float = 0.5, title: str = "FINAL FANTASY XIV 繁體中文版",
+                 decoy_elements: int = 0, spawn_child: bool = True):
+        self.window_delay = window_delay
+        self.login_delay = login_delay
+        self.otp_delay = otp_delay
+        self.play_delay = play_delay
+        self.desktop = None
+
+        self.pid = next(_process_ids)
+        self.window_pid = next(_process_ids) if spawn_child else self.pid
+
+        self.window = SimElement(title, CONTROL_TYPE_WINDOW, owner=self, pid=self.window_pid)
+        self.email = SimElement("信箱", CONTROL_TYPE_EDIT, "email", owner=self)
+        self.password = SimElement("密碼", CONTROL_TYPE_EDIT, "password", owner=self)
+        self.otp = SimElement("一次性密碼", CONTROL_TYPE_EDIT, "otp", owner=self)
+        self.login_button = SimElement("登入", CONTROL_TYPE_BUTTON, "login", owner=self)
+        self.play = SimElement("PLAY", CONTROL_TYPE_BUTTON, "play", owner=self)
+
+        # WebView 中與登入無關的元素
+        self.filler = [SimElement(f"連結 {i}", CONTROL_TYPE_BUTTON, owner=self) for i in range(decoy_elements)]
+
+        self.actions = []
+        self.played = threading.Event()
+        self._lock = threading.Lock()
+        self._launched_at = None
+        self._submitted_at = None
+
+    # ---------- 時間軸 ----------
+
+    def elapsed(self) -> float:
+        if self._launched_at is None:
+            return -1.0
+        return time.monotonic() - self._launched_at
+
+    def launch(self):
+        with self._lock:
+            if self._launched_at is not None:
+                return
+            self._launched_at = time.monotonic()
+        timer = threading.Timer(self.window_delay, self._fire_window_opened)
+        timer.daemon = True
+        timer.start()
+
+    def window_visible(self) -> bool:
+        return self.elapsed() >= self.window_delay
+
+    def visible_elements(self) -> list[SimElement]:
+        t = self.elapsed() - self.window_delay
+        if t < 0:
+            return []
+
+        elements = list(self.filler)
+        if self._submitted_at is None:
+            if t >= self.login_delay:
+                elements += [self.email, self.password]
+            if t >= self.otp_delay:
+                elements.append(self.otp)
+            elements.append(self.login_button)
+        elif time.monotonic() - self._submitted_at >= self.play_delay:
+            elements.append(self.play)
+        return elements
+
+    def _fire_window_opened(self):
+        if self.desktop is not None:
+            self.desktop.window_opened(self.window)
+
+    # ---------- 操作 ----------
+
+    def record(self, action: str, element: SimElement = None, value: str = None):
+        name = element.name if element is not None else ""
+        self.actions.append((round(self.elapsed(), 4), action, name, value))
+
+    def submit(self):
+        """Enter / 登入：OTP 已填入時切換到 PLAY 頁面"""
+        if self._submitted_at is None and self.otp.value:
+            self._submitted_at = time.monotonic()
+
+    def press_play(self):
+        self.played.set()
+
+
+class SimulatedWindowEventSource(WindowEventSource):
+    """模擬的 WindowOpened 事件來源"""
+
+    def __init__(self, desktop: SimulatedDesktop, keywords: list[str]):
+        super().__init__()
+        self.desktop = desktop
+        self.keywords = [kw.upper() for kw in keywords]
+
+    def _on_window_opened(self, window: SimElement):
+        if all(kw in window.name.upper() for kw in self.keywords):
+            self.notify(window.info())
+
+    def start(self):
+        self.desktop.add_window_listener(self._on_window_opened)
+
+    def stop(self):
+        self.desktop.remove_window_listener(self._on_window_opened)
+
+
+class SimulatedBackend(AutomationBackend):
+    """
+    以 SimulatedLauncher 取代 Windows UIA 的後端
+    launch() 啟動自己的 launcher，但視窗搜尋與操作會作用在桌面上任何一個 Launcher
+    call_latency 模擬每次跨行程呼叫的耗時（秒）
+    """
+
+    def __init__(self, launcher: SimulatedLauncher, call_latency: float = 0.0, events: bool = True,
+                 desktop: SimulatedDesktop = None, decoy_windows: int = 20):
+        super().__init__()
+        self.launcher = launcher
+        self.desktop = desktop or SimulatedDesktop(decoy_windows)
+        self.desktop.add(launcher)
+        self.call_latency = call_latency
+        self.events = events
+        self._focused = None
+
+    def _call(self, name: str):
+        self.count_call(name)
+        if self.call_latency:
+            time.sleep(self.call_latency)
+
+    def find_top_windows(self, pids: set[int] = None) -> list[ElementInfo]:
+        self._call("find_top_windows")
+        return [w.info() for w in self.desktop.windows() if not pids or w.pid in pids]
+
+    def process_tree(self, pids: set[int]) -> tuple[set[int], set[int]]:
+        self._call("process_tree")
+        result = set(pids)
+        for launcher in self.desktop.launchers:
+            if launcher.pid in pids and launcher.elapsed() >= 0:
+                result.add(launcher.window_pid)
+        return result, set(result)
+
+    def snapshot(self, window: ElementInfo) -> list[ElementInfo]:
+        self._call("snapshot")
+        owner = window.element.owner
+        if owner is None:
+            return []
+        return [e.info() for e in owner.visible_elements()]
+
+    def create_window_event_source(self, keywords: list[str]) -> WindowEventSource:
+        if not self.events:
+            return None
+        return SimulatedWindowEventSource(self.desktop, keywords)
+
+    @staticmethod
+    def _require_visible(info: ElementInfo) -> SimElement:
+        element = info.element
+        if element.owner is None or element not in element.owner.visible_elements():
+            raise AutomationError(f"元素已不存在: {element.name}")
+        return element
+
+    def set_value(self, info: ElementInfo, value: str):
+        self._call("set_value")
+        element = self._require_visible(info)
+        element.value = value
+        element.owner.record("set_value", element, value)
+
+    def read_value(self, info: ElementInfo) -> str:
+        self._call("read_value")
+        element = self._require_visible(info)
+        return element.value if element.control_type == CONTROL_TYPE_EDIT else None
+
+    def set_focus(self, info: ElementInfo):
+        self._call("set_focus")
+        self._focused = self._require_visible(info)
+        self._focused.owner.record("set_focus", self._focused)
+
+    def invoke(self, info: ElementInfo):
+        self._call("invoke")
+        element = self._require_visible(info)
+        element.owner.record("invoke", element)
+        self._activate(element)
+
+    def send_enter(self):
+        self._call("send_enter")
+        if self._focused is None:
+            return
+        self._focused.owner.record("send_enter", self._focused)
+        self._focused.owner.submit()
+
+    def click(self, info: ElementInfo):
+        self._call("click")
+        element = self._require_visible(info)
+        element.owner.record("click", element)
+        self._activate(element)
+
+    @staticmethod
+    def _activate(element: SimElement):
+        if element is element.owner.play:
+            element.owner.press_play()
+        elif element is element.owner.login_button:
+            element.owner.submit()
+
+    def launch(self, path: str, arguments: str = "", working_dir: str = "") -> int:
+        self._call("launch")
+        self.launcher.launch()
+        self.launcher.record("launch", value=f"{path} {arguments}".strip())
+        return self.launcher.pid
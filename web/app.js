@@ -49,6 +49,9 @@ const qrError = document.getElementById('qrError');
 const qrErrorMsg = document.getElementById('qrErrorMsg');
 const qrApplyBtn = document.getElementById('qrApplyBtn');
 const qrResetBtn = document.getElementById('qrResetBtn');
+const qrImportBtn = document.getElementById('qrImportBtn');
+const qrAccountList = document.getElementById('qrAccountList');
+const qrWarnings = document.getElementById('qrWarnings');
 
 const infoDialog = document.getElementById('infoDialog');
 const infoDialogClose = document.getElementById('infoDialogClose');
@@ -75,6 +78,14 @@ const gameRunningDialogClose = document.getElementById('gameRunningDialogClose')
 const gameRunningConfirmBtn = document.getElementById('gameRunningConfirmBtn');
 const gameRunningCancelBtn = document.getElementById('gameRunningCancelBtn');
 
+const multiLaunchBtn = document.getElementById('multiLaunchBtn');
+const multiLaunchDialog = document.getElementById('multiLaunchDialog');
+const multiLaunchDialogClose = document.getElementById('multiLaunchDialogClose');
+const multiLaunchList = document.getElementById('multiLaunchList');
+const multiLaunchConcurrency = document.getElementById('multiLaunchConcurrency');
+const multiLaunchStartBtn = document.getElementById('multiLaunchStartBtn');
+const multiLaunchStopBtn = document.getElementById('multiLaunchStopBtn');
+
 // State
 let isRunning = false;
 let otpUpdateInterval = null;
@@ -84,6 +95,9 @@ let selectedAccountIndex = -1;
 let currentTheme = 'tsuyukusa';
 let brightness = 50;
 let extractedSecretKey = '';
+// 最近一次掃描到的 QR Code 內容（匯入時交給 Python 解析）
+let scannedOtpUrls = [];
+let isMultiRunning = false;
 
 // Initialize
 document.addEventListener('DOMContentLoaded', async () => {
@@ -93,12 +107,22 @@ document.addEventListener('DOMContentLoaded', async () => {
     initTheme();
     initDialogs();
     initQrScanner();
-    checkForUpdates();
+    showVersion();
 });
 
 // ========== 偵測 Launcher 和遊戲狀態 ==========
 
-function startDetection() {
+async function startDetection() {
+    try {
+        // 訂閱 Python 推送的事件，狀態改變時才會收到通知
+        const result = await window.pywebview.api.subscribe();
+        applyDetectionState(result.detect);
+        if (result.push_detection) return;
+    } catch (error) {
+        console.error('訂閱事件失敗:', error);
+    }
+
+    // 無法監看行程時退回輪詢
     updateDetectionStatus();
     detectInterval = setInterval(updateDetectionStatus, 3000);
 }
@@ -107,87 +131,84 @@ async function updateDetectionStatus() {
     try {
         if (!window.pywebview || !window.pywebview.api) return;
 
-        const launcherIndicator = document.getElementById('launcherIndicator');
-        const gameIndicator = document.getElementById('gameIndicator');
-
-        // 偵測 Launcher
         const launcherResult = await window.pywebview.api.detect_launcher();
-        if (launcherResult.running) {
-            launcherIndicator.classList.remove('bg-gray-500');
-            launcherIndicator.classList.add('bg-green-500');
-        } else {
-            launcherIndicator.classList.remove('bg-green-500');
-            launcherIndicator.classList.add('bg-gray-500');
-        }
-
-        // 偵測遊戲
         const gameResult = await window.pywebview.api.detect_game();
-        if (gameResult.running) {
-            gameIndicator.classList.remove('bg-gray-500');
-            gameIndicator.classList.add('bg-green-500');
-        } else {
-            gameIndicator.classList.remove('bg-green-500');
-            gameIndicator.classList.add('bg-gray-500');
-        }
+        applyDetectionState({ launcher: launcherResult.running, game: gameResult.running });
     } catch (error) {
         console.error('偵測狀態失敗:', error);
     }
 }
 
+function applyDetectionState(state) {
+    setIndicator(document.getElementById('launcherIndicator'), state.launcher);
+    setIndicator(document.getElementById('gameIndicator'), state.game);
+}
+
+function setIndicator(indicator, running) {
+    if (running) {
+        indicator.classList.remove('bg-gray-500');
+        indicator.classList.add('bg-green-500');
+    } else {
+        indicator.classList.remove('bg-green-500');
+        indicator.classList.add('bg-gray-500');
+    }
+}
+
 // ========== 更新檢查 ==========
 
-async function checkForUpdates(showNoUpdateMsg = false) {
+async function showVersion() {
     try {
         // 等待 API 就緒
         while (!window.pywebview || !window.pywebview.api) {
             await new Promise(resolve => setTimeout(resolve, 100));
         }
-
-        // 顯示版本號
         const version = await window.pywebview.api.get_version();
         document.getElementById('versionText').textContent = 'v' + version;
+    } catch (error) {
+        console.error('取得版本失敗:', error);
+    }
+}
 
-        // 如果不是手動檢查，且沒有啟用自動檢查更新，則跳過
-        if (!showNoUpdateMsg && !autoCheckUpdate.checked) {
-            return;
-        }
-
-        const result = await window.pywebview.api.check_update();
-
-        if (result.has_update) {
-            // 顯示「有可用的更新」連結
-            document.getElementById('updateAvailable').classList.remove('hidden');
-
-            // 顯示更新對話框
-            document.getElementById('currentVersion').textContent = result.current_version;
-            document.getElementById('newVersion').textContent = result.new_version;
-            document.getElementById('downloadLink').href = result.download_url;
-
-            // 顯示更新內容
-            const changelogEl = document.getElementById('changelog');
-            if (result.changelog) {
-                changelogEl.textContent = result.changelog;
-                changelogEl.classList.remove('hidden');
-            } else {
-                changelogEl.classList.add('hidden');
-            }
-
-            document.getElementById('updateDialog').showModal();
-        } else if (showNoUpdateMsg) {
-            // 手動檢查時，如果沒有更新，顯示提示
-            updateStatus('目前已是最新版本');
-        }
+// 自動檢查由 Python 在啟動時於背景執行，結果以 update 事件送達；手動檢查同樣只送出請求
+async function checkForUpdates() {
+    try {
+        await window.pywebview.api.check_update(true);
+        updateStatus('正在檢查更新...');
     } catch (error) {
         console.error('檢查更新失敗:', error);
-        if (showNoUpdateMsg) {
-            updateStatus('檢查更新失敗');
+        updateStatus('檢查更新失敗');
+    }
+}
+
+function updateCheckResult(result) {
+    if (result.has_update) {
+        // 顯示「有可用的更新」連結
+        document.getElementById('updateAvailable').classList.remove('hidden');
+
+        // 顯示更新對話框
+        document.getElementById('currentVersion').textContent = result.current_version;
+        document.getElementById('newVersion').textContent = result.new_version;
+        document.getElementById('downloadLink').href = result.download_url;
+
+        // 顯示更新內容
+        const changelogEl = document.getElementById('changelog');
+        if (result.changelog) {
+            changelogEl.textContent = result.changelog;
+            changelogEl.classList.remove('hidden');
+        } else {
+            changelogEl.classList.add('hidden');
         }
+
+        document.getElementById('updateDialog').showModal();
+    } else if (result.manual) {
+        // 手動檢查時，如果沒有更新，顯示提示
+        updateStatus(result.error ? '檢查更新失敗' : '目前已是最新版本');
     }
 }
 
 // 點擊版本號手動檢查更新
 document.getElementById('versionText').addEventListener('click', () => {
-    checkForUpdates(true);
+    checkForUpdates();
 });
 
 // ========== 主題切換 ==========
@@ -359,8 +380,14 @@ function initDialogs() {
     deleteConfirmDialog.addEventListener('click', (e) => {
         if (e.target === deleteConfirmDialog) deleteConfirmDialog.close();
     });
-    deleteConfirmBtn.addEventListener('click', () => {
+    deleteConfirmBtn.addEventListener('click', async () => {
         if (selectedAccountIndex >= 0 && selectedAccountIndex < accounts.length) {
+            const result = await window.pywebview.api.delete_account(accounts[selectedAccountIndex].id);
+            if (!result.success) {
+                updateStatus(result.error);
+                deleteConfirmDialog.close();
+                return;
+            }
             accounts.splice(selectedAccountIndex, 1);
             if (accounts.length === 0) {
                 selectedAccountIndex = -1;
@@ -375,6 +402,25 @@ function initDialogs() {
     });
 
     // Game Running Dialog
+    multiLaunchBtn.addEventListener('click', () => {
+        if (!isMultiRunning) {
+            renderMultiLaunchList();
+        }
+        multiLaunchDialog.showModal();
+    });
+    multiLaunchDialogClose.addEventListener('click', () => multiLaunchDialog.close());
+    multiLaunchDialog.addEventListener('click', (e) => {
+        if (e.target === multiLaunchDialog) multiLaunchDialog.close();
+    });
+    multiLaunchStartBtn.addEventListener('click', startMultiLaunch);
+    multiLaunchStopBtn.addEventListener('click', async () => {
+        try {
+            await window.pywebview.api.stop_multi_automation();
+        } catch (error) {
+            console.error('Failed to stop multi launch:', error);
+        }
+    });
+
     gameRunningDialogClose.addEventListener('click', () => gameRunningDialog.close());
     gameRunningCancelBtn.addEventListener('click', () => gameRunningDialog.close());
     gameRunningDialog.addEventListener('click', (e) => {
@@ -411,11 +457,53 @@ function initDialogs() {
 
 // ========== QR Code 掃描 ==========
 
+// jsQR 只在第一次開啟 QR Dialog 時載入；CDN 是預設來源（儲存庫不附帶 jsQR.js），
+// 以 tools/fetch_jsqr.py 下載到 web/ 時優先使用本機檔案
+const JSQR_SOURCES = ['jsQR.js', 'https://cdn.jsdelivr.net/npm/jsqr@1.4.0/dist/jsQR.js'];
+// 掃描前將圖片長邊縮到此像素以內，避免手機截圖建立過大的 canvas
+const QR_SCAN_MAX_SIZE = 1600;
+let jsQRLoading = null;
+let qrPreviewUrl = null;
+
+function loadScript(src) {
+    return new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = () => {
+            script.remove();
+            reject(new Error(`載入失敗: ${src}`));
+        };
+        document.head.appendChild(script);
+    });
+}
+
+function loadJsQR() {
+    if (!jsQRLoading) {
+        jsQRLoading = (async () => {
+            for (const src of JSQR_SOURCES) {
+                try {
+                    await loadScript(src);
+                    if (window.jsQR) return window.jsQR;
+                } catch (error) {
+                    console.warn(error.message);
+                }
+            }
+            throw new Error('無法載入 QR Code 解碼器');
+        })();
+        // 載入失敗時下次開啟再重試
+        jsQRLoading.catch(() => { jsQRLoading = null; });
+    }
+    return jsQRLoading;
+}
+
 function initQrScanner() {
     // 開啟 QR Dialog
     qrScanBtn.addEventListener('click', () => {
         resetQrDialog();
         qrDialog.showModal();
+        // 使用者選圖片的同時在背景載入解碼器
+        loadJsQR().catch(() => {});
     });
 
     // 點擊上傳區域
@@ -423,8 +511,7 @@ function initQrScanner() {
 
     // 檔案選擇
     qrFileInput.addEventListener('change', (e) => {
-        const file = e.target.files[0];
-        if (file) handleQrFile(file);
+        if (e.target.files.length) handleQrFiles(e.target.files);
     });
 
     // 拖曳上傳
@@ -440,10 +527,7 @@ function initQrScanner() {
     qrUploadArea.addEventListener('drop', (e) => {
         e.preventDefault();
         qrUploadArea.classList.remove('border-white/60');
-        const file = e.dataTransfer.files[0];
-        if (file && file.type.startsWith('image/')) {
-            handleQrFile(file);
-        }
+        handleQrFiles(e.dataTransfer.files);
     });
 
     // 套用按鈕
@@ -455,6 +539,9 @@ function initQrScanner() {
         }
     });
 
+    // 匯入按鈕：所有帳號由 Python 一次加入並寫入設定檔
+    qrImportBtn.addEventListener('click', importScannedAccounts);
+
     // 重新掃描按鈕
     qrResetBtn.addEventListener('click', resetQrDialog);
 }
@@ -467,178 +554,131 @@ function resetQrDialog() {
     qrError.classList.add('hidden');
     qrApplyBtn.classList.add('hidden');
     qrResetBtn.classList.add('hidden');
+    qrImportBtn.classList.add('hidden');
     extractedSecretKey = '';
+    scannedOtpUrls = [];
+    if (qrPreviewUrl) {
+        qrPreviewImg.removeAttribute('src');
+        URL.revokeObjectURL(qrPreviewUrl);
+        qrPreviewUrl = null;
+    }
 }
 
-function handleQrFile(file) {
-    const reader = new FileReader();
-    reader.onload = (e) => {
-        qrPreviewImg.src = e.target.result;
-        qrPreview.classList.remove('hidden');
-        qrUploadArea.classList.add('hidden');
-        scanQrCode(e.target.result);
-    };
-    reader.readAsDataURL(file);
-}
-
-function scanQrCode(imageData) {
-    const img = new Image();
-    img.onload = () => {
-        const canvas = document.createElement('canvas');
-        const ctx = canvas.getContext('2d');
-        canvas.width = img.width;
-        canvas.height = img.height;
-        ctx.drawImage(img, 0, 0);
-
-        const imgData = ctx.getImageData(0, 0, canvas.width, canvas.height);
-        const code = jsQR(imgData.data, imgData.width, imgData.height);
-
-        if (code) {
-            parseOtpUrl(code.data);
-        } else {
-            showQrError('無法讀取 QR Code，請確認圖片清晰可見');
-        }
-    };
-    img.src = imageData;
+function handleQrFiles(files) {
+    const images = Array.from(files).filter(file => file.type.startsWith('image/'));
+    if (images.length === 0) return;
+
+    // 以 Object URL 顯示第一張圖片，不需轉成 base64 字串
+    if (qrPreviewUrl) URL.revokeObjectURL(qrPreviewUrl);
+    qrPreviewUrl = URL.createObjectURL(images[0]);
+    qrPreviewImg.src = qrPreviewUrl;
+    qrPreview.classList.remove('hidden');
+    qrUploadArea.classList.add('hidden');
+    scanQrCodes(images);
 }
 
-function parseOtpUrl(url) {
+async function scanQrCodes(files) {
+    let decode;
     try {
-        // Google Authenticator 匯出格式
-        if (url.startsWith('otpauth-migration://')) {
-            const accounts = parseGoogleAuthMigration(url);
-            if (!accounts || accounts.length === 0) {
-                throw new Error('無法解析 Google Authenticator 資料');
-            }
-            showQrSuccess(accounts[0].secret);
-            return;
-        }
-
-        // 標準 OTP 格式
-        if (!url.startsWith('otpauth://')) {
-            throw new Error('不是有效的 OTP QR Code');
-        }
-
-        const urlObj = new URL(url);
-        const params = new URLSearchParams(urlObj.search);
-        const secret = params.get('secret');
+        decode = await loadJsQR();
+    } catch (error) {
+        showQrError(error.message);
+        return;
+    }
 
-        if (!secret) {
-            throw new Error('未找到 Secret Key');
+    const urls = [];
+    for (const file of files) {
+        const imageUrl = URL.createObjectURL(file);
+        try {
+            const text = await decodeQrImage(decode, imageUrl);
+            if (text) urls.push(text);
+        } finally {
+            URL.revokeObjectURL(imageUrl);
         }
+    }
 
-        showQrSuccess(secret);
-    } catch (error) {
-        showQrError(error.message || '解析失敗');
+    if (urls.length === 0) {
+        showQrError('無法讀取 QR Code，請確認圖片清晰可見');
+        return;
     }
-}
 
-// Base64 解碼 (支援 URL-safe)
-function base64Decode(str) {
-    str = str.replace(/-/g, '+').replace(/_/g, '/');
-    const pad = str.length % 4;
-    if (pad) str += '='.repeat(4 - pad);
-    const binary = atob(str);
-    const bytes = new Uint8Array(binary.length);
-    for (let i = 0; i < binary.length; i++) {
-        bytes[i] = binary.charCodeAt(i);
+    // otpauth-migration:// 的 protobuf 由 Python 解析（支援多位元組長度與分批匯出）
+    const result = await window.pywebview.api.parse_otp_urls(urls);
+    const warnings = result.warnings || [];
+    if (urls.length < files.length) {
+        warnings.unshift(`${files.length - urls.length} 張圖片無法讀取 QR Code`);
     }
-    return bytes;
+    if (!result.success) {
+        showQrError([result.error, ...warnings].join('\n'));
+        return;
+    }
+    scannedOtpUrls = urls;
+    showQrSuccess(result.accounts, warnings);
 }
 
-// Base32 編碼
-function base32Encode(bytes) {
-    const alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ234567';
-    let bits = 0, value = 0, output = '';
-    for (let i = 0; i < bytes.length; i++) {
-        value = (value << 8) | bytes[i];
-        bits += 8;
-        while (bits >= 5) {
-            output += alphabet[(value >>> (bits - 5)) & 31];
-            bits -= 5;
-        }
-    }
-    if (bits > 0) output += alphabet[(value << (5 - bits)) & 31];
-    return output;
+function decodeQrImage(decode, imageUrl) {
+    return new Promise(resolve => {
+        const img = new Image();
+        img.onload = () => {
+            const scale = Math.min(1, QR_SCAN_MAX_SIZE / Math.max(img.naturalWidth, img.naturalHeight));
+            const canvas = document.createElement('canvas');
+            canvas.width = Math.round(img.naturalWidth * scale);
+            canvas.height = Math.round(img.naturalHeight * scale);
+            const ctx = canvas.getContext('2d', { willReadFrequently: true });
+            ctx.imageSmoothingQuality = 'high';
+            ctx.drawImage(img, 0, 0, canvas.width, canvas.height);
+
+            const imgData = ctx.getImageData(0, 0, canvas.width, canvas.height);
+            const code = decode(imgData.data, imgData.width, imgData.height);
+            // 釋放 canvas 的像素緩衝
+            canvas.width = canvas.height = 0;
+            resolve(code ? code.data : null);
+        };
+        img.onerror = () => resolve(null);
+        img.src = imageUrl;
+    });
 }
 
-// 解析 Google Authenticator Migration Payload
-function parseGoogleAuthMigration(url) {
+async function importScannedAccounts() {
+    if (scannedOtpUrls.length === 0) return;
     try {
-        const urlObj = new URL(url);
-        const params = new URLSearchParams(urlObj.search);
-        const encodedData = params.get('data');
-        if (!encodedData) throw new Error('未找到資料');
-
-        const decoded = base64Decode(encodedData);
-        const accounts = [];
-        let i = 0;
-
-        while (i < decoded.length) {
-            if (i + 1 >= decoded.length) break;
-            const fieldTag = decoded[i++];
-
-            if (fieldTag === 0x0A) {
-                const length = decoded[i++];
-                const accountData = decoded.slice(i, i + length);
-                const account = parseOtpParameters(accountData);
-                if (account) accounts.push(account);
-                i += length;
-            } else {
-                const wireType = fieldTag & 0x07;
-                if (wireType === 0) {
-                    while (i < decoded.length && decoded[i] & 0x80) i++;
-                    i++;
-                } else if (wireType === 2) {
-                    if (i < decoded.length) i += 1 + decoded[i];
-                } else {
-                    i++;
-                }
-            }
+        const result = await window.pywebview.api.import_otp_urls(scannedOtpUrls);
+        if (!result.success) {
+            showQrError(result.error);
+            return;
         }
-        return accounts;
+        // 只加入新的帳號，保留目前帳號列表的狀態
+        const known = new Set(accounts.map(account => account.id));
+        result.accounts.forEach(account => {
+            if (!known.has(account.id)) accounts.push(account);
+        });
+        refreshAccountList();
+
+        let message = `已新增 ${result.added} 個帳號`;
+        if (result.duplicates) message += `，${result.duplicates} 個已存在`;
+        updateStatus(message);
+        qrDialog.close();
+        resetQrDialog();
     } catch (error) {
-        return null;
+        showQrError('匯入失敗: ' + error);
     }
 }
 
-function parseOtpParameters(data) {
-    const account = { secret: '', name: '', issuer: '' };
-    let i = 0;
-
-    while (i < data.length) {
-        if (i + 1 >= data.length) break;
-        const fieldTag = data[i++];
-        const fieldNum = fieldTag >> 3;
-        const wireType = fieldTag & 0x07;
-
-        if (wireType === 2) {
-            if (i >= data.length) break;
-            const length = data[i++];
-            if (i + length > data.length) break;
-            const value = data.slice(i, i + length);
-
-            if (fieldNum === 1) account.secret = base32Encode(value);
-            else if (fieldNum === 2) account.name = new TextDecoder().decode(value);
-            else if (fieldNum === 3) account.issuer = new TextDecoder().decode(value);
-
-            i += length;
-        } else if (wireType === 0) {
-            while (i < data.length && data[i] & 0x80) i++;
-            i++;
-        } else {
-            i++;
-        }
-    }
-    return account.secret ? account : null;
-}
+function showQrSuccess(otpAccounts, warnings = []) {
+    // 只有一組帳號時可直接套用到目前帳號；多組時只能一次新增為帳號
+    const single = otpAccounts.length === 1;
+    extractedSecretKey = single ? otpAccounts[0].secret : '';
+    qrSecretKeyDisplay.textContent = single ? otpAccounts[0].secret : `共 ${otpAccounts.length} 個帳號`;
+    qrAccountList.textContent = otpAccounts.map((account, i) => `${i + 1}. ${account.name || '未命名帳號'}`).join('\n');
+    qrAccountList.classList.toggle('hidden', single);
+    qrWarnings.textContent = warnings.join('\n');
+    qrWarnings.classList.toggle('hidden', warnings.length === 0);
+    qrImportBtn.textContent = single ? '新增為帳號' : `新增 ${otpAccounts.length} 個帳號`;
 
-function showQrSuccess(secret) {
-    extractedSecretKey = secret;
-    qrSecretKeyDisplay.textContent = secret;
     qrResult.classList.remove('hidden');
     qrError.classList.add('hidden');
-    qrApplyBtn.classList.remove('hidden');
+    qrApplyBtn.classList.toggle('hidden', !single);
+    qrImportBtn.classList.remove('hidden');
     qrResetBtn.classList.remove('hidden');
 }
 
@@ -647,6 +687,7 @@ function showQrError(message) {
     qrError.classList.remove('hidden');
     qrResult.classList.add('hidden');
     qrApplyBtn.classList.add('hidden');
+    qrImportBtn.classList.add('hidden');
     qrResetBtn.classList.remove('hidden');
 }
 
@@ -673,6 +714,7 @@ async function loadConfig() {
         autoInputOtp.checked = config.auto_input_otp !== false;
         autoPressEnter.checked = config.auto_press_enter !== false;
         autoClickPlay.checked = config.auto_click_play !== false;
+        multiLaunchConcurrency.value = config.max_concurrent_launches ?? 2;
 
         refreshAccountList();
         loadSelectedAccount();
@@ -683,9 +725,8 @@ async function loadConfig() {
 
 async function saveConfig() {
     try {
-        await window.pywebview.api.save_config({
+        const result = await window.pywebview.api.save_config({
             launcher_path: launcherPathInput.value,
-            accounts: accounts,
             selected_account: selectedAccountIndex,
             theme: currentTheme,
             brightness: brightness,
@@ -696,6 +737,9 @@ async function saveConfig() {
             auto_press_enter: autoPressEnter.checked,
             auto_click_play: autoClickPlay.checked
         });
+        if (result && result.success === false) {
+            updateStatus(result.error);
+        }
     } catch (error) {
         console.error('Failed to save config:', error);
     }
@@ -725,9 +769,41 @@ function refreshAccountList() {
     }
 }
 
-function loadSelectedAccount() {
+// 帳號列表只有名稱與摘要，敏感欄位在選取時才向 Python 取得並解密
+// 儲存時只送出有變更的欄位，由 Python 改寫該帳號的紀錄
+function changedAccountFields(account, values) {
+    const fields = {};
+    Object.keys(values).forEach(key => {
+        if (account[key] !== values[key]) fields[key] = values[key];
+    });
+    return fields;
+}
+
+async function loadSelectedAccount() {
     if (selectedAccountIndex >= 0 && selectedAccountIndex < accounts.length) {
-        const account = accounts[selectedAccountIndex];
+        const index = selectedAccountIndex;
+        const account = accounts[index];
+        if (!account.loaded) {
+            accountNameInput.value = account.name || '';
+            accountEmailInput.value = '';
+            accountPasswordInput.value = '';
+            secretKeyInput.value = '';
+            try {
+                const result = await window.pywebview.api.get_account(account.id);
+                if (result.success && accounts[index] === account) {
+                    account.email = result.account.email || '';
+                    account.password = result.account.password || '';
+                    account.secret_key = result.account.secret_key || '';
+                    account.loaded = true;
+                } else if (!result.success) {
+                    updateStatus(result.error);
+                }
+            } catch (error) {
+                console.error('Failed to load account:', error);
+            }
+            // 等待期間已切換帳號
+            if (selectedAccountIndex !== index || accounts[index] !== account) return;
+        }
         accountNameInput.value = account.name || '';
         accountEmailInput.value = account.email || '';
         accountPasswordInput.value = account.password || '';
@@ -743,51 +819,86 @@ function loadSelectedAccount() {
 
 // ========== OTP 更新 ==========
 
+let otpSecretShown = null;
+let otpStepShown = null;
+// Secret Key 驗證結果（由 Python 驗證，每個 Secret 只問一次）
+const secretValidation = new Map();
+
 function startOtpUpdate() {
     updateOtp();
-    otpUpdateInterval = setInterval(updateOtp, 1000);
+    // OTP 與倒數都在本地計算；換碼或 Secret Key 改變時才重新產生
+    otpUpdateInterval = setInterval(() => {
+        const step = Math.floor(Date.now() / 1000 / TOTP_PERIOD);
+        if (secretKeyInput.value !== otpSecretShown || step !== otpStepShown) {
+            updateOtp();
+        } else if (otpDisplay.textContent !== '------') {
+            renderOtpRemaining(totpRemaining());
+        }
+    }, 1000);
+}
+
+function renderOtpRemaining(remaining) {
+    const percentage = (remaining / TOTP_PERIOD) * 100;
+    progressBar.style.width = percentage + '%';
+
+    // Update color based on remaining time
+    if (remaining <= 5) {
+        progressBar.classList.add('danger');
+    } else {
+        progressBar.classList.remove('danger');
+    }
+
+    timeRemaining.textContent = '剩餘 ' + remaining + ' 秒';
+}
+
+function showOtpError(message) {
+    otpDisplay.textContent = '------';
+    timeRemaining.textContent = message;
+    progressBar.style.width = '0%';
+}
+
+async function validateSecret(secretKey) {
+    if (!secretValidation.has(secretKey)) {
+        if (!window.pywebview || !window.pywebview.api) return null;
+        secretValidation.set(secretKey, await window.pywebview.api.validate_secret(secretKey));
+    }
+    return secretValidation.get(secretKey);
 }
 
 async function updateOtp() {
     const secretKey = secretKeyInput.value;
+    const now = Date.now();
+    otpSecretShown = secretKey;
+    otpStepShown = Math.floor(now / 1000 / TOTP_PERIOD);
 
     if (!secretKey) {
-        otpDisplay.textContent = '------';
-        timeRemaining.textContent = '請輸入 Secret Key';
-        progressBar.style.width = '0%';
+        showOtpError('請輸入 Secret Key');
         return;
     }
 
     try {
-        if (!window.pywebview || !window.pywebview.api) return;
-        const data = await window.pywebview.api.get_otp(secretKey);
+        const validation = await validateSecret(secretKey);
+        if (!validation) return;
 
-        if (data.error) {
-            otpDisplay.textContent = '------';
-            timeRemaining.textContent = data.error;
-            progressBar.style.width = '0%';
+        if (!validation.valid) {
+            showOtpError(validation.error);
             return;
         }
 
-        // Format OTP with space in middle
-        const otp = data.otp;
-        otpDisplay.textContent = otp.slice(0, 3) + ' ' + otp.slice(3);
-
-        // Update progress bar
-        const remaining = data.remaining;
-        const percentage = (remaining / 30) * 100;
-        progressBar.style.width = percentage + '%';
+        // WebCrypto 只在安全環境可用，否則改由 Python 產生
+        const otp = globalThis.crypto?.subtle
+            ? await generateTotp(secretKey, now)
+            : (await window.pywebview.api.get_otp(secretKey)).otp;
 
-        // Update color based on remaining time
-        if (remaining <= 5) {
-            progressBar.classList.add('danger');
-        } else {
-            progressBar.classList.remove('danger');
-        }
+        // 計算期間 Secret Key 已改變時捨棄結果
+        if (secretKeyInput.value !== secretKey) return;
 
-        timeRemaining.textContent = '剩餘 ' + remaining + ' 秒';
+        // Format OTP with space in middle
+        otpDisplay.textContent = otp.slice(0, 3) + ' ' + otp.slice(3);
+        renderOtpRemaining(totpRemaining(now));
     } catch (error) {
         console.error('Failed to update OTP:', error);
+        showOtpError('Secret Key 格式錯誤');
     }
 }
 
@@ -817,12 +928,18 @@ accountSelect.addEventListener('change', () => {
 });
 
 // 新增帳號
-addAccountBtn.addEventListener('click', () => {
+addAccountBtn.addEventListener('click', async () => {
+    const result = await window.pywebview.api.add_account({ name: '新帳號 ' + (accounts.length + 1) });
+    if (!result.success) {
+        updateStatus(result.error);
+        return;
+    }
     const newAccount = {
-        name: '新帳號 ' + (accounts.length + 1),
+        ...result.account,
         email: '',
         password: '',
-        secret_key: ''
+        secret_key: '',
+        loaded: true
     };
     accounts.push(newAccount);
     selectedAccountIndex = accounts.length - 1;
@@ -842,14 +959,27 @@ deleteAccountBtn.addEventListener('click', () => {
 // 帳號欄位變更 - 不再自動儲存，改為手動點儲存按鈕
 
 // 儲存帳號按鈕
-saveAccountBtn.addEventListener('click', () => {
+saveAccountBtn.addEventListener('click', async () => {
     if (selectedAccountIndex >= 0 && selectedAccountIndex < accounts.length) {
-        accounts[selectedAccountIndex].name = accountNameInput.value;
-        accounts[selectedAccountIndex].email = accountEmailInput.value;
-        accounts[selectedAccountIndex].password = accountPasswordInput.value;
-        accounts[selectedAccountIndex].secret_key = secretKeyInput.value;
-        refreshAccountList();
-        saveConfig();
+        const account = accounts[selectedAccountIndex];
+        // 帳號資料尚未載入時輸入框是空的，直接儲存會清掉原本的密文
+        if (!account.loaded) return;
+        const values = {
+            name: accountNameInput.value,
+            email: accountEmailInput.value,
+            password: accountPasswordInput.value,
+            secret_key: secretKeyInput.value
+        };
+        const fields = changedAccountFields(account, values);
+        if (Object.keys(fields).length > 0) {
+            const result = await window.pywebview.api.update_account(account.id, fields);
+            if (!result.success) {
+                updateStatus(result.error);
+                return;
+            }
+            Object.assign(account, values, result.account);
+            refreshAccountList();
+        }
 
         // 顯示儲存成功
         const originalText = saveAccountBtn.textContent;
@@ -983,6 +1113,72 @@ async function doStartAutomation() {
     }
 }
 
+// ========== 多開啟動 ==========
+
+function renderMultiLaunchList() {
+    multiLaunchList.innerHTML = '';
+
+    if (accounts.length === 0) {
+        multiLaunchList.innerHTML = '<div class="text-sm text-black-400">尚未新增帳號</div>';
+        return;
+    }
+
+    accounts.forEach((account, index) => {
+        const row = document.createElement('label');
+        row.className = 'flex items-center gap-2 input-bg rounded-lg px-3 py-2 text-sm cursor-pointer';
+        row.innerHTML = `
+            <input type="checkbox" class="multi-launch-check" ${account.has_secret ? '' : 'disabled'}>
+            <span class="flex-1 truncate"></span>
+            <span class="multi-launch-status text-xs text-black-400 truncate max-w-[45%]"></span>
+        `;
+        row.querySelector('span').textContent = account.name || `帳號 ${index + 1}`;
+        row.querySelector('.multi-launch-status').textContent = account.has_secret ? '' : '未設定 Secret Key';
+        row.querySelector('.multi-launch-check').value = account.id;
+        row.dataset.accountId = account.id;
+        multiLaunchList.appendChild(row);
+    });
+}
+
+function setMultiRunningState(running) {
+    isMultiRunning = running;
+    multiLaunchStartBtn.disabled = running;
+    multiLaunchStopBtn.disabled = !running;
+    multiLaunchConcurrency.disabled = running;
+    multiLaunchList.querySelectorAll('.multi-launch-check').forEach(check => {
+        check.disabled = running || !accounts.find(account => account.id === check.value)?.has_secret;
+    });
+}
+
+async function startMultiLaunch() {
+    const accountIds = Array.from(multiLaunchList.querySelectorAll('.multi-launch-check:checked'))
+        .map(check => check.value);
+
+    if (accountIds.length === 0) {
+        updateStatus('請選擇要啟動的帳號');
+        return;
+    }
+
+    if (!launcherPathInput.value) {
+        updateStatus('請選擇啟動器路徑');
+        return;
+    }
+
+    try {
+        setMultiRunningState(true);
+        const maxConcurrent = parseInt(multiLaunchConcurrency.value) || 1;
+        const result = await window.pywebview.api.start_multi_automation(accountIds, maxConcurrent);
+        updateStatus(result.message);
+
+        if (!result.success) {
+            setMultiRunningState(false);
+        }
+    } catch (error) {
+        console.error('Failed to start multi launch:', error);
+        updateStatus('多開啟動失敗');
+        setMultiRunningState(false);
+    }
+}
+
 // ========== 狀態管理 ==========
 
 function setRunningState(running) {
@@ -1013,6 +1209,28 @@ function resetToReady() {
 
 // updateStatus 已在上方定義
 
+// Python EventBus 推送的訊息，每次呼叫為一批 [{type, data}]
+const bridgeHandlers = {
+    detect: applyDetectionState,
+    status: updateStatus,
+    automation_complete: (data) => automationComplete(data.success, data.message),
+    multi_progress: multiLaunchProgress,
+    update: updateCheckResult,
+};
+
+function onBridgeEvents(messages) {
+    for (const message of messages) {
+        const handler = bridgeHandlers[message.type];
+        if (handler) {
+            try {
+                handler(message.data);
+            } catch (error) {
+                console.error('處理事件失敗:', message.type, error);
+            }
+        }
+    }
+}
+
 function automationComplete(success, message) {
     updateStatus(success ? '完成' : '失敗: ' + message);
     // 5秒後恢復原狀
@@ -1021,6 +1239,23 @@ function automationComplete(success, message) {
     }, 5000);
 }
 
+function multiLaunchProgress(event) {
+    if (event.finished) {
+        setMultiRunningState(false);
+        updateStatus('多開流程已結束');
+        return;
+    }
+
+    const row = multiLaunchList.querySelector(`[data-account-id="${CSS.escape(event.id)}"]`);
+    if (row) {
+        const status = row.querySelector('.multi-launch-status');
+        status.textContent = event.status;
+        status.classList.toggle('text-green-400', event.done && event.success === true);
+        status.classList.toggle('text-red-400', event.done && event.success === false);
+    }
+    updateStatus(`${event.name}: ${event.status}`);
+}
+
 // ========== Tab 切換 ==========
 
 tabAutomation.addEventListener('click', () => {
@@ -1039,8 +1274,65 @@ tabOther.addEventListener('click', () => {
     tabAutomation.classList.add('border-transparent');
     tabContentOther.classList.remove('hidden');
     tabContentAutomation.classList.add('hidden');
+    loadTimingStats();
 });
 
+// ========== 啟動耗時統計 ==========
+
+const TIMING_PHASE_LABELS = {
+    otp: '產生 OTP',
+    launch: '啟動 Launcher',
+    wait_window: '等待視窗',
+    credentials_find: '尋找帳密欄位',
+    credentials: '輸入帳密',
+    otp_find: '尋找 OTP 欄位',
+    otp_input: '輸入 OTP',
+    enter: '按下 Enter',
+    play_find: '等待 PLAY',
+    play_click: '點擊 PLAY'
+};
+
+function formatMs(ms) {
+    return ms >= 1000 ? (ms / 1000).toFixed(2) + ' s' : Math.round(ms) + ' ms';
+}
+
+async function loadTimingStats() {
+    const body = document.getElementById('timingStatsBody');
+    const runsText = document.getElementById('timingStatsRuns');
+    try {
+        const stats = await window.pywebview.api.get_timing_stats(20);
+        if (!stats.success || stats.runs === 0) {
+            body.innerHTML = '<tr><td colspan="4" class="text-black-500">尚無紀錄</td></tr>';
+            runsText.textContent = '';
+            return;
+        }
+
+        runsText.textContent = `最近 ${stats.runs} 次（成功 ${stats.succeeded} 次）`;
+        body.innerHTML = '';
+
+        const rows = stats.phases.map(phase => [
+            TIMING_PHASE_LABELS[phase.name] || phase.name,
+            formatMs(phase.p50),
+            formatMs(phase.p95),
+            phase.calls_p50
+        ]);
+        rows.push(['總計', formatMs(stats.total.p50), formatMs(stats.total.p95), '']);
+
+        rows.forEach(cells => {
+            const tr = document.createElement('tr');
+            cells.forEach((text, i) => {
+                const td = document.createElement('td');
+                td.textContent = text;
+                if (i > 0) td.className = 'text-right';
+                tr.appendChild(td);
+            });
+            body.appendChild(tr);
+        });
+    } catch (error) {
+        console.error('載入啟動耗時統計失敗:', error);
+    }
+}
+
 // ========== 重置視窗位置快捷鍵 ==========
 
 let currentHotkey = 'F5';
@@ -0,0 +1,77 @@
+// ========== TOTP（RFC 6238，HMAC-SHA1）==========
+// 在網頁內計算 OTP，不需每秒呼叫 Python；Secret Key 格式驗證仍由 Python（validate_secret）負責
+
+const TOTP_PERIOD = 30;
+const TOTP_DIGITS = 6;
+const BASE32_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ234567';
+
+// 已匯入的 HMAC 金鑰（以正規化後的 Secret 為 key）
+const totpKeyCache = new Map();
+
+function normalizeSecret(secret) {
+    return secret.replace(/\s+/g, '').replace(/=+$/, '').toUpperCase();
+}
+
+function base32Decode(secret) {
+    const input = normalizeSecret(secret);
+    const bytes = [];
+    let buffer = 0;
+    let bits = 0;
+
+    for (const char of input) {
+        const value = BASE32_ALPHABET.indexOf(char);
+        if (value < 0) {
+            throw new Error('Secret Key 格式錯誤');
+        }
+        buffer = (buffer << 5) | value;
+        bits += 5;
+        if (bits >= 8) {
+            bits -= 8;
+            bytes.push((buffer >> bits) & 0xff);
+        }
+    }
+
+    return new Uint8Array(bytes);
+}
+
+async function getTotpKey(secret) {
+    const normalized = normalizeSecret(secret);
+    let key = totpKeyCache.get(normalized);
+    if (!key) {
+        key = await crypto.subtle.importKey(
+            'raw', base32Decode(normalized), { name: 'HMAC', hash: 'SHA-1' }, false, ['sign']
+        );
+        totpKeyCache.set(normalized, key);
+    }
+    return key;
+}
+
+async function generateTotp(secret, timeMs = Date.now(), digits = TOTP_DIGITS, period = TOTP_PERIOD) {
+    const counter = Math.floor(timeMs / 1000 / period);
+
+    // 8 bytes big-endian 計數器（超過 32 位元時分成高低兩段）
+    const message = new DataView(new ArrayBuffer(8));
+    message.setUint32(0, Math.floor(counter / 0x100000000));
+    message.setUint32(4, counter >>> 0);
+
+    const key = await getTotpKey(secret);
+    const hmac = new Uint8Array(await crypto.subtle.sign('HMAC', key, message.buffer));
+
+    // Dynamic truncation
+    const offset = hmac[hmac.length - 1] & 0x0f;
+    const code = ((hmac[offset] & 0x7f) << 24)
+        | (hmac[offset + 1] << 16)
+        | (hmac[offset + 2] << 8)
+        | hmac[offset + 3];
+
+    return String(code % 10 ** digits).padStart(digits, '0');
+}
+
+function totpRemaining(timeMs = Date.now(), period = TOTP_PERIOD) {
+    return period - Math.floor(timeMs / 1000) % period;
+}
+
+// 供 tools/check_totp_vectors.py 以 node 執行測試向量
+if (typeof module !== 'undefined') {
+    module.exports = { base32Decode, generateTotp, totpRemaining };
+}